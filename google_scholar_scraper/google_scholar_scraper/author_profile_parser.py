@@ -1,9 +1,70 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional
 
 from parsel import Selector  # Add this import
 
 from google_scholar_scraper.exceptions import ParsingException
+from google_scholar_scraper.utils import compile_css, first_match
+
+
+# Per-row queries, compiled at import time and evaluated directly on each row's lxml node.
+# This skips the CSS translation and SelectorList wrapping parsel does on every .css() call.
+_PUB_TITLE = compile_css(".gsc_a_t a::text")
+_PUB_LINK = compile_css(".gsc_a_t a::attr(href)")
+_PUB_GRAY = compile_css(".gs_gray::text")
+_PUB_CITATIONS = compile_css(".gsc_a_c a::text")
+_COAUTHOR_NAME = compile_css(".gsc_oci_name a::text")
+_COAUTHOR_LINK = compile_css(".gsc_oci_name a::attr(href)")
+_COAUTHOR_AFFILIATION = compile_css(".gsc_oci_aff::text")
+
+
+def _to_int(text: Optional[str]) -> int:
+    """Converts a scraped count such as " 1,250 " to an int, returning 0 if missing or malformed."""
+    if not text:
+        return 0
+    if text.isdecimal():  # Fast path for plain per-row counts like "85": no strip/replace copies
+        return int(text)
+    try:
+        return int(text.strip().replace(",", ""))
+    except ValueError:
+        return 0
+
+
+def _parse_publication_rows(rows: Iterable[Selector]) -> List[Dict[str, Any]]:
+    """Extracts title, authors, source, citation count and URL from each `.gsc_a_tr` row, skipping untitled rows."""
+    publications = []
+    for row_selector in rows:
+        node = row_selector.root
+        title = first_match(_PUB_TITLE, node)
+        if not title:  # Only add if a title was found
+            continue
+
+        # Authors and Journal/Year are often in consecutive .gs_gray elements
+        gray_elements = _PUB_GRAY(node)
+        publications.append({
+            "title": title,
+            "authors": str(gray_elements[0]).strip() if len(gray_elements) >= 1 else None,
+            "source": str(gray_elements[1]).strip() if len(gray_elements) >= 2 else None,  # e.g., "Journal of AI, 2022"
+            "citation_count": _to_int(first_match(_PUB_CITATIONS, node)),
+            "article_url": first_match(_PUB_LINK, node),  # Article URL (from title link)
+        })
+    return publications
+
+
+def _parse_coauthor_rows(rows: Iterable[Selector]) -> List[Dict[str, Any]]:
+    """Extracts name, affiliation and profile URL from each `.gsc_oci` entry, skipping unnamed entries."""
+    co_authors = []
+    for entry_selector in rows:
+        node = entry_selector.root
+        name = first_match(_COAUTHOR_NAME, node)
+        if not name:  # Only add if a name was found
+            continue
+        co_authors.append({
+            "name": name,
+            "affiliation": first_match(_COAUTHOR_AFFILIATION, node),
+            "profile_url": first_match(_COAUTHOR_LINK, node),
+        })
+    return co_authors
 
 
 class AuthorProfileParser:
@@ -18,7 +79,7 @@ class AuthorProfileParser:
             self.logger.warning("Attempted to parse empty HTML content for author profile.")
             raise ParsingException("Cannot parse empty HTML content for author profile.")
 
-        selector = Selector(text=html_content)
+        selector = Selector(text=html_content, type="html")
         self.logger.info("Parsing author profile page.")
 
         profile_data: Dict[str, Any] = {}
@@ -58,69 +119,15 @@ class AuthorProfileParser:
         h_index_text = selector.css("#gsc_rsb_st tr:nth-child(2) td:nth-child(2)::text").get()
         i10_index_text = selector.css("#gsc_rsb_st tr:nth-child(2) td:nth-child(3)::text").get()
 
-        try:
-            citations = int(citations_text.strip()) if citations_text else 0
-        except ValueError:
-            citations = 0  # Default if conversion fails
-        try:
-            h_index = int(h_index_text.strip()) if h_index_text else 0
-        except ValueError:
-            h_index = 0
-        try:
-            i10_index = int(i10_index_text.strip()) if i10_index_text else 0
-        except ValueError:
-            i10_index = 0
-
         profile_data["metrics"] = {
-            "citations": citations,  # Key used in test
-            "h_index": h_index,
-            "i10_index": i10_index,
+            "citations": _to_int(citations_text),  # Key used in test
+            "h_index": _to_int(h_index_text),
+            "i10_index": _to_int(i10_index_text),
         }
         # Publications
-        publications_list = []
-        publication_rows = selector.css(".gsc_a_tr")  # Get all publication row selectors
-        for row_selector in publication_rows:
-            pub_data = {}
-            pub_data["title"] = row_selector.css(".gsc_a_t a::text").get()
-
-            # Authors and Journal/Year are often in consecutive .gs_gray elements
-            gray_elements = row_selector.css(".gs_gray::text").getall()
-            if len(gray_elements) >= 1:
-                pub_data["authors"] = gray_elements[0].strip()
-            else:
-                pub_data["authors"] = None
-
-            if len(gray_elements) >= 2:
-                pub_data["source"] = gray_elements[1].strip()  # e.g., "Journal of AI, 2022"
-            else:
-                pub_data["source"] = None
-
-            citation_count_text = row_selector.css(".gsc_a_c a::text").get()
-            try:
-                pub_data["citation_count"] = int(citation_count_text.strip()) if citation_count_text else 0
-            except ValueError:
-                pub_data["citation_count"] = 0
-
-            # Article URL (from title link)
-            pub_data["article_url"] = row_selector.css(".gsc_a_t a::attr(href)").get()
-
-            if pub_data["title"]:  # Only add if a title was found
-                publications_list.append(pub_data)
-
-        profile_data["publications"] = publications_list
+        profile_data["publications"] = _parse_publication_rows(selector.css(".gsc_a_tr"))
 
         # Co-authors
-        co_authors_list = []
-        coauthor_entries = selector.css(".gsc_oci")  # Get all co-author entry selectors
-        for entry_selector in coauthor_entries:
-            coauthor_data = {}
-            coauthor_data["name"] = entry_selector.css(".gsc_oci_name a::text").get()
-            coauthor_data["affiliation"] = entry_selector.css(".gsc_oci_aff::text").get()  # Based on test mock
-            coauthor_data["profile_url"] = entry_selector.css(".gsc_oci_name a::attr(href)").get()
-
-            if coauthor_data["name"]:  # Only add if a name was found
-                co_authors_list.append(coauthor_data)
-
-        profile_data["co_authors"] = co_authors_list
+        profile_data["co_authors"] = _parse_coauthor_rows(selector.css(".gsc_oci"))
 
         return profile_data
@@ -1,60 +1,221 @@
 # data_handler.py
+import csv
+import hashlib
 import json
 import logging
-import sqlite3
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
 
 import aiosqlite
 import pandas as pd
 
+try:
+    import orjson  # Optional: faster JSON serialization
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa  # Optional: Parquet output
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+RESULT_COLUMNS = (
+    "title",
+    "authors",
+    "publication_info",
+    "snippet",
+    "cited_by_count",
+    "related_articles_url",
+    "article_url",
+    "pdf_url",
+    "pdf_path",
+    "doi",
+    "affiliations",
+    "cited_by_url",
+)
+
+# Column dtypes for save_to_dataframe; publication_info stays an object column of dicts.
+RESULT_DTYPES = {
+    "title": "string",
+    "authors": "string",
+    "snippet": "string",
+    "cited_by_count": "Int64",
+    "related_articles_url": "string",
+    "article_url": "string",
+    "pdf_url": "string",
+    "pdf_path": "string",
+    "doi": "string",
+    "affiliations": "string",
+    "cited_by_url": "string",
+}
+
+# Applied to every connection the handler opens.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+# Table and index DDL, issued by create_table in a single executescript round-trip. The url_hash index is
+# non-unique (article_url UNIQUE already enforces dedup, so a hash collision must not reject a row); the
+# DROP removes the unique idx_url_hash that older databases were created with.
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    title TEXT, authors TEXT, publication_info TEXT, snippet TEXT,
+    cited_by_count INTEGER, related_articles_url TEXT,
+    article_url TEXT UNIQUE, pdf_url TEXT, pdf_path TEXT,
+    doi TEXT, affiliations TEXT, cited_by_url TEXT,
+    url_hash INTEGER
+);
+DROP INDEX IF EXISTS idx_url_hash;
+CREATE INDEX IF NOT EXISTS idx_results_url_hash ON results(url_hash);
+"""
+
+# Columns written on insert: the result fields plus the url_hash lookup key.
+INSERT_COLUMNS = RESULT_COLUMNS + ("url_hash",)
+
+
+def _url_hash(article_url: Optional[str]) -> Optional[int]:
+    """Returns a signed 64-bit BLAKE2b hash of article_url (None for a missing URL), used as the indexed lookup key."""
+    if article_url is None:
+        return None
+    return int.from_bytes(hashlib.blake2b(article_url.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def _row_to_tuple(result: Dict) -> tuple:
+    """Converts a scraped result dict into a parameter tuple ordered as INSERT_COLUMNS."""
+    return (
+        result["title"],
+        ",".join(result["authors"]),
+        json.dumps(result["publication_info"]),
+        result["snippet"],
+        result["cited_by_count"],
+        result["related_articles_url"],
+        result["article_url"],
+        result.get("pdf_url"),
+        result.get("pdf_path"),
+        result.get("doi"),
+        ",".join(result.get("affiliations", [])),
+        result.get("cited_by_url"),
+        _url_hash(result["article_url"]),
+    )
+
+
+def _flatten_result(result: Dict) -> Dict:
+    """Returns a copy of a scraped result with its list fields (authors, affiliations) comma-joined."""
+    return {
+        **result,
+        "authors": ",".join(result.get("authors") or []),
+        "affiliations": ",".join(result.get("affiliations") or []),
+    }
+
 
 class DataHandler:
     """
     Handles data storage and retrieval operations for scraped Google Scholar results.
 
-    Supports saving data to an SQLite database, CSV files, and JSON files.
+    Supports saving data to an SQLite database, CSV files, JSON files and
+    (with pyarrow installed) Parquet files.
+
+    Database methods reuse a single long-lived connection while the handler is
+    connected (via ``await handler.connect()`` or ``async with DataHandler(...)``),
+    and fall back to a short-lived connection per call otherwise.
     """
 
-    def __init__(self, db_name="scholar_data.db"):
+    def __init__(self, db_name="scholar_data.db", uri: bool = False):
         """
         Initializes the DataHandler with a database name.
 
         Args:
             db_name (str, optional): The name of the SQLite database file.
                                      Defaults to "scholar_data.db".
+            uri (bool, optional): Interpret db_name as an SQLite URI (e.g.
+                                  "file:name?mode=memory&cache=shared"). Defaults to False.
 
         """
         self.db_name = db_name
+        self.uri = uri
         self.logger = logging.getLogger(__name__)
+        self._db: Optional[aiosqlite.Connection] = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _apply_pragmas(self, db: aiosqlite.Connection):
+        """Applies SQLITE_PRAGMAS to a freshly opened connection."""
+        for pragma in SQLITE_PRAGMAS:
+            await db.execute(pragma)
+
+    async def connect(self) -> aiosqlite.Connection:
+        """
+        Opens the long-lived database connection, if not already open.
+
+        Subsequent database operations reuse this connection until close() is called,
+        avoiding a connect/schema-load cycle per operation.
+
+        Returns:
+            aiosqlite.Connection: The open connection.
+
+        """
+        if self._db is None:
+            self._db = await aiosqlite.connect(self.db_name, uri=self.uri)
+            await self._apply_pragmas(self._db)
+            self.logger.debug(f"Opened long-lived connection to database '{self.db_name}'")
+        return self._db
+
+    async def close(self):
+        """Closes the long-lived database connection, if open."""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+            self.logger.debug(f"Closed connection to database '{self.db_name}'")
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yields the long-lived connection if open, otherwise a short-lived one."""
+        if self._db is not None:
+            yield self._db
+            return
+        async with aiosqlite.connect(self.db_name, uri=self.uri) as db:
+            await self._apply_pragmas(db)
+            yield db
 
     async def create_table(self):
         """
         Creates the 'results' table in the SQLite database if it doesn't exist.
 
         The table schema includes fields for title, authors, publication info, snippet,
-        citation counts, URLs, PDF information, DOI, and affiliations.
-        """
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS results (
-                    title TEXT, authors TEXT, publication_info TEXT, snippet TEXT,
-                    cited_by_count INTEGER, related_articles_url TEXT,
-                    article_url TEXT UNIQUE, pdf_url TEXT, pdf_path TEXT,
-                    doi TEXT, affiliations TEXT, cited_by_url TEXT
-                )
-            """
-            )
+        citation counts, URLs, PDF information, DOI, and affiliations, plus a url_hash
+        column (a 64-bit hash of article_url) with an index for existence checks.
+        Tables created before url_hash existed are migrated in place before the
+        schema script (RESULTS_SCHEMA) runs.
+        """
+        async with self._connection() as db:
+            async with db.execute("PRAGMA table_info(results)") as cursor:
+                existing_columns = {row[1] for row in await cursor.fetchall()}
+            if existing_columns and "url_hash" not in existing_columns:
+                self.logger.info(f"Adding url_hash column to 'results' in database '{self.db_name}'")
+                await db.execute("ALTER TABLE results ADD COLUMN url_hash INTEGER")
+                async with db.execute("SELECT rowid, article_url FROM results") as cursor:
+                    backfill = [(_url_hash(article_url), rowid) for rowid, article_url in await cursor.fetchall()]
+                await db.executemany("UPDATE results SET url_hash = ? WHERE rowid = ?", backfill)
+            await db.executescript(RESULTS_SCHEMA)
             await db.commit()
             self.logger.info(f"Table 'results' created or already exists in database '{self.db_name}'")
 
-    async def add_result(self, result: Dict):
+    async def add_result(self, result: Dict) -> bool:
         """
         Adds a single scraped result to the 'results' table.
 
-        Handles SQLiteIntegrityError for duplicate entries (based on article_url)
-        by logging a debug message and skipping the insertion. Logs other database
-        errors to the error level.
+        Duplicate entries (based on article_url) are skipped by ``INSERT OR IGNORE``,
+        so callers don't need a separate result_exists() round-trip first. Database
+        errors are logged at the error level and reported as not inserted.
 
         Args:
             result (Dict): A dictionary containing the scraped result data.
@@ -62,43 +223,83 @@ class DataHandler:
                            cited_by_count, related_articles_url, article_url, pdf_url,
                            pdf_path, doi, affiliations, cited_by_url.
 
+        Returns:
+            bool: True if the result was newly inserted, False if it was a duplicate or failed.
+
+        """
+        return await self.insert_result(result)
+
+    async def insert_results(self, rows: List[Dict]) -> Set[Optional[str]]:
+        """
+        Inserts many scraped results into the 'results' table in a single transaction.
+
+        Uses one connection, converts every row up front and commits once, so bulk
+        loads pay for one WAL sync instead of one per row. Duplicates (based on
+        article_url) are skipped via ``INSERT OR IGNORE``, and a row that cannot be
+        converted (e.g. missing a required key) is logged and skipped without losing
+        the rest of the batch.
+
+        Args:
+            rows (List[Dict]): Scraped result dictionaries, with the same keys as
+                               expected by add_result.
+
+        Returns:
+            Set[Optional[str]]: The article_urls of the rows actually inserted (duplicates
+                                and malformed rows excluded). Empty if no row is insertable
+                                or a database error occurs.
+
         """
-        async with aiosqlite.connect(self.db_name) as db:
+        params = []
+        for row in rows:
             try:
-                await db.execute(
-                    """
-                    INSERT INTO results (title, authors, publication_info, snippet, cited_by_count,
-                    related_articles_url, article_url, pdf_url, pdf_path, doi, affiliations, cited_by_url)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        result["title"],
-                        ",".join(result["authors"]),
-                        json.dumps(result["publication_info"]),
-                        result["snippet"],
-                        result["cited_by_count"],
-                        result["related_articles_url"],
-                        result["article_url"],
-                        result.get("pdf_url"),
-                        result.get("pdf_path"),
-                        result.get("doi"),
-                        ",".join(result.get("affiliations", [])),
-                        result.get("cited_by_url"),
-                    ),
-                )
-                await db.commit()
-                self.logger.debug(f"Inserted result: {result['article_url']}")
-            except sqlite3.IntegrityError:
-                self.logger.debug(f"Duplicate entry skipped: {result['article_url']}")
-                pass  # Silently handle duplicates.
+                params.append(_row_to_tuple(row))
             except Exception as e:
-                self.logger.error(f"Database error during insertion: {e}", exc_info=True)
-                pass  # Log and skip on other database errors
+                self.logger.error(f"Skipping result that could not be converted for insertion: {e!r}", exc_info=True)
+        if not params:
+            return set()
+        article_url_index = INSERT_COLUMNS.index("article_url")
+        insert_sql = (
+            f"INSERT OR IGNORE INTO results ({', '.join(INSERT_COLUMNS)}) VALUES ({', '.join('?' for _ in INSERT_COLUMNS)})"
+        )
+        try:
+            async with self._connection() as db:
+                try:
+                    inserted = set()
+                    for row_params in params:
+                        # One statement per row (still one transaction) so each row's rowcount says whether it was new
+                        cursor = await db.execute(insert_sql, row_params)
+                        if cursor.rowcount == 1:
+                            inserted.add(row_params[article_url_index])
+                    await db.commit()
+                except Exception:
+                    await db.rollback()  # Don't leave a partial batch pending on a shared connection
+                    raise
+            self.logger.debug(f"Inserted {len(inserted)} of {len(rows)} results (duplicates skipped).")
+            return inserted
+        except Exception as e:
+            self.logger.error(f"Database error during bulk insertion: {e}", exc_info=True)
+            return set()
+
+    async def insert_result(self, result: Dict) -> bool:
+        """
+        Inserts a single scraped result, skipping it if its article_url already exists.
+
+        Args:
+            result (Dict): A dictionary containing the scraped result data.
+
+        Returns:
+            bool: True if the result was inserted, False if it was a duplicate or failed.
+
+        """
+        return bool(await self.insert_results([result]))
 
     async def result_exists(self, article_url: str) -> bool:
         """
         Checks if a result with the given article_url already exists in the database.
 
+        The lookup goes through the integer url_hash index; article_url is compared
+        only on the matching rows, guarding against hash collisions.
+
         Args:
             article_url (str): The article URL to check for existence.
 
@@ -106,8 +307,10 @@ class DataHandler:
             bool: True if a result with the given URL exists, False otherwise.
 
         """
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute("SELECT 1 FROM results WHERE article_url = ?", (article_url,)) as cursor:
+        async with self._connection() as db:
+            async with db.execute(
+                "SELECT 1 FROM results WHERE url_hash = ? AND article_url = ? LIMIT 1", (_url_hash(article_url), article_url)
+            ) as cursor:
                 exists = await cursor.fetchone() is not None
                 self.logger.debug(f"Checked result existence for '{article_url}': {'Exists' if exists else 'Not Exists'}")
                 return exists
@@ -116,7 +319,10 @@ class DataHandler:
         """
         Saves a list of scraped results to a CSV file.
 
-        Uses pandas DataFrame for efficient CSV writing.
+        Rows are streamed through csv.DictWriter using RESULT_COLUMNS as the header,
+        so no intermediate DataFrame is built. List fields (authors, affiliations)
+        are comma-joined and publication_info is JSON-encoded, matching the
+        database representation. Keys outside RESULT_COLUMNS are ignored.
 
         Args:
             results (List[Dict]): A list of dictionaries, where each dictionary
@@ -128,8 +334,14 @@ class DataHandler:
             self.logger.warning("No results to save to CSV.")
             return
         try:
-            df = pd.DataFrame(results)
-            df.to_csv(filename, index=False, encoding="utf-8")
+            with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                for result in results:
+                    writer.writerow({
+                        **_flatten_result(result),
+                        "publication_info": json.dumps(result.get("publication_info")),
+                    })
             self.logger.info(f"Successfully saved {len(results)} results to CSV file: {filename}")
         except Exception as e:
             self.logger.error(f"Error writing to CSV file '{filename}': {e}", exc_info=True)
@@ -138,6 +350,10 @@ class DataHandler:
         """
         Saves a list of scraped results to a JSON file.
 
+        Uses orjson (writing UTF-8 bytes directly) when it is installed, and falls
+        back to the standard library json module otherwise; both write the same
+        2-space-indented UTF-8 output.
+
         Args:
             results (List[Dict]): A list of dictionaries, where each dictionary
                                  represents a scraped result.
@@ -148,30 +364,74 @@ class DataHandler:
             self.logger.warning("No results to save to JSON.")
             return
         try:
-            with open(filename, "w", encoding="utf-8") as jsonfile:
-                json.dump(results, jsonfile, indent=4, ensure_ascii=False)  # ensure_ascii=False for Unicode
+            if orjson is not None:
+                with open(filename, "wb") as jsonfile:
+                    jsonfile.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, "w", encoding="utf-8") as jsonfile:
+                    # indent=2 matches orjson's only indent option, so the file is identical either way
+                    json.dump(results, jsonfile, indent=2, ensure_ascii=False)  # ensure_ascii=False for Unicode
             self.logger.info(f"Successfully saved {len(results)} results to JSON file: {filename}")
         except Exception as e:
             self.logger.error(f"Error writing to JSON file '{filename}': {e}", exc_info=True)
 
+    def save_to_parquet(self, results: List[Dict], filename: str, compression: str = "zstd"):
+        """
+        Saves a list of scraped results to a Parquet file (requires pyarrow).
+
+        Columns follow RESULT_COLUMNS. List fields (authors, affiliations) are kept as
+        Arrow list columns rather than comma-joined; publication_info is JSON-encoded,
+        as in the CSV output, since its keys vary between results.
+
+        Args:
+            results (List[Dict]): A list of dictionaries, where each dictionary
+                                 represents a scraped result.
+            filename (str): The name of the Parquet file to save to.
+            compression (str, optional): Parquet compression codec. Defaults to "zstd".
+
+        """
+        if not results:
+            self.logger.warning("No results to save to Parquet.")
+            return
+        if pa is None:
+            self.logger.error("Saving to Parquet requires pyarrow (pip install google-scholar-scraper[parquet]).")
+            return
+        try:
+            table = pa.Table.from_pylist([
+                {
+                    **{column: result.get(column) for column in RESULT_COLUMNS},
+                    "publication_info": json.dumps(result.get("publication_info")),
+                }
+                for result in results
+            ])
+            pq.write_table(table, filename, compression=compression)
+            self.logger.info(f"Successfully saved {len(results)} results to Parquet file: {filename}")
+        except Exception as e:
+            self.logger.error(f"Error writing to Parquet file '{filename}': {e}", exc_info=True)
+
     def save_to_dataframe(self, results: List[Dict]) -> pd.DataFrame:
         """
         Converts a list of scraped results to a pandas DataFrame.
 
+        The frame always has RESULT_COLUMNS as its columns, typed per RESULT_DTYPES,
+        so dtypes aren't inferred row by row. List fields (authors, affiliations)
+        are comma-joined; keys outside RESULT_COLUMNS are dropped.
+
         Args:
             results (List[Dict]): A list of dictionaries, where each dictionary
                                  represents a scraped result.
 
         Returns:
             pd.DataFrame: A pandas DataFrame containing the scraped results.
-                          Returns an empty DataFrame if input results are empty.
+                          Returns an empty (but columned) DataFrame if input results are empty.
 
         """
         if not results:
             self.logger.warning("No results to convert to DataFrame. Returning empty DataFrame.")
-            return pd.DataFrame()  # Return empty DataFrame if no results
+            return pd.DataFrame(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
         try:
-            return pd.DataFrame(results)
+            df = pd.DataFrame.from_records((_flatten_result(result) for result in results), columns=RESULT_COLUMNS)
+            return df.astype(RESULT_DTYPES)
         except Exception as e:
             self.logger.error(f"Error converting results to DataFrame: {e}", exc_info=True)
             return pd.DataFrame()  # Return empty DataFrame on error
@@ -188,12 +448,14 @@ class DataHandler:
         """
         results = []
         try:
-            async with aiosqlite.connect(self.db_name) as db:
-                db.row_factory = sqlite3.Row  # Access columns by name
-                async with db.execute("SELECT * FROM results") as cursor:
+            async with self._connection() as db:
+                async with db.execute(f"SELECT {', '.join(RESULT_COLUMNS)} FROM results") as cursor:
+                    # Build dicts from cursor.description rather than setting row_factory,
+                    # which would leak onto the shared connection.
+                    columns = [column[0] for column in cursor.description]
                     rows = await cursor.fetchall()
                     for row in rows:
-                        results.append(dict(row))
+                        results.append(dict(zip(columns, row)))
             self.logger.info(f"Retrieved {len(results)} results from the database.")
             return results
         except Exception as e:
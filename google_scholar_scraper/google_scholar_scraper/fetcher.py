@@ -1,5 +1,6 @@
 # fetcher.py
 import asyncio
+import hashlib
 import logging
 import os
 import random
@@ -19,9 +20,32 @@ from google_scholar_scraper.proxy_manager import ProxyManager
 from google_scholar_scraper.query_builder import QueryBuilder
 from google_scholar_scraper.utils import detect_captcha, get_random_user_agent
 
+# Returned by extract_cited_title when a cited-by page can't be fetched or parsed
+UNKNOWN_TITLE = "Unknown Title"
+
+
+def _pdf_basename(result_data: Dict) -> str:
+    """
+    Builds the "<title>_<year>_<id>" stem of a result's PDF filename.
+
+    The id is a short hash of the result's article URL (else its PDF URL, DOI or title), so two
+    results with the same sanitized title never download concurrently into the same file.
+    """
+    safe_title = re.sub(r'[\\/*?:"<>|]', "", result_data.get("title") or "untitled")
+    publication_info = result_data.get("publication_info")
+    year = publication_info.get("year") if isinstance(publication_info, dict) else None
+    year_str = str(year or "unknown")
+    key = (
+        result_data.get("article_url") or result_data.get("pdf_url") or result_data.get("doi") or result_data.get("title") or ""
+    )
+    result_id = hashlib.blake2b(key.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{safe_title}_{year_str}_{result_id}"
+
 
 class Fetcher:
-    def __init__(self, proxy_manager=None, min_delay=2, max_delay=5, max_retries=3, rolling_window_size=20):
+    def __init__(
+        self, proxy_manager=None, min_delay=2, max_delay=5, max_retries=3, rolling_window_size=20, max_concurrent_downloads=5
+    ):
         """
         Initializes the Fetcher.
 
@@ -31,6 +55,7 @@ class Fetcher:
             max_delay (int): Maximum delay between requests in seconds. Defaults to 5.
             max_retries (int): Maximum number of retries for a failed request. Defaults to 3.
             rolling_window_size (int): Size of the rolling window for RPS calculation. Defaults to 20.
+            max_concurrent_downloads (int): Maximum number of PDFs downloaded at once during scrape. Defaults to 5.
 
         """
         self.proxy_manager = proxy_manager or ProxyManager()
@@ -39,6 +64,7 @@ class Fetcher:
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.max_retries = max_retries
+        self.max_concurrent_downloads = max_concurrent_downloads
         self.parser = Parser()
         self.author_parser = AuthorProfileParser()  # Keep this if you are still using AuthorProfileParser
         # Statistics
@@ -50,6 +76,10 @@ class Fetcher:
         self.request_times = []
         self.rolling_window_size = rolling_window_size
         self.start_time = None
+        # Cited-by URL -> title from extract_cited_title; the same paper is often cited by many results
+        self._cited_title_cache: Dict[str, Optional[str]] = {}
+        # Cited-by pages already crawled, so shared ancestors in the citation graph are fetched once
+        self._fetched_cited_by_urls: set = set()
 
     async def _create_client(self) -> aiohttp.ClientSession:
         """Creates an aiohttp ClientSession if it doesn't exist or is closed."""
@@ -500,29 +530,41 @@ class Fetcher:
             return None
 
     async def extract_cited_title(self, cited_by_url):
-        """Extracts the title of the cited paper from the cited-by URL."""
+        """Extracts the title of the cited paper from the cited-by URL, caching it once the page has been fetched and parsed."""
         if not cited_by_url:
             return None
+        if cited_by_url in self._cited_title_cache:
+            return self._cited_title_cache[cited_by_url]
         try:
             html_content = await self.fetch_page(cited_by_url)
-            if html_content:
-                selector = Selector(text=html_content)
-                first_result = selector.css("div.gs_ri h3.gs_rt")
-                if first_result:
-                    return self.parser.extract_title(first_result)
+            if not html_content:
+                return UNKNOWN_TITLE  # Not cached, so a later visit retries the fetch
+            selector = Selector(text=html_content)
+            # Only the first heading; extract_title takes a single Selector, not a SelectorList
+            headings = selector.css("div.gs_ri h3.gs_rt")
+            title = self.parser.extract_title(headings[0]) if headings else UNKNOWN_TITLE
         except Exception as e:
             self.logger.error(f"Error extracting cited title from {cited_by_url}: {e}")
-        return "Unknown Title"
+            return UNKNOWN_TITLE
+        # Only a page that was actually fetched and parsed is cached (a missing heading won't appear on a retry)
+        self._cited_title_cache[cited_by_url] = title
+        return title
 
     async def fetch_cited_by_page(self, url, proxy_manager, depth, max_depth, graph_builder):
-        """Recursively fetches and parses cited-by pages to build a citation graph."""
-        if depth > max_depth:
+        """
+        Recursively fetches and parses cited-by pages to build a citation graph.
+        Each URL is crawled once per scrape; later visits (e.g. two papers citing the same one) return no tasks.
+        """
+        if depth > max_depth or url in self._fetched_cited_by_urls:
             return []
+        self._fetched_cited_by_urls.add(url)  # Claimed before awaiting, so concurrent siblings skip it too
 
         self.logger.info(f"Fetching cited-by page (depth {depth}): {url}")
         html_content = await self.fetch_page(url)
         tasks = []
-        if html_content:
+        if not html_content:
+            self._fetched_cited_by_urls.discard(url)  # Released, so a later visit can retry the page
+        else:
             try:
                 cited_by_results = self.parser.parse_results(html_content)
                 for result in cited_by_results:
@@ -560,6 +602,42 @@ class Fetcher:
             return 0
         return remaining_results / rps
 
+    async def _download_result_pdf(self, result_data: Dict, pdf_dir: str, semaphore: asyncio.Semaphore):
+        """Downloads a result's PDF (direct link first, then via DOI), setting result_data["pdf_path"] on success."""
+        async with semaphore:
+            pdf_downloaded_path = None
+            basename = None  # Built only once a download is attempted
+            # Attempt 1: Use existing pdf_url from parser if available
+            if result_data.get("pdf_url"):
+                direct_pdf_url = result_data["pdf_url"]
+                basename = _pdf_basename(result_data)
+                pdf_filename_direct = os.path.join(pdf_dir, f"{basename}_direct.pdf")
+                if await self.download_pdf(direct_pdf_url, pdf_filename_direct):
+                    pdf_downloaded_path = pdf_filename_direct
+                    self.logger.info(f"PDF downloaded (direct link) to: {pdf_downloaded_path}")
+
+            # Attempt 2: Try finding PDF via DOI if no direct link or direct download failed
+            if not pdf_downloaded_path and result_data.get("doi"):
+                self.logger.info(
+                    f"Attempting to find PDF via DOI: {result_data['doi']} for '{result_data.get('title') or 'N/A'}'"
+                )
+                pdf_url_from_doi = await self.scrape_pdf_link(result_data["doi"])
+                if pdf_url_from_doi:
+                    basename = basename or _pdf_basename(result_data)  # Before pdf_url is replaced below
+                    result_data["pdf_url"] = pdf_url_from_doi  # Update with potentially better URL
+                    pdf_filename_doi = os.path.join(pdf_dir, f"{basename}_doi.pdf")
+                    if await self.download_pdf(pdf_url_from_doi, pdf_filename_doi):
+                        pdf_downloaded_path = pdf_filename_doi
+                        self.logger.info(f"PDF downloaded (DOI link) to: {pdf_downloaded_path}")
+                else:
+                    self.logger.info(f"No PDF link found via DOI for: {result_data['doi']}")
+
+            if pdf_downloaded_path:
+                result_data["pdf_path"] = pdf_downloaded_path
+            else:
+                if result_data.get("pdf_url") or result_data.get("doi"):  # Only log if we tried
+                    self.logger.warning(f"Failed to download PDF for: {result_data.get('title') or 'N/A'}")
+
     async def scrape(
         self,
         query,
@@ -607,6 +685,10 @@ class Fetcher:
         all_results = []
         start_index = 0
         query_builder = QueryBuilder()
+        download_semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        # Each scrape crawls its own citation graph
+        self._cited_title_cache.clear()
+        self._fetched_cited_by_urls.clear()
 
         await self._create_client()
         self.start_time = time.monotonic()
@@ -653,61 +735,32 @@ class Fetcher:
                         self.logger.info(f"No results parsed from page: {url}. Stopping for this query.")
                         break
 
+                    if download_pdfs:
+                        # Results are independent, so their PDFs download concurrently (bounded by the semaphore)
+                        await asyncio.gather(
+                            *(self._download_result_pdf(result_data, pdf_dir, download_semaphore) for result_data in results_on_page)
+                        )
+
+                    # Store the whole page in one transaction (duplicates are skipped by the DataHandler)
+                    inserted_urls = await data_handler.insert_results(results_on_page)
+
                     citation_tasks = []
                     for result_data in results_on_page:  # Iterate over results_on_page
-                        if download_pdfs:
-                            pdf_downloaded_path = None
-                            # Attempt 1: Use existing pdf_url from parser if available
-                            if result_data.get("pdf_url"):
-                                direct_pdf_url = result_data["pdf_url"]
-                                safe_title = re.sub(r'[\\/*?:"<>|]', "", result_data.get("title", "untitled"))
-                                year_str = str(result_data.get("year", "unknown"))
-                                pdf_filename_direct = os.path.join(pdf_dir, f"{safe_title}_{year_str}_direct.pdf")
-                                if await self.download_pdf(direct_pdf_url, pdf_filename_direct):
-                                    pdf_downloaded_path = pdf_filename_direct
-                                    self.logger.info(f"PDF downloaded (direct link) to: {pdf_downloaded_path}")
-
-                            # Attempt 2: Try finding PDF via DOI if no direct link or direct download failed
-                            if not pdf_downloaded_path and result_data.get("doi"):
-                                self.logger.info(
-                                    f"Attempting to find PDF via DOI: {result_data['doi']} for '{result_data.get('title', 'N/A')}'"
-                                )
-                                pdf_url_from_doi = await self.scrape_pdf_link(result_data["doi"])
-                                if pdf_url_from_doi:
-                                    result_data["pdf_url"] = pdf_url_from_doi  # Update with potentially better URL
-                                    safe_title = re.sub(r'[\\/*?:"<>|]', "", result_data.get("title", "untitled"))
-                                    year_str = str(result_data.get("year", "unknown"))
-                                    pdf_filename_doi = os.path.join(pdf_dir, f"{safe_title}_{year_str}_doi.pdf")
-                                    if await self.download_pdf(pdf_url_from_doi, pdf_filename_doi):
-                                        pdf_downloaded_path = pdf_filename_doi
-                                        self.logger.info(f"PDF downloaded (DOI link) to: {pdf_downloaded_path}")
-                                else:
-                                    self.logger.info(f"No PDF link found via DOI for: {result_data['doi']}")
-
-                            if pdf_downloaded_path:
-                                result_data["pdf_path"] = pdf_downloaded_path
-                            else:
-                                if result_data.get("pdf_url") or result_data.get("doi"):  # Only log if we tried
-                                    self.logger.warning(f"Failed to download PDF for: {result_data.get('title', 'N/A')}")
-
-                        # Add result to data_handler
-                        db_id = await data_handler.add_result(result_data)
-                        if db_id:  # If result was successfully added (e.g., not a duplicate if DH handles that)
-                            # Add citation link to graph_builder
-                            cited_title = await self.extract_cited_title(result_data.get("cited_by_url"))
-                            graph_builder.add_citation(
-                                result_data["title"],
-                                result_data.get("article_url"),
-                                result_data.get("cited_by_url"),
-                                cited_title,
-                                result_data.get("doi"),
+                        if result_data.get("article_url") not in inserted_urls:
+                            continue  # Already stored (or not storable), so its citations were handled before
+                        # Add citation link to graph_builder
+                        cited_title = await self.extract_cited_title(result_data.get("cited_by_url"))
+                        graph_builder.add_citation(
+                            result_data["title"],
+                            result_data.get("article_url"),
+                            result_data.get("cited_by_url"),
+                            cited_title,
+                            result_data.get("doi"),
+                        )
+                        if result_data.get("cited_by_url") and max_depth > 0:  # Check max_depth before appending task
+                            citation_tasks.append(
+                                self.fetch_cited_by_page(result_data["cited_by_url"], self.proxy_manager, 1, max_depth, graph_builder)
                             )
-                            if result_data.get("cited_by_url") and max_depth > 0:  # Check max_depth before appending task
-                                citation_tasks.append(
-                                    self.fetch_cited_by_page(
-                                        result_data["cited_by_url"], self.proxy_manager, 1, max_depth, graph_builder
-                                    )
-                                )
 
                     if citation_tasks:
                         nested_tasks = await asyncio.gather(*citation_tasks)
@@ -17,11 +17,17 @@ class GraphBuilder:
     Generates visualizations in 'graph_citations' folder by default, with spring, circular, and kamada_kawai layouts.
     """
 
-    def __init__(self):
-        """Initializes the GraphBuilder with an empty directed graph."""
+    def __init__(self, output_folder="graph_citations"):
+        """Initializes the GraphBuilder with an empty directed graph.
+
+        Args:
+            output_folder (str, optional): Folder for saved graphs and visualizations,
+                                           created if missing. Defaults to "graph_citations".
+
+        """
         self.graph = nx.DiGraph()
         self.logger = logging.getLogger(__name__)
-        self.output_folder = "graph_citations"  # Default output folder for graph files
+        self.output_folder = output_folder  # Output folder for graph files
         os.makedirs(self.output_folder, exist_ok=True)  # Ensure output folder exists
 
     def add_citation(self, citing_title, citing_url, cited_by_url, cited_title=None, citing_doi=None, cited_doi=None):
@@ -57,15 +63,18 @@ class GraphBuilder:
         else:
             self.logger.debug(f"Skipped self-citation for '{citing_title}'")
 
-    def save_graph(self, filename="citation_graph.graphml"):
+    def save_graph(self, filename="citation_graph.graphml", fp=None):
         """Saves the citation graph to a GraphML file in the 'graph_citations' folder.
 
         Args:
             filename (str, optional): The base filename to save the graph to.
                                      Defaults to "citation_graph.graphml".  Will be saved in 'graph_citations' folder.
+            fp (file-like, optional): A binary file object to write the GraphML to instead,
+                                     e.g. an io.BytesIO; filename is ignored when given. Defaults to None.
 
         """
-        full_filename = os.path.join(self.output_folder, filename)  # Save in output folder
+        # Save in output folder, unless a file object was given
+        full_filename = os.path.join(self.output_folder, filename) if fp is None else fp
         try:
             nx.write_graphml(self.graph, full_filename)
             self.logger.info(
@@ -75,7 +84,7 @@ class GraphBuilder:
         except Exception as e:
             self.logger.error(f"Error saving graph to {full_filename}: {e}", exc_info=True)
 
-    def load_graph(self, filename="citation_graph.graphml"):
+    def load_graph(self, filename="citation_graph.graphml", fp=None):
         """Loads a citation graph from a GraphML file in the 'graph_citations' folder.
 
         Handles FileNotFoundError and general exceptions during graph loading
@@ -84,9 +93,12 @@ class GraphBuilder:
         Args:
             filename (str, optional): The base filename to load the graph from.
                                      Defaults to "citation_graph.graphml". Will be loaded from 'graph_citations' folder.
+            fp (file-like, optional): A binary file object to read the GraphML from instead,
+                                     e.g. an io.BytesIO; filename is ignored when given. Defaults to None.
 
         """
-        full_filename = os.path.join(self.output_folder, filename)  # Load from output folder
+        # Load from output folder, unless a file object was given
+        full_filename = os.path.join(self.output_folder, filename) if fp is None else fp
         try:
             self.graph = nx.read_graphml(full_filename)
             self.logger.info(f"Graph loaded from {full_filename}")
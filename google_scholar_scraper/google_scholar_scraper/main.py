@@ -89,10 +89,11 @@ async def main():
     data_handler = DataHandler()
     graph_builder = GraphBuilder()
 
-    await data_handler.create_table()
-    os.makedirs(args.pdf_dir, exist_ok=True)
-
     try:  # Top-level error handling
+        await data_handler.connect()  # Reuse one database connection for the whole run
+        await data_handler.create_table()
+        os.makedirs(args.pdf_dir, exist_ok=True)
+
         try:
             await proxy_manager.get_working_proxies()
         except NoProxiesAvailable:
@@ -216,6 +217,7 @@ async def main():
 
     finally:
         await fetcher.close()
+        await data_handler.close()
         proxy_manager.log_proxy_performance()
         logging.info("--- Scraping process finished ---")  # End process log message
 
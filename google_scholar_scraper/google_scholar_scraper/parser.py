@@ -2,9 +2,42 @@
 import logging
 import re
 
+from lxml import etree
 from parsel import Selector
 
 from google_scholar_scraper.exceptions import ParsingException
+from google_scholar_scraper.utils import compile_css, first_match
+
+SCHOLAR_BASE_URL = "https://scholar.google.com"
+DOI_URL_PATTERN = re.compile(r"https?://doi\.org/(10\.[^/]+/[^/]+)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+YEAR_PATTERN = re.compile(r"\b(\d{4})\b")
+COUNT_PATTERN = re.compile(r"\d+")
+
+
+def _absolute_url(href):
+    """Resolves a Scholar-relative href (e.g. "/scholar?cites=...") to an absolute URL."""
+    return href if href.startswith("http") else f"{SCHOLAR_BASE_URL}{href}"
+
+
+# Per-result queries for the extract_* methods, evaluated straight on each item's lxml node so
+# parsel does not re-translate the CSS and wrap the matches in a SelectorList on every call.
+# A trailing " ::text" collects all descendant text, e.g. the <b> highlights inside a title link.
+_TITLE_LINK = compile_css("h3.gs_rt a")
+_TITLE_LINK_TEXT = compile_css("h3.gs_rt a ::text")
+_TITLE_TEXT = compile_css("h3.gs_rt::text")
+_AUTHORS_TEXT = compile_css("div.gs_a ::text")
+_SNIPPET_TEXT = compile_css("div.gs_rs ::text")
+_CITED_BY_TEXT = compile_css("a[href*='scholar?cites']::text")
+_CITED_BY_HREF = compile_css("a[href*='scholar?cites']::attr(href)")
+_RELATED_LINKS = compile_css('div.gs_fl a[href*="?related="]')
+_DOI_LINK_HREFS = compile_css("div.gs_or_ggsm a::attr(href)")
+_ALL_TEXT = etree.XPath(".//text()")
+
+
+def _html_selector(html_content):
+    """Parses a Scholar page with parsel's lxml HTML parser, skipping its JSON/XML content sniffing."""
+    return Selector(text=html_content, type="html")
 
 
 class Parser:
@@ -12,7 +45,7 @@ class Parser:
         self.logger = logging.getLogger(__name__)
 
     def parse_results(self, html_content, include_raw_item=False):
-        selector = Selector(text=html_content)
+        selector = _html_selector(html_content)
         results = []
 
         for item_selector in selector.css("div.gs_ri"):
@@ -63,48 +96,40 @@ class Parser:
                 self.logger.error(f"Error parsing an item: {e}")
                 raise ParsingException(f"Error during parsing: {e}") from e
 
-        next_page_url = self.find_next_page(html_content)
-        # To make next_page_url available to the caller, parse_results could return (results, next_page_url)
-        # For now, tests will be adjusted to call find_next_page separately or this structure will be revisited.
-        # Let's assume for now the primary return is the list of result dicts.
+        # Callers that page through results call find_next_page themselves; the primary return is the result dicts
         return results
 
     def parse_raw_items(self, html_content):
-        selector = Selector(text=html_content)
+        selector = _html_selector(html_content)
         return selector.css("div.gs_ri")
 
     def extract_title(self, item_selector):
         try:
-            title_tag = item_selector.css("h3.gs_rt")
-            if title_tag:
-                link_tag = title_tag.css("a")
-                if link_tag:
-                    # Get all text nodes within the <a> tag, including those in nested tags like <b>
-                    link_text_parts = link_tag.css("::text").getall()
-                    if link_text_parts:
-                        return "".join(link_text_parts).strip()
-                    return None  # Link tag exists but is empty
-                else:
-                    # No <a> tag, try to get text directly from h3.gs_rt
-                    direct_text = title_tag.xpath("./text()").get()
-                    return direct_text.strip() if direct_text else None
-            return None
+            node = item_selector.root
+            if _TITLE_LINK(node):
+                # Get all text nodes within the <a> tag, including those in nested tags like <b>
+                link_text_parts = _TITLE_LINK_TEXT(node)
+                if link_text_parts:
+                    return "".join(link_text_parts).strip()
+                return None  # Link tag exists but is empty
+            # No <a> tag (or no h3.gs_rt at all), try to get text directly from h3.gs_rt
+            direct_text = first_match(_TITLE_TEXT, node)
+            return direct_text.strip() if direct_text else None
         except Exception as e:
             self.logger.error(f"Error extracting title: {e}")
             return None
 
     def extract_authors(self, item_selector):
         try:
-            authors_tag = item_selector.css("div.gs_a")
-            if authors_tag:
-                # Get all descendant text nodes, join them, and then clean up
-                # This ensures text from <a> tags (for authors) and other nested elements is included.
-                author_text_all_nodes = authors_tag.xpath("descendant-or-self::text()").getall()
+            # Get all descendant text nodes, join them, and then clean up
+            # This ensures text from <a> tags (for authors) and other nested elements is included.
+            author_text_all_nodes = _AUTHORS_TEXT(item_selector.root)
+            if author_text_all_nodes:
                 author_text = "".join(author_text_all_nodes).strip()
                 # Replace non-breaking spaces with regular spaces for consistent splitting
                 author_text = author_text.replace("\xa0", " ")
                 # Consolidate multiple spaces
-                author_text = re.sub(r"\s+", " ", author_text).strip()
+                author_text = WHITESPACE_PATTERN.sub(" ", author_text).strip()
                 if author_text:
                     # Authors are typically before the first " - "
                     authors_segment = author_text.split(" - ", 1)[0]
@@ -128,22 +153,21 @@ class Parser:
 
                     return authors_list
                 return []  # Return empty list if author_text parsing fails
-            return []  # Return empty list if authors_tag is not found
+            return []  # Return empty list if div.gs_a is missing or empty
         except Exception as e:
             self.logger.error(f"Error extracting authors: {e}")
             return []  # Return empty list on exception
 
     def extract_publication_info(self, item_selector):
         try:
-            pub_info_tag = item_selector.css("div.gs_a")
-            if not pub_info_tag:  # Ensure the tag exists
+            # Get all text, including from within <a> tags for authors, etc.
+            full_text_nodes = _AUTHORS_TEXT(item_selector.root)
+            if not full_text_nodes:  # Missing or empty div.gs_a
                 return {}
 
-            # Get all text, including from within <a> tags for authors, etc.
-            full_text_nodes = pub_info_tag.xpath("descendant-or-self::text()").getall()
             full_text = "".join(full_text_nodes).strip()
             full_text = full_text.replace("\xa0", " ")  # Replace non-breaking space
-            full_text = re.sub(r"\s+", " ", full_text).strip()  # Consolidate multiple spaces
+            full_text = WHITESPACE_PATTERN.sub(" ", full_text).strip()  # Consolidate multiple spaces
 
             if not full_text:
                 return {}
@@ -158,7 +182,7 @@ class Parser:
             publication_name = ""  # Default to empty
 
             best_year_match_obj = None
-            for m in re.finditer(r"\b(\d{4})\b", pub_year_segment):
+            for m in YEAR_PATTERN.finditer(pub_year_segment):
                 best_year_match_obj = m  # Takes the last (rightmost) year
 
             if best_year_match_obj:
@@ -198,13 +222,12 @@ class Parser:
 
     def extract_snippet(self, item_selector):
         try:
-            snippet_tag = item_selector.css("div.gs_rs")
-            if snippet_tag:
-                # Get all text nodes, this will include text before and after <br> as separate items
-                text_nodes = snippet_tag.xpath("descendant-or-self::text()").getall()
+            # Get all text nodes, this will include text before and after <br> as separate items
+            text_nodes = _SNIPPET_TEXT(item_selector.root)
+            if text_nodes:
                 # Join with spaces, then clean up multiple spaces and strip
                 snippet_text = " ".join(node.strip() for node in text_nodes if node.strip())
-                snippet_text = re.sub(r"\s+", " ", snippet_text).strip()
+                snippet_text = WHITESPACE_PATTERN.sub(" ", snippet_text).strip()
                 return snippet_text if snippet_text else None
             return None
         except Exception as e:
@@ -213,20 +236,13 @@ class Parser:
 
     def extract_cited_by(self, item_selector):
         try:
-            cited_by_tag = item_selector.css("a[href*='scholar?cites']")  # Corrected selector
-            if cited_by_tag:
-                cited_by_text = cited_by_tag.xpath("./text()").get()
-                match = re.search(r"\d+", cited_by_text) if cited_by_text else None
+            node = item_selector.root
+            cited_by_url_path = first_match(_CITED_BY_HREF, node)
+            if cited_by_url_path:
+                cited_by_text = first_match(_CITED_BY_TEXT, node)
+                match = COUNT_PATTERN.search(cited_by_text) if cited_by_text else None
                 cited_by_count = int(match.group(0)) if match else 0
-                cited_by_url_path = cited_by_tag.attrib.get("href")
-                if cited_by_url_path:
-                    if cited_by_url_path.startswith("http"):
-                        cited_by_url = cited_by_url_path
-                    else:
-                        cited_by_url = f"https://scholar.google.com{cited_by_url_path}"
-                else:
-                    cited_by_url = None
-                return {"count": cited_by_count, "url": cited_by_url}
+                return {"count": cited_by_count, "url": _absolute_url(cited_by_url_path)}
             return {"count": 0, "url": None}
         except Exception as e:
             self.logger.error(f"Error extracting cited_by info: {e}")
@@ -235,21 +251,12 @@ class Parser:
     def extract_related_articles_url(self, item_selector):
         try:
             # Look for links containing "?related=" and text "Related articles"
-            # Reverting to CSS selector
-            css_selector = 'div.gs_fl a[href*="?related="]'
-            related_tags = item_selector.css(css_selector)
-            # self.logger.info(f"DEBUG-RAU: Found {len(related_tags)} tags for CSS '{css_selector}' selector.") # DEBUG removed
-            for idx, tag in enumerate(related_tags):
-                tag_text_parts = tag.xpath(".//text()").getall()
-                tag_text = "".join(tag_text_parts).strip().lower()
-                # self.logger.info(f"DEBUG-RAU: Tag {idx} text: '{tag_text}', href: '{tag.attrib.get('href')}'") # DEBUG removed
+            for tag in _RELATED_LINKS(item_selector.root):
+                tag_text = "".join(_ALL_TEXT(tag)).strip().lower()
                 if "related articles" in tag_text:
-                    href = tag.attrib.get("href")
+                    href = tag.get("href")
                     if href:
-                        if href.startswith("http"):  # Ensure URL is absolute
-                            return href
-                        else:
-                            return f"https://scholar.google.com{href}"
+                        return _absolute_url(href)  # Ensure URL is absolute
             # Fallback or alternative selectors if needed can be added here
             return None
         except Exception as e:
@@ -258,42 +265,33 @@ class Parser:
 
     def extract_article_url(self, item_selector):
         try:
-            link_tag = item_selector.css("h3.gs_rt a")
-            if link_tag:
-                href = link_tag.attrib.get("href")
-                # self.logger.info(f"DEBUG-EAU: Found link_tag for article_url. Tag: {link_tag.get()}, Href: {href}") # DEBUG removed
-                return href
-            else:
-                # self.logger.info("DEBUG-EAU: No link_tag found for h3.gs_rt a.") # DEBUG removed
-                return None
+            link_tags = _TITLE_LINK(item_selector.root)
+            # Like SelectorList.attrib, only the first title link's href counts
+            return link_tags[0].get("href") if link_tags else None
         except Exception as e:
             self.logger.error(f"Error extracting article URL: {e}")
             return None
 
     def extract_doi(self, item_selector):
         try:
-            links_div = item_selector.css("div.gs_or_ggsm")
-            if links_div:
-                for link in links_div.css("a"):
-                    href = link.attrib.get("href")  # Use .get() for safety
-                    if href:
-                        match = re.search(r"https?://doi\.org/(10\.[^/]+/[^/]+)", href)
-                        if match:
-                            return match.group(1)
+            for href in _DOI_LINK_HREFS(item_selector.root):
+                match = DOI_URL_PATTERN.search(href)
+                if match:
+                    return match.group(1)
             return None
         except Exception as e:
             self.logger.error(f"Error extracting DOI: {e}")
             return None
 
     def find_next_page(self, html_content):
-        selector = Selector(text=html_content)
+        selector = _html_selector(html_content)
         # Try to find the "Next" link. Google might use different structures.
         # Option 1: Specific td.gs_n structure often seen
         next_button = selector.css('td.gs_n a[href*="start="]')
         if next_button and "Next" in next_button.xpath(".//text()").get(default="").strip():
             href = next_button.attrib.get("href")
             if href:
-                return href if href.startswith("http") else f"https://scholar.google.com{href}"
+                return _absolute_url(href)
             return None
 
         # Option 2: More general "Next" link, possibly with aria-label
@@ -301,7 +299,7 @@ class Parser:
         if next_button_aria:
             href_aria = next_button_aria.attrib.get("href")
             if href_aria:
-                return href_aria if href_aria.startswith("http") else f"https://scholar.google.com{href_aria}"
+                return _absolute_url(href_aria)
             return None
 
         # Option 3: Link within a div with id="gs_n" then td a
@@ -315,7 +313,7 @@ class Parser:
                 if "Next" in button_text_content:
                     href_div_gsn = btn_candidate.attrib.get("href")
                     if href_div_gsn:
-                        return href_div_gsn if href_div_gsn.startswith("http") else f"https://scholar.google.com{href_div_gsn}"
+                        return _absolute_url(href_div_gsn)
                     return None
 
         # Option 4: Link with text "Next" within a common navigation area (original Option 3)
@@ -330,7 +328,7 @@ class AuthorProfileParser:
         self.logger = logging.getLogger(__name__)
 
     def parse_profile(self, html_content):
-        selector = Selector(text=html_content)
+        selector = _html_selector(html_content)
         try:
             name = selector.css("#gsc_prf_in::text").get()
             affiliation = selector.css("#gsc_prf_i+ .gsc_prf_il::text").get()
@@ -339,7 +337,7 @@ class AuthorProfileParser:
             for coauthor in selector.css("#gsc_rsb_coo a"):
                 coauthor_name = coauthor.css("::text").get()
                 coauthor_href = coauthor.attrib.get("href")
-                coauthor_link = f"https://scholar.google.com{coauthor_href}" if coauthor_href else None
+                coauthor_link = _absolute_url(coauthor_href) if coauthor_href else None
                 coauthors.append({"name": coauthor_name, "link": coauthor_link})
 
             # Use a more robust method to extract citation stats, handling missing values
@@ -360,7 +358,7 @@ class AuthorProfileParser:
             for pub in selector.css(".gsc_a_tr"):
                 title = pub.css(".gsc_a_at::text").get()
                 pub_link_href = pub.css(".gsc_a_at::attr(href)").get()
-                link = f"https://scholar.google.com{pub_link_href}" if pub_link_href else None
+                link = _absolute_url(pub_link_href) if pub_link_href else None
                 pub_info = pub.css(".gs_gray::text").getall()
                 authors = pub_info[0] if len(pub_info) > 0 else ""
                 publication_info = pub_info[1] if len(pub_info) > 1 else ""
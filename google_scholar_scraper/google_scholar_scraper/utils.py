@@ -4,6 +4,8 @@ import re
 from typing import Optional  # Added Optional
 
 from fake_useragent import UserAgent
+from lxml import etree
+from parsel.csstranslator import css2xpath
 
 
 def get_random_delay(min_delay=2, max_delay=5):
@@ -73,3 +75,33 @@ def detect_captcha(html_content: Optional[str]) -> bool:
         if re.search(pattern, html_content, re.IGNORECASE):
             return True
     return False
+
+
+def compile_css(query: str) -> etree.XPath:
+    """
+    Translates a parsel CSS query (including ::text / ::attr()) into a compiled lxml XPath once.
+
+    Args:
+        query (str): A CSS query as accepted by parsel's Selector.css().
+
+    Returns:
+        etree.XPath: The compiled query.
+
+    """
+    return etree.XPath(css2xpath(query))
+
+
+def first_match(xpath: etree.XPath, node) -> Optional[str]:
+    """
+    Returns the first string result of a compiled query on an lxml node, like SelectorList.get().
+
+    Args:
+        xpath (etree.XPath): A query compiled with compile_css.
+        node: The lxml element to evaluate it on (e.g. a Selector's .root).
+
+    Returns:
+        Optional[str]: The first result as a string, or None if nothing matched.
+
+    """
+    results = xpath(node)
+    return str(results[0]) if results else None
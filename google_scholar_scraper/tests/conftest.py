@@ -2,11 +2,18 @@
 Test configuration for Google Scholar Scraper tests.
 Contains fixtures and configuration for pytest.
 """
+import asyncio
+import logging
 import os
 import sys
 import pytest
 from pathlib import Path
 
+try:
+    import uvloop  # Optional: faster event loop for the async tests
+except ImportError:
+    uvloop = None
+
 # Add the parent directory to sys.path to allow imports from the main package
 # Since the package structure is google_scholar_scraper/google_scholar_scraper
 # we need to make sure both are in the path
@@ -17,6 +24,41 @@ sys.path.insert(0, str(project_root))
 os.makedirs(os.path.join(os.path.dirname(__file__), 'data'), exist_ok=True)
 
 # Common fixtures for tests
+@pytest.fixture(scope="session", autouse=True)
+def event_loop_policy():
+    """Runs every async test on uvloop when it is installed, otherwise on the default asyncio loop"""
+    policy = uvloop.EventLoopPolicy() if uvloop is not None else asyncio.DefaultEventLoopPolicy()
+    asyncio.set_event_loop_policy(policy)
+    yield policy
+    asyncio.set_event_loop_policy(None)
+
+
+@pytest.fixture
+def event_loop(event_loop_policy):
+    """Per-test event loop created from event_loop_policy (overrides pytest-asyncio's default)"""
+    loop = event_loop_policy.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def _restore_root_logging():
+    """Restores the root logger's handlers and level after each test, so no test's logging setup leaks into the next"""
+    handlers, level = list(logging.root.handlers), logging.root.level
+    yield
+    logging.root.handlers[:] = handlers
+    logging.root.setLevel(level)
+
+
+@pytest.fixture(scope="session")
+def direct_proxy_manager(tmp_path_factory):
+    """A ProxyManager forcing direct connections, built once per session with an empty blacklist file"""
+    from google_scholar_scraper.proxy_manager import ProxyManager
+
+    blacklist_file = tmp_path_factory.mktemp("proxy_manager") / "blacklist.json"
+    blacklist_file.write_text("{}")  # Empty JSON so the blacklist loads cleanly
+    return ProxyManager(force_direct_connection=True, debug_mode=False, blacklist_file=str(blacklist_file))
+
 @pytest.fixture
 def sample_html_path():
     """Path to sample HTML files directory"""
@@ -1,9 +1,11 @@
 import json
+import uuid
 
 import aiosqlite  # Added import
 import pandas as pd
 import pytest
-from google_scholar_scraper.data_handler import DataHandler
+import google_scholar_scraper.data_handler as data_handler_module
+from google_scholar_scraper.data_handler import RESULT_COLUMNS, DataHandler, _url_hash
 
 # Sample data for testing
 SAMPLE_RESULT_1 = {
@@ -38,18 +40,18 @@ SAMPLE_RESULT_2 = {
 
 
 @pytest.fixture
-async def data_handler(tmp_path):  # Added tmp_path parameter
+async def data_handler():
     """
-    Provides a DataHandler instance with a temporary database using tmp_path.
+    Provides a connected DataHandler instance backed by a uniquely named in-memory database.
 
-    Note: This fixture returns the handler. Tests must await this fixture
-    to get the DataHandler instance.
+    The handler's long-lived connection keeps the shared-cache database alive for the
+    duration of the test, so nothing touches disk; it is closed on teardown.
     """
-    db_path = tmp_path / "test_scholar_data.db"  # Use tmp_path
-    handler = DataHandler(db_name=str(db_path))
-    # Ensure table is created before tests run
-    await handler.create_table()
-    return handler  # Returns the handler
+    db_uri = f"file:test_scholar_data_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    async with DataHandler(db_name=db_uri, uri=True) as handler:
+        # Ensure table is created before tests run
+        await handler.create_table()
+        yield handler
 
 
 # Removed data_handler_diagnostic fixture
@@ -59,7 +61,8 @@ async def data_handler(tmp_path):  # Added tmp_path parameter
 async def test_data_handler_init(data_handler):  # Now uses the main data_handler fixture
     """Test DataHandler initialization."""
     actual_dh = data_handler  # Fixture is already resolved by pytest-asyncio
-    assert actual_dh.db_name.endswith("test_scholar_data.db")  # Uses main DB name
+    assert actual_dh.db_name.startswith("file:test_scholar_data_")  # Uses the in-memory test DB
+    assert actual_dh.uri is True
     assert isinstance(actual_dh.logger, object)  # Basic check for logger
 
 
@@ -70,7 +73,7 @@ async def test_create_table_idempotent(data_handler):
     await actual_dh.create_table()  # Call again
     # Check if table exists by trying to query it (simple query)
     try:
-        async with aiosqlite.connect(actual_dh.db_name) as db:
+        async with aiosqlite.connect(actual_dh.db_name, uri=True) as db:
             cursor = await db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='results';")
             table = await cursor.fetchone()
             assert table is not None
@@ -88,7 +91,7 @@ async def test_insert_and_retrieve_result(data_handler):
     assert await actual_dh.result_exists(SAMPLE_RESULT_1["article_url"])
 
     # Verify content
-    async with aiosqlite.connect(actual_dh.db_name) as db:
+    async with aiosqlite.connect(actual_dh.db_name, uri=True) as db:
         cursor = await db.execute("SELECT * FROM results WHERE article_url = ?", (SAMPLE_RESULT_1["article_url"],))
         row = await cursor.fetchone()
         assert row is not None
@@ -96,24 +99,124 @@ async def test_insert_and_retrieve_result(data_handler):
         assert row[1] == ",".join(SAMPLE_RESULT_1["authors"])
         assert json.loads(row[2]) == SAMPLE_RESULT_1["publication_info"]
         assert row[6] == SAMPLE_RESULT_1["article_url"]  # article_url is unique
+        assert row[12] == _url_hash(SAMPLE_RESULT_1["article_url"])  # url_hash lookup key
+
+
+@pytest.mark.asyncio
+async def test_create_table_migrates_legacy_schema(tmp_path):
+    """Test that create_table adds and backfills url_hash on a table created without it."""
+    db_path = str(tmp_path / "legacy.db")
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            """
+            CREATE TABLE results (
+                title TEXT, authors TEXT, publication_info TEXT, snippet TEXT,
+                cited_by_count INTEGER, related_articles_url TEXT,
+                article_url TEXT UNIQUE, pdf_url TEXT, pdf_path TEXT,
+                doi TEXT, affiliations TEXT, cited_by_url TEXT
+            )
+            """
+        )
+        await db.execute("INSERT INTO results (title, article_url) VALUES (?, ?)", ("Legacy", "http://example.com/legacy"))
+        await db.commit()
+
+    async with DataHandler(db_name=db_path) as handler:
+        await handler.create_table()
+        await handler.create_table()  # Migration is idempotent
+        assert await handler.result_exists("http://example.com/legacy")
+        assert await handler.insert_result(SAMPLE_RESULT_1)
+        results = await handler.get_all_results()
+        assert [r["title"] for r in results] == ["Legacy", SAMPLE_RESULT_1["title"]]
+        assert "url_hash" not in results[0]
+
+
+
+@pytest.mark.asyncio
+async def test_url_hash_collision_keeps_both_rows(tmp_path, monkeypatch):
+    """Test that two URLs sharing a url_hash are both stored and told apart, even on a database with the old unique hash index."""
+    db_path = str(tmp_path / "collision.db")
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            """
+            CREATE TABLE results (
+                title TEXT, authors TEXT, publication_info TEXT, snippet TEXT,
+                cited_by_count INTEGER, related_articles_url TEXT,
+                article_url TEXT UNIQUE, pdf_url TEXT, pdf_path TEXT,
+                doi TEXT, affiliations TEXT, cited_by_url TEXT,
+                url_hash INTEGER
+            )
+            """
+        )
+        await db.execute("CREATE UNIQUE INDEX idx_url_hash ON results(url_hash)")
+        await db.commit()
+    monkeypatch.setattr(data_handler_module, "_url_hash", lambda article_url: 42)  # Every URL collides
+
+    async with DataHandler(db_name=db_path) as handler:
+        await handler.create_table()
+        inserted = await handler.insert_results([SAMPLE_RESULT_1, SAMPLE_RESULT_2])
+
+        assert inserted == {SAMPLE_RESULT_1["article_url"], SAMPLE_RESULT_2["article_url"]}
+        assert await handler.result_exists(SAMPLE_RESULT_1["article_url"])
+        assert await handler.result_exists(SAMPLE_RESULT_2["article_url"])
+        assert not await handler.result_exists("http://example.com/absent")
 
 
 @pytest.mark.asyncio
 async def test_insert_duplicate_result(data_handler):
     """Test that inserting a duplicate result is handled gracefully."""
     actual_dh = data_handler
-    await actual_dh.insert_result(SAMPLE_RESULT_1)
+    assert await actual_dh.insert_result(SAMPLE_RESULT_1)
     # Attempt to insert the same result again
-    await actual_dh.insert_result(SAMPLE_RESULT_1)  # Should not raise error and be skipped
+    assert not await actual_dh.insert_result(SAMPLE_RESULT_1)  # Should not raise error and be skipped
+    assert not await actual_dh.add_result(SAMPLE_RESULT_1)
 
     # Check that only one entry exists
-    async with aiosqlite.connect(actual_dh.db_name) as db:
+    async with aiosqlite.connect(actual_dh.db_name, uri=True) as db:
         cursor = await db.execute("SELECT COUNT(*) FROM results WHERE article_url = ?", (SAMPLE_RESULT_1["article_url"],))
         count = await cursor.fetchone()
         assert count is not None  # Ensure 'count' is not None before subscripting
         assert count[0] == 1
 
 
+@pytest.mark.asyncio
+async def test_bulk_insert(data_handler):
+    """Test inserting many results in one call, with duplicates skipped."""
+    actual_dh = data_handler
+    rows = [dict(SAMPLE_RESULT_1, article_url=f"http://example.com/bulk{i}") for i in range(25)]
+    inserted = await actual_dh.insert_results(rows + [rows[0]])  # Trailing duplicate is ignored
+    assert inserted == {row["article_url"] for row in rows}
+
+    async with aiosqlite.connect(actual_dh.db_name, uri=True) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM results")
+        count = await cursor.fetchone()
+        assert count is not None
+        assert count[0] == 25
+
+
+@pytest.mark.asyncio
+async def test_insert_results_skips_malformed_row(data_handler):
+    """Test that one result missing required keys is skipped without losing the rest of the batch."""
+    actual_dh = data_handler
+    malformed = {"article_url": "http://example.com/malformed"}  # No title, authors, ...
+    inserted = await actual_dh.insert_results([SAMPLE_RESULT_1, malformed, SAMPLE_RESULT_2])
+    assert inserted == {SAMPLE_RESULT_1["article_url"], SAMPLE_RESULT_2["article_url"]}
+
+    assert await actual_dh.result_exists(SAMPLE_RESULT_1["article_url"])
+    assert await actual_dh.result_exists(SAMPLE_RESULT_2["article_url"])
+    assert not await actual_dh.result_exists(malformed["article_url"])
+
+
+@pytest.mark.asyncio
+async def test_operations_without_long_lived_connection(tmp_path):
+    """Test that an unconnected DataHandler falls back to a connection per call."""
+    handler = DataHandler(db_name=str(tmp_path / "unconnected.db"))
+    await handler.create_table()
+    assert await handler.insert_result(SAMPLE_RESULT_1)
+    assert await handler.result_exists(SAMPLE_RESULT_1["article_url"])
+    assert len(await handler.get_all_results()) == 1
+    assert handler._db is None
+
+
 @pytest.mark.asyncio
 async def test_result_exists_not_found(data_handler):
     """Test result_exists for a non-existent URL."""
@@ -134,6 +237,8 @@ async def test_save_to_csv(data_handler, tmp_path):
     assert len(df) == 2
     assert df.iloc[0]["title"] == SAMPLE_RESULT_1["title"]
     assert df.iloc[1]["article_url"] == SAMPLE_RESULT_2["article_url"]
+    assert df.iloc[0]["authors"] == "Author A,Author B"
+    assert json.loads(df.iloc[0]["publication_info"]) == SAMPLE_RESULT_1["publication_info"]
 
 
 @pytest.mark.asyncio
@@ -166,6 +271,36 @@ async def test_save_to_json(data_handler, tmp_path):
     assert data[1]["article_url"] == SAMPLE_RESULT_2["article_url"]
 
 
+@pytest.mark.asyncio
+async def test_save_to_json_without_orjson(data_handler, tmp_path, monkeypatch):
+    """Test that save_to_json falls back to the stdlib json module when orjson is missing."""
+    monkeypatch.setattr("google_scholar_scraper.data_handler.orjson", None)
+    actual_dh = data_handler
+    results_list = [dict(SAMPLE_RESULT_1, title="Tëst Ärticle")]
+    json_file = tmp_path / "fallback_output.json"
+    actual_dh.save_to_json(results_list, str(json_file))
+
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data[0]["title"] == "Tëst Ärticle"
+
+
+@pytest.mark.asyncio
+async def test_save_to_json_same_bytes_with_and_without_orjson(data_handler, tmp_path, monkeypatch):
+    """Test that the orjson and stdlib json paths of save_to_json write byte-identical files."""
+    pytest.importorskip("orjson")
+    actual_dh = data_handler
+    results_list = [dict(SAMPLE_RESULT_1, title="Tëst Ärticle"), SAMPLE_RESULT_2]
+    orjson_file = tmp_path / "orjson_output.json"
+    fallback_file = tmp_path / "fallback_output.json"
+
+    actual_dh.save_to_json(results_list, str(orjson_file))
+    monkeypatch.setattr("google_scholar_scraper.data_handler.orjson", None)
+    actual_dh.save_to_json(results_list, str(fallback_file))
+
+    assert orjson_file.read_bytes() == fallback_file.read_bytes()
+
+
 @pytest.mark.asyncio
 async def test_save_to_json_empty(data_handler, tmp_path):
     """Test saving an empty list to JSON."""
@@ -176,6 +311,23 @@ async def test_save_to_json_empty(data_handler, tmp_path):
     assert not json_file.exists() or json_file.read_text() == ""
 
 
+@pytest.mark.asyncio
+async def test_save_to_parquet(data_handler, tmp_path):
+    """Test saving results to a Parquet file."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    actual_dh = data_handler
+    results_list = [SAMPLE_RESULT_1, SAMPLE_RESULT_2]
+    parquet_file = tmp_path / "test_output.parquet"
+    actual_dh.save_to_parquet(results_list, str(parquet_file))
+
+    assert parquet_file.exists()
+    table = pq.read_table(parquet_file)
+    assert table.column_names == list(RESULT_COLUMNS)
+    assert table.column("title").to_pylist() == [SAMPLE_RESULT_1["title"], SAMPLE_RESULT_2["title"]]
+    assert table.column("authors").to_pylist()[0] == ["Author A", "Author B"]
+    assert json.loads(table.column("publication_info")[1].as_py()) == SAMPLE_RESULT_2["publication_info"]
+
+
 @pytest.mark.asyncio
 async def test_save_to_dataframe(data_handler):
     """Test converting results to a pandas DataFrame."""
@@ -185,7 +337,10 @@ async def test_save_to_dataframe(data_handler):
 
     assert isinstance(df, pd.DataFrame)
     assert len(df) == 2
+    assert list(df.columns) == list(RESULT_COLUMNS)
     assert df.iloc[0]["title"] == SAMPLE_RESULT_1["title"]
+    assert df.iloc[0]["authors"] == "Author A,Author B"
+    assert str(df["cited_by_count"].dtype) == "Int64"
     # Check for a field that might be None
     assert (
         pd.isna(df.iloc[1]["pdf_url"])
@@ -201,3 +356,4 @@ async def test_save_to_dataframe_empty(data_handler):
     df = actual_dh.save_to_dataframe([])
     assert isinstance(df, pd.DataFrame)
     assert df.empty
+    assert list(df.columns) == list(RESULT_COLUMNS)
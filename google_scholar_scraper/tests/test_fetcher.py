@@ -1,49 +1,274 @@
 import asyncio
+import io
 import os
-import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from unittest.mock import ANY, AsyncMock, MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import ANY, AsyncMock, MagicMock, call, create_autospec, patch
 
 import aiohttp  # For ClientProxyConnectionError
 
 # Removed import for aiohttp.connector as ConnectionKey instantiation is problematic
 import pytest
 from aioresponses import aioresponses  # For mocking aiohttp requests
-from google_scholar_scraper.data_handler import DataHandler
+from multidict import CIMultiDict, CIMultiDictProxy
+from parsel import Selector
+from yarl import URL
+import google_scholar_scraper.fetcher as fetcher_module
 from google_scholar_scraper.exceptions import ParsingException  # Though not directly tested in init
-from google_scholar_scraper.fetcher import Fetcher, NoProxiesAvailable
-from google_scholar_scraper.graph_builder import GraphBuilder
+from google_scholar_scraper.fetcher import UNKNOWN_TITLE, Fetcher, NoProxiesAvailable
 from google_scholar_scraper.models import ProxyErrorType  # Imported by Fetcher
 from google_scholar_scraper.proxy_manager import ProxyManager
-from google_scholar_scraper.proxy_manager import ProxyManager as RealProxyManager  # Alias to avoid conflict if used elsewhere
-from google_scholar_scraper.query_builder import QueryBuilder
 
+# Under `pytest -n auto --dist loadgroup` each xdist worker builds its own module-scoped Fetcher; grouping
+# keeps tests that share one on the same worker, while the scrape_pdf_link tests fan out as their own group.
+pytestmark = pytest.mark.xdist_group(name="fetcher")
 
-@pytest.fixture
+# Sample pages used as fixtures, resolved once at import.
+_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+# Request timeouts Fetcher passes to aiohttp: 10s for pages and Unpaywall API calls, 20s for PDFs and
+# paper landing pages. ClientTimeout is frozen, so every assertion shares these two instances.
+_TIMEOUT_10 = aiohttp.ClientTimeout(total=10)
+_TIMEOUT_20 = aiohttp.ClientTimeout(total=20)
+
+
+# Builds the Unpaywall API URL scrape_pdf_link requests for a DOI.
+_unpaywall_url = "https://api.unpaywall.org/v2/{}?email=unpaywall@impactstory.org".format
+
+
+# Landing pages served to scrape_pdf_link, filled in per test with str.format.
+_META_TAG_HTML_TEMPLATE = """
+<html><head><title>Test Paper with Meta Tag</title>
+<meta name='citation_pdf_url' content='{pdf_url}'>
+</head><body>Paper content.</body></html>
+"""
+
+_NATURE_HTML_TEMPLATE = """
+<html><head><title>Nature Article</title></head>
+<body>
+    <p>Some content about the article.</p>
+    <a href="{pdf_path}">Download Full Text PDF</a>
+    <a href="/another/link.html">Another link</a>
+</body></html>
+"""
+
+
+def register_many(m_aioresp, entries):
+    """Registers GET mocks on an aioresponses instance from (url, kwargs) pairs, in order."""
+    for url, kwargs in entries:
+        m_aioresp.get(url, **kwargs)
+
+
+class _FakeResponse:
+    """
+    Minimal stand-in for the aiohttp.ClientResponse context manager returned by ClientSession.get,
+    exposing only what Fetcher reads: status, headers, text(), read(), content.iter_chunked() and
+    raise_for_status().
+    """
+
+    def __init__(self, url, status=200, body=b"", headers=None):
+        self.url = URL(url)
+        self.status = status
+        self.headers = headers or {}
+        self._body = body.encode("utf-8") if isinstance(body, str) else body
+        self.content = SimpleNamespace(iter_chunked=self._iter_chunked)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def _iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+    async def text(self):
+        return self._body.decode("utf-8")
+
+    async def read(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(self.url, "GET", CIMultiDictProxy(CIMultiDict()), self.url)
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status, message=f"HTTP {self.status}")
+
+
+class _StubQueryBuilder:
+    """Plain stand-in for QueryBuilder: build_url records its arguments and always returns the same URL."""
+
+    def __init__(self, url):
+        self.url = url
+        self.calls = []
+
+    def build_url(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.url
+
+
+class _StubDataHandler:
+    """Plain stand-in for DataHandler: no page is cached yet, and every row not in stored_urls is newly inserted."""
+
+    def __init__(self, stored_urls=()):
+        self.stored_urls = set(stored_urls)
+        self.result_exists_calls = 0
+        self.inserted_batches = []
+
+    async def result_exists(self, url):
+        self.result_exists_calls += 1
+        return False
+
+    async def insert_results(self, rows):
+        self.inserted_batches.append(list(rows))
+        return {row.get("article_url") for row in rows} - self.stored_urls
+
+
+class _StubGraphBuilder:
+    """Plain stand-in for GraphBuilder recording add_citation calls; it has no add_node, so calling it would fail."""
+
+    def __init__(self):
+        self.citations = []
+
+    def add_citation(self, *args, **kwargs):
+        self.citations.append((args, kwargs))
+
+
+@contextmanager
+def stub_responses(session, responses):
+    """
+    Replaces session.get with a MagicMock serving canned responses keyed by URL, bypassing aioresponses'
+    matcher table and ClientResponse construction. Each value holds _FakeResponse kwargs
+    (status, body, headers) or an "exception" to raise. Yields the mock so tests can assert on its calls.
+    """
+
+    def _get(url, **kwargs):
+        response_kwargs = responses[url]
+        if "exception" in response_kwargs:
+            raise response_kwargs["exception"]
+        return _FakeResponse(url, **response_kwargs)
+
+    with patch.object(session, "get", side_effect=_get) as mock_get:
+        yield mock_get
+
+
+def _assert_get_call(mock_get, url, proxy, user_agent, timeout, **extra_kwargs):
+    """
+    Asserts the stubbed session.get was called once for url, through proxy with the given User-Agent and timeout.
+    Spot-checks the fields from the recorded call_args instead of building and deep-comparing a full expected call.
+    """
+    assert mock_get.call_count == 1
+    args, kwargs = mock_get.call_args
+    assert args == (url,)
+    assert kwargs["proxy"] == f"http://{proxy}"
+    assert kwargs["headers"]["User-Agent"] == user_agent
+    assert kwargs["timeout"] == timeout
+    for key, value in extra_kwargs.items():
+        assert kwargs[key] == value
+
+
+def _lean_pm():
+    """
+    A minimal proxy manager whose get_proxy raises NoProxiesAvailable, for tests that only need
+    call tracking on a few methods and none of MagicMock(spec=ProxyManager)'s attribute machinery.
+    """
+    return SimpleNamespace(
+        get_proxy=AsyncMock(side_effect=NoProxiesAvailable("No proxies available at the moment.")),
+        mark_proxy_failure=MagicMock(),
+        remove_proxy=MagicMock(),
+    )
+
+
+@pytest.fixture(scope="module")
+def event_loop(event_loop_policy):
+    """One event loop for the whole module, so the shared Fetcher's ClientSession stays bound to a live loop."""
+    loop = event_loop_policy.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
 def mock_proxy_manager():
-    """Provides a MagicMock for ProxyManager."""
-    pm = MagicMock(spec=ProxyManager)
-    pm.get_random_proxy = AsyncMock(return_value="1.2.3.4:8080")  # Default mock value
-    pm.get_working_proxies = AsyncMock(return_value=["1.2.3.4:8080"])
-    pm.mark_proxy_success = MagicMock()
-    pm.mark_proxy_failure = MagicMock()
-    pm.remove_proxy = MagicMock()
-    pm.refresh_proxies = AsyncMock()
-    return pm
+    """
+    Provides an autospecced ProxyManager, shared by the module; fetcher_setup resets it per test.
+    spec_set makes stubbing or asserting a method ProxyManager does not have fail immediately.
+    """
+    return create_autospec(ProxyManager, instance=True, spec_set=True)
+
+
+@pytest.fixture(autouse=True)
+def mock_get_ua(monkeypatch):
+    """
+    Replaces the fetcher module's user-agent generator with a MagicMock for every test.
+    Tests set ``mock_get_ua.return_value`` to pin the User-Agent header they expect.
+    """
+    mock = MagicMock(return_value="Test User Agent 1.0")
+    monkeypatch.setattr("google_scholar_scraper.fetcher.get_random_user_agent", mock)
+    return mock
 
 
 @pytest.fixture
-async def fetcher_setup(mock_proxy_manager):
+def written_files(monkeypatch):
+    """
+    Redirects open() inside the fetcher module to in-memory buffers, so PDF downloads never touch disk.
+    Returns a dict mapping each path written to the bytes written to it.
+    """
+    written = {}
+
+    class _InMemoryFile(io.BytesIO):
+        def __init__(self, path):
+            super().__init__()
+            self.path = path
+
+        def close(self):
+            written[self.path] = self.getvalue()
+            super().close()
+
+    def fake_open(path, mode="r", *args, **kwargs):
+        return _InMemoryFile(path)
+
+    # Shadows the builtin for name lookups made from within google_scholar_scraper.fetcher only
+    monkeypatch.setattr("google_scholar_scraper.fetcher.open", fake_open, raising=False)
+    return written
+
+
+@pytest.fixture(scope="module")
+async def shared_fetcher(mock_proxy_manager):
     """
-    Provides a Fetcher instance initialized with a mock ProxyManager,
-    and the mock ProxyManager itself.
-    Fetcher's internal client session is also initialized.
+    A single Fetcher (and aiohttp ClientSession) reused by every test in the module,
+    closed once when the module finishes.
     """
     # Initialize Fetcher with the mock ProxyManager and no delay for tests
     fetcher_instance = Fetcher(proxy_manager=mock_proxy_manager, min_delay=0, max_delay=0, max_retries=1)
     await fetcher_instance._create_client()  # Ensure the client session is created
+    yield fetcher_instance
+    await fetcher_instance.close()
 
-    return fetcher_instance, mock_proxy_manager  # Return tuple
+
+@pytest.fixture
+async def fetcher_setup(shared_fetcher, mock_proxy_manager):
+    """
+    Provides the shared Fetcher and its mock ProxyManager, reset to a clean state:
+    fresh statistics, max_retries=1, an open client session, and a proxy manager
+    mock with no recorded calls and default return values.
+    """
+    mock_proxy_manager.reset_mock(return_value=True, side_effect=True)
+    mock_proxy_manager.get_proxy.return_value = "1.2.3.4:8080"  # Default mock value
+    mock_proxy_manager.get_working_proxies.return_value = ["1.2.3.4:8080"]
+
+    shared_fetcher.max_retries = 1
+    shared_fetcher.successful_requests = 0
+    shared_fetcher.failed_requests = 0
+    shared_fetcher.proxies_removed = 0
+    shared_fetcher.pdfs_downloaded = 0
+    shared_fetcher.proxies_used.clear()
+    shared_fetcher.request_times.clear()
+    shared_fetcher._cited_title_cache.clear()
+    shared_fetcher._fetched_cited_by_urls.clear()
+    await shared_fetcher._create_client()  # Reopens the session if a test closed it
+
+    return shared_fetcher, mock_proxy_manager  # Return tuple
 
 
 @pytest.mark.asyncio
@@ -58,7 +283,7 @@ async def test_fetcher_initialization(fetcher_setup):
     assert fetcher.client is not None
     assert not fetcher.client.closed, "Client session should be open after _create_client"
 
-    # Test responsible for closing the session for this test
+    # close() itself is under test here; fetcher_setup reopens the session for the next test
     await fetcher.close()
     assert fetcher.client.closed, "Client session should be closed after fetcher.close()"
 
@@ -68,197 +293,121 @@ async def test_fetcher_initialization(fetcher_setup):
 
 
 @pytest.mark.asyncio
-async def test_fetch_page_success(fetcher_setup):
+async def test_fetch_page_success(fetcher_setup, mock_get_ua):
     """Test fetch_page successfully fetches content."""
     fetcher, m_proxy_manager = fetcher_setup
     test_url = "http://example.com/testpage"
     expected_content = "<html><body><h1>Success</h1></body></html>"
     proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
     fixed_user_agent = "Test User Agent 1.0"
+    mock_get_ua.return_value = fixed_user_agent
 
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(test_url, body=expected_content, status=200)
+    with stub_responses(fetcher.client, {test_url: {"body": expected_content, "status": 200}}) as mock_get:
 
         html_content = await fetcher.fetch_page(test_url)
 
         assert html_content == expected_content
         mock_get_ua.assert_called_once()  # Ensure our mock UA generator was called
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}
-        expected_timeout = aiohttp.ClientTimeout(total=10)
-
-        m_aioresp.assert_called_once_with(
-            test_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
+        m_proxy_manager.get_proxy.assert_called_once()
+
+        _assert_get_call(mock_get, test_url, proxy_to_use, fixed_user_agent, _TIMEOUT_10, ssl=False)
         m_proxy_manager.mark_proxy_success.assert_called_once_with(proxy_to_use)
         assert fetcher.successful_requests == 1
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
-async def test_download_pdf_success(fetcher_setup, tmp_path):
+async def test_download_pdf_success(fetcher_setup, written_files, mock_get_ua):
     """Test download_pdf successfully downloads a PDF."""
     fetcher, m_proxy_manager = fetcher_setup
 
     pdf_url = "http://example.com/document.pdf"
-    pdf_filename = tmp_path / "downloaded.pdf"
+    pdf_filename = "downloaded.pdf"
     pdf_content = b"%PDF-1.4 sample pdf content"
     proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
     fixed_user_agent = "Test PDF Downloader UA 1.0"
+    mock_get_ua.return_value = fixed_user_agent
 
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(pdf_url, body=pdf_content, status=200, headers={"Content-Type": "application/pdf"})
+    with stub_responses(
+        fetcher.client, {pdf_url: {"body": pdf_content, "status": 200, "headers": {"Content-Type": "application/pdf"}}}
+    ) as mock_get:
 
         initial_pdf_downloads = fetcher.pdfs_downloaded
-        result = await fetcher.download_pdf(pdf_url, str(pdf_filename))
+        result = await fetcher.download_pdf(pdf_url, pdf_filename)
 
         assert result is True
-        assert pdf_filename.exists()
-        assert pdf_filename.read_bytes() == pdf_content
+        assert written_files[pdf_filename] == pdf_content
 
         mock_get_ua.assert_called_once()  # download_pdf calls get_random_user_agent
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}
-        expected_timeout = aiohttp.ClientTimeout(total=20)
-
-        m_aioresp.assert_called_once_with(
-            pdf_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
+        m_proxy_manager.get_proxy.assert_called_once()
+
+        _assert_get_call(mock_get, pdf_url, proxy_to_use, fixed_user_agent, _TIMEOUT_20)
         m_proxy_manager.mark_proxy_success.assert_called_once_with(proxy_to_use)
         assert fetcher.pdfs_downloaded == initial_pdf_downloads + 1
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
-async def test_fetch_page_http_error_404(fetcher_setup):
-    """Test fetch_page handles HTTP 404 error."""
+@pytest.mark.parametrize(
+    "response_kwargs, expected_error_type",
+    [
+        pytest.param({"status": 404}, ProxyErrorType.OTHER, id="http_404"),
+        pytest.param({"status": 500}, ProxyErrorType.OTHER, id="http_500"),
+        pytest.param(
+            {"exception": asyncio.TimeoutError("Simulated network timeout")}, ProxyErrorType.TIMEOUT, id="timeout"
+        ),
+        # A generic ClientConnectionError stands in for ClientProxyConnectionError, which is hard to instantiate
+        pytest.param(
+            {"exception": aiohttp.ClientConnectionError("Simulated proxy connection error")},
+            ProxyErrorType.OTHER,
+            id="connection_error",
+        ),
+    ],
+)
+async def test_fetch_page_request_failure(fetcher_setup, mock_get_ua, response_kwargs, expected_error_type):
+    """Test fetch_page handles HTTP errors, timeouts and connection errors by marking and removing the proxy."""
     fetcher, m_proxy_manager = fetcher_setup
-    test_url = "http://example.com/notfoundpage"
+    test_url = "http://example.com/failingpage"
     proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
-    fixed_user_agent = "Test User Agent 404"
+    fixed_user_agent = "Test User Agent Failure"
+    mock_get_ua.return_value = fixed_user_agent
 
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(test_url, status=404)  # Mock a 404 response
+    with stub_responses(fetcher.client, {test_url: response_kwargs}) as mock_get:
 
-        initial_failed_requests = fetcher.failed_requests
         html_content = await fetcher.fetch_page(test_url)
 
         assert html_content is None
         mock_get_ua.assert_called_once()
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}
-        expected_timeout = aiohttp.ClientTimeout(total=10)
-
-        m_aioresp.assert_called_once_with(
-            test_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
-        # Since max_retries is 1 in fixture, one failure leads to removal
-        m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, ProxyErrorType.OTHER)
-        m_proxy_manager.remove_proxy.assert_called_once_with(proxy_to_use)
-        assert fetcher.failed_requests == initial_failed_requests + 1
-        assert fetcher.proxies_removed == 1  # Assuming this is the first proxy removed in this fetcher instance's life
-
-    await fetcher.close()
-
+        m_proxy_manager.get_proxy.assert_called_once()
 
-@pytest.mark.asyncio
-async def test_fetch_page_http_error_500(fetcher_setup):
-    """Test fetch_page handles HTTP 500 server error."""
-    fetcher, m_proxy_manager = fetcher_setup
-    test_url = "http://example.com/servererrorpage"
-    proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
-
-    fixed_user_agent = "Test User Agent 500"
-
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(test_url, status=500)  # Mock a 500 response
-
-        initial_failed_requests = fetcher.failed_requests
-        initial_proxies_removed = fetcher.proxies_removed
-
-        html_content = await fetcher.fetch_page(test_url)
-
-        assert html_content is None
-        mock_get_ua.assert_called_once()
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}
-        expected_timeout = aiohttp.ClientTimeout(total=10)
-
-        m_aioresp.assert_called_once_with(
-            test_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
-        m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, ProxyErrorType.OTHER)
+        _assert_get_call(mock_get, test_url, proxy_to_use, fixed_user_agent, _TIMEOUT_10, ssl=False)
+        # Since max_retries is 1 in fixture, one failure leads to removal
+        m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, expected_error_type)
         m_proxy_manager.remove_proxy.assert_called_once_with(proxy_to_use)
-        assert fetcher.failed_requests == initial_failed_requests + 1
-        assert fetcher.proxies_removed == initial_proxies_removed + 1
-
-    await fetcher.close()
+        assert fetcher.failed_requests == 1
+        assert fetcher.proxies_removed == 1
 
 
 @pytest.mark.asyncio
-@patch("google_scholar_scraper.fetcher.detect_captcha")  # Patch detect_captcha in the fetcher module
-async def test_fetch_page_captcha_detected(mock_detect_captcha, fetcher_setup):
+async def test_fetch_page_captcha_detected(fetcher_setup, mock_get_ua, monkeypatch):
     """Test fetch_page handles CAPTCHA detection."""
     fetcher, m_proxy_manager = fetcher_setup
+    mock_detect_captcha = MagicMock(return_value=True)  # Simulate CAPTCHA detection
+    monkeypatch.setattr(fetcher_module, "detect_captcha", mock_detect_captcha)
     test_url = "http://example.com/captcha_page"
     proxy_to_use = "1.2.3.4:8080"
     dummy_html_content = "<html><body>CAPTCHA!</body></html>"
 
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
-    mock_detect_captcha.return_value = True  # Simulate CAPTCHA detection
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
     fixed_user_agent = "Test User Agent CAPTCHA"
+    mock_get_ua.return_value = fixed_user_agent
 
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(test_url, body=dummy_html_content, status=200)
+    with stub_responses(fetcher.client, {test_url: {"body": dummy_html_content, "status": 200}}) as mock_get:
 
         initial_failed_requests = fetcher.failed_requests
         initial_proxies_removed = fetcher.proxies_removed
@@ -266,99 +415,27 @@ async def test_fetch_page_captcha_detected(mock_detect_captcha, fetcher_setup):
         html_content = await fetcher.fetch_page(test_url)
 
         assert html_content is None
-        mock_get_ua.assert_called_once()  # From the patch in the with statement
+        mock_get_ua.assert_called_once()
         mock_detect_captcha.assert_called_once_with(dummy_html_content)
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}  # fixed_user_agent defined in the first part of the diff
-        expected_timeout = aiohttp.ClientTimeout(total=10)
-
-        m_aioresp.assert_called_once_with(
-            test_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
+        m_proxy_manager.get_proxy.assert_called_once()
+
+        _assert_get_call(mock_get, test_url, proxy_to_use, fixed_user_agent, _TIMEOUT_10, ssl=False)
         m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, ProxyErrorType.CAPTCHA)
         m_proxy_manager.remove_proxy.assert_called_once_with(proxy_to_use)
         m_proxy_manager.refresh_proxies.assert_called_once()  # Should attempt to refresh
         assert fetcher.failed_requests == initial_failed_requests + 1
         assert fetcher.proxies_removed == initial_proxies_removed + 1
 
-    await fetcher.close()
-
-
-@pytest.mark.asyncio
-async def test_fetch_page_timeout_error(fetcher_setup):
-    """Test fetch_page handles asyncio.TimeoutError."""
-    fetcher, m_proxy_manager = fetcher_setup
-    test_url = "http://example.com/timeoutpage"
-    proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
-
-    initial_failed_requests = fetcher.failed_requests
-    initial_proxies_removed = fetcher.proxies_removed
-
-    # Use aioresponses to simulate a TimeoutError
-    with aioresponses() as m_aioresp:
-        m_aioresp.get(test_url, exception=asyncio.TimeoutError("Simulated network timeout"))
-        html_content = await fetcher.fetch_page(test_url)
-
-    assert html_content is None
-    m_proxy_manager.get_random_proxy.assert_called_once()
-    # m_aioresp.assert_called_once_with(test_url, method="GET", proxy=f"http://{proxy_to_use}", headers=ANY, timeout=10, allow_redirects=True)
-    # For timeout, the call might not fully complete to be asserted with all args by aioresponses;
-    # the key is that the TimeoutError is caught and handled by Fetcher.
-
-    # Since max_retries is 1 in fixture, one failure leads to removal
-    m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, ProxyErrorType.TIMEOUT)
-    m_proxy_manager.remove_proxy.assert_called_once_with(proxy_to_use)
-    assert fetcher.failed_requests == initial_failed_requests + 1
-    assert fetcher.proxies_removed == initial_proxies_removed + 1
-
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
-async def test_fetch_page_proxy_connection_error(fetcher_setup):
-    """Test fetch_page handles aiohttp.ClientProxyConnectionError."""
-    fetcher, m_proxy_manager = fetcher_setup
-    test_url = "http://example.com/proxyconnerror"
-    proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
-
-    initial_failed_requests = fetcher.failed_requests
-    initial_proxies_removed = fetcher.proxies_removed
-
-    # Simulate a generic ClientConnectionError as ClientProxyConnectionError is hard to instantiate
-    conn_error = aiohttp.ClientConnectionError("Simulated proxy connection error")
-
-    with aioresponses() as m_aioresp:
-        m_aioresp.get(test_url, exception=conn_error)
-        html_content = await fetcher.fetch_page(test_url)
-
-    assert html_content is None
-    m_proxy_manager.get_random_proxy.assert_called_once()
-
-    # Since max_retries is 1 in fixture, one failure leads to removal
-    m_proxy_manager.mark_proxy_failure.assert_called_once_with(proxy_to_use, ProxyErrorType.OTHER)
-    m_proxy_manager.remove_proxy.assert_called_once_with(proxy_to_use)
-    assert fetcher.failed_requests == initial_failed_requests + 1
-    assert fetcher.proxies_removed == initial_proxies_removed + 1
-
-    await fetcher.close()
-
-
-@pytest.mark.asyncio
-async def test_fetch_page_no_proxy_available_initially(fetcher_setup):
-    """Test fetch_page when ProxyManager.get_random_proxy raises NoProxiesAvailable."""
-    fetcher, m_proxy_manager = fetcher_setup
+async def test_fetch_page_no_proxy_available_initially(fetcher_setup, monkeypatch):
+    """Test fetch_page when ProxyManager.get_proxy raises NoProxiesAvailable."""
+    fetcher, _ = fetcher_setup
     test_url = "http://example.com/somepage"
 
-    # Configure get_random_proxy to raise NoProxiesAvailable
-    m_proxy_manager.get_random_proxy.side_effect = NoProxiesAvailable("No proxies available at the moment.")
+    # Swap in a plain namespace whose get_proxy raises NoProxiesAvailable
+    lean_pm = _lean_pm()
+    monkeypatch.setattr(fetcher, "proxy_manager", lean_pm)
 
     initial_failed_requests = fetcher.failed_requests  # Should not change
     initial_proxies_removed = fetcher.proxies_removed  # Should not change
@@ -366,17 +443,15 @@ async def test_fetch_page_no_proxy_available_initially(fetcher_setup):
     with pytest.raises(NoProxiesAvailable, match="No proxies available at the moment."):
         await fetcher.fetch_page(test_url)
     # html_content will not be assigned if exception is raised as expected
-    m_proxy_manager.get_random_proxy.assert_called_once()
+    lean_pm.get_proxy.assert_called_once()
 
     # Ensure no further proxy actions like mark_failure or remove_proxy were called
-    m_proxy_manager.mark_proxy_failure.assert_not_called()
-    m_proxy_manager.remove_proxy.assert_not_called()
+    lean_pm.mark_proxy_failure.assert_not_called()
+    lean_pm.remove_proxy.assert_not_called()
 
     assert fetcher.failed_requests == initial_failed_requests  # As NoProxiesAvailable is caught separately
     assert fetcher.proxies_removed == initial_proxies_removed
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
 async def test_fetch_page_succeeds_on_retry(fetcher_setup):
@@ -389,13 +464,18 @@ async def test_fetch_page_succeeds_on_retry(fetcher_setup):
     test_url = "http://example.com/retrypage"
     expected_content = "<html><body>Retry Success!</body></html>"
     proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
     with aioresponses() as m_aioresp:
-        # First call: 500 error
-        m_aioresp.get(test_url, status=500)
-        # Second call: 200 success
-        m_aioresp.get(test_url, body=expected_content, status=200)
+        # First call: 500 error, then 200 success. repeat=False drops each match once used,
+        # so the second request doesn't rescan the spent 500 entry.
+        register_many(
+            m_aioresp,
+            [
+                (test_url, {"status": 500, "repeat": False}),
+                (test_url, {"body": expected_content, "status": 200, "repeat": False}),
+            ],
+        )
 
         initial_failed_requests = fetcher.failed_requests
         initial_successful_requests = fetcher.successful_requests
@@ -404,8 +484,8 @@ async def test_fetch_page_succeeds_on_retry(fetcher_setup):
 
         assert html_content == expected_content
 
-        # get_random_proxy is called once per fetch_page, not per attempt
-        m_proxy_manager.get_random_proxy.assert_called_once()
+        # get_proxy is called once per fetch_page, not per attempt
+        m_proxy_manager.get_proxy.assert_called_once()
 
         # Check calls to aioresponses
         # It should have been called twice for the same URL
@@ -423,69 +503,49 @@ async def test_fetch_page_succeeds_on_retry(fetcher_setup):
         assert fetcher.failed_requests == initial_failed_requests + 1
         assert fetcher.successful_requests == initial_successful_requests + 1
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
-async def test_download_pdf_non_pdf_content_type(fetcher_setup, tmp_path):
+async def test_download_pdf_non_pdf_content_type(fetcher_setup, written_files, mock_get_ua):
     """Test download_pdf when the server returns a non-PDF content type."""
     fetcher, m_proxy_manager = fetcher_setup
 
     test_url = "http://example.com/not_a_pdf.html"
-    output_filename = tmp_path / "not_downloaded.html"
+    output_filename = "not_downloaded.html"
     non_pdf_content = b"<html><body>This is HTML, not a PDF.</body></html>"
     proxy_to_use = "1.2.3.4:8080"
-    m_proxy_manager.get_random_proxy.return_value = proxy_to_use
+    m_proxy_manager.get_proxy.return_value = proxy_to_use
 
     fixed_user_agent = "Test User Agent Non-PDF"
+    mock_get_ua.return_value = fixed_user_agent
 
-    with (
-        aioresponses() as m_aioresp,
-        patch("google_scholar_scraper.fetcher.get_random_user_agent", return_value=fixed_user_agent) as mock_get_ua,
-    ):
-        m_aioresp.get(
-            test_url,
-            body=non_pdf_content,
-            status=200,
-            headers={"Content-Type": "text/html"},  # Crucial: not application/pdf
-        )
+    with stub_responses(
+        fetcher.client,
+        {test_url: {"body": non_pdf_content, "status": 200, "headers": {"Content-Type": "text/html"}}},  # Crucial: not application/pdf
+    ) as mock_get:
 
         initial_pdf_downloads = fetcher.pdfs_downloaded
-        result = await fetcher.download_pdf(test_url, str(output_filename))
+        result = await fetcher.download_pdf(test_url, output_filename)
 
         assert result is False, "download_pdf should return False for non-PDF content"
-        assert not output_filename.exists(), "File should not be created for non-PDF content"
+        assert output_filename not in written_files, "File should not be created for non-PDF content"
 
         mock_get_ua.assert_called_once()
-        m_proxy_manager.get_random_proxy.assert_called_once()
-
-        expected_headers = {"User-Agent": fixed_user_agent}
-        expected_timeout = aiohttp.ClientTimeout(total=20)  # download_pdf uses timeout of 20
-
-        m_aioresp.assert_called_once_with(
-            test_url,
-            method="GET",
-            proxy=f"http://{proxy_to_use}",
-            headers=expected_headers,
-            timeout=expected_timeout,
-            allow_redirects=True,
-        )
+        m_proxy_manager.get_proxy.assert_called_once()
+
+        _assert_get_call(mock_get, test_url, proxy_to_use, fixed_user_agent, _TIMEOUT_20)
         # mark_proxy_success should NOT be called if it's not a PDF
         m_proxy_manager.mark_proxy_success.assert_not_called()
         assert fetcher.pdfs_downloaded == initial_pdf_downloads, "PDF download count should not increment"
 
-    await fetcher.close()
-
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def scholar_search_page_html():
-    """Loads content from the sample Google Scholar search results HTML file."""
-    file_path = Path(__file__).parent / "data" / "algorithmic trading strategies cryptocurrency - Google Scholar.html"
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    """Loads content from the sample Google Scholar search results HTML file (read once per test run)."""
+    return (_DATA_DIR / "algorithmic trading strategies cryptocurrency - Google Scholar.html").read_text(encoding="utf-8")
 
 
 @pytest.mark.asyncio
+@pytest.mark.xdist_group(name="scrape_pdf_link")
 async def test_scrape_pdf_link_from_scholar_page_generic_pattern(fetcher_setup, scholar_search_page_html):
     """
     Test scrape_pdf_link using a real (but local) Google Scholar search results page
@@ -501,30 +561,30 @@ async def test_scrape_pdf_link_from_scholar_page_generic_pattern(fetcher_setup,
 
     with aioresponses() as m_aioresp:
         # 1. Mock Unpaywall API call
-        unpaywall_api_url_pattern = f"https://api.unpaywall.org/v2/{test_doi}?email=unpaywall@impactstory.org"
-        m_aioresp.get(
-            unpaywall_api_url_pattern,
-            payload={"doi_url": mock_unpaywall_paper_url, "is_oa": True},  # is_oa doesn't matter much here
-            status=200,
+        unpaywall_api_url_pattern = _unpaywall_url(test_doi)
+        register_many(
+            m_aioresp,
+            [
+                # is_oa doesn't matter much here
+                (unpaywall_api_url_pattern, {"payload": {"doi_url": mock_unpaywall_paper_url, "is_oa": True}, "status": 200}),
+                # 2. Mock Paper Landing Page call (serving the local HTML content)
+                (mock_unpaywall_paper_url, {"body": scholar_search_page_html, "status": 200}),
+            ],
         )
 
-        # 2. Mock Paper Landing Page call (serving the local HTML content)
-        m_aioresp.get(mock_unpaywall_paper_url, body=scholar_search_page_html, status=200)
-
         found_pdf_link = await fetcher.scrape_pdf_link(test_doi)
 
         assert found_pdf_link == expected_pdf_url
 
         # Verify calls
-        m_aioresp.assert_called_with(unpaywall_api_url_pattern, method="GET", timeout=aiohttp.ClientTimeout(total=10))
+        m_aioresp.assert_called_with(unpaywall_api_url_pattern, method="GET", timeout=_TIMEOUT_10)
         # For the second call, we need to be careful with headers as scrape_pdf_link uses specific ones
-        m_aioresp.assert_called_with(mock_unpaywall_paper_url, method="GET", headers=ANY, timeout=aiohttp.ClientTimeout(total=20))
+        m_aioresp.assert_called_with(mock_unpaywall_paper_url, method="GET", headers=ANY, timeout=_TIMEOUT_20)
         # Proxy manager is not directly used by scrape_pdf_link's internal fetches, they use fetcher.client directly
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
+@pytest.mark.xdist_group(name="scrape_pdf_link")
 async def test_scrape_pdf_link_found_via_meta_tag(fetcher_setup):
     """Test scrape_pdf_link finds a PDF link from a 'citation_pdf_url' meta tag."""
     fetcher, m_proxy_manager = fetcher_setup
@@ -533,40 +593,35 @@ async def test_scrape_pdf_link_found_via_meta_tag(fetcher_setup):
     mock_unpaywall_paper_url = "http://example.com/paper_with_meta_tag"
     expected_pdf_url = "http://example.com/actual_paper.pdf"
 
-    meta_tag_html = f"""
-    <html><head><title>Test Paper with Meta Tag</title>
-    <meta name='citation_pdf_url' content='{expected_pdf_url}'>
-    </head><body>Paper content.</body></html>
-    """
+    meta_tag_html = _META_TAG_HTML_TEMPLATE.format(pdf_url=expected_pdf_url)
 
     with aioresponses() as m_aioresp:
         # 1. Mock Unpaywall API call
-        unpaywall_api_url_pattern = f"https://api.unpaywall.org/v2/{test_doi}?email=unpaywall@impactstory.org"
-        m_aioresp.get(
-            unpaywall_api_url_pattern,
-            payload={"doi_url": mock_unpaywall_paper_url, "is_oa": True},
-            status=200,
+        unpaywall_api_url_pattern = _unpaywall_url(test_doi)
+        register_many(
+            m_aioresp,
+            [
+                (unpaywall_api_url_pattern, {"payload": {"doi_url": mock_unpaywall_paper_url, "is_oa": True}, "status": 200}),
+                # 2. Mock Paper Landing Page call (serving HTML with the meta tag)
+                (mock_unpaywall_paper_url, {"body": meta_tag_html, "status": 200}),
+            ],
         )
 
-        # 2. Mock Paper Landing Page call (serving HTML with the meta tag)
-        m_aioresp.get(mock_unpaywall_paper_url, body=meta_tag_html, status=200)
-
         found_pdf_link = await fetcher.scrape_pdf_link(test_doi)
 
         assert found_pdf_link == expected_pdf_url
 
         # Verify calls
-        m_aioresp.assert_any_call(unpaywall_api_url_pattern, method="GET", timeout=aiohttp.ClientTimeout(total=10))
-        m_aioresp.assert_any_call(mock_unpaywall_paper_url, method="GET", headers=ANY, timeout=aiohttp.ClientTimeout(total=20))
+        m_aioresp.assert_any_call(unpaywall_api_url_pattern, method="GET", timeout=_TIMEOUT_10)
+        m_aioresp.assert_any_call(mock_unpaywall_paper_url, method="GET", headers=ANY, timeout=_TIMEOUT_20)
         # Using assert_any_call because the order of calls to aioresponses might not be strictly guaranteed
         # if other mocks were added for the same URL, though here it should be fine.
         # More robustly, check call_count for each if needed.
         # For this test, ensuring both were called as expected is key.
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
+@pytest.mark.xdist_group(name="scrape_pdf_link")
 async def test_scrape_pdf_link_nature_site_specific(fetcher_setup):
     """Test scrape_pdf_link finds a PDF using nature.com specific logic."""
     fetcher, m_proxy_manager = fetcher_setup
@@ -584,39 +639,31 @@ async def test_scrape_pdf_link_nature_site_specific(fetcher_setup):
 
     expected_pdf_url = f"https://www.nature.com{relative_pdf_path}"  # Resolved URL
 
-    nature_page_html = f"""
-    <html><head><title>Nature Article</title></head>
-    <body>
-        <p>Some content about the article.</p>
-        <a href="{relative_pdf_path}">Download Full Text PDF</a>
-        <a href="/another/link.html">Another link</a>
-    </body></html>
-    """
+    nature_page_html = _NATURE_HTML_TEMPLATE.format(pdf_path=relative_pdf_path)
 
     with aioresponses() as m_aioresp:
         # 1. Mock Unpaywall API call
-        unpaywall_api_url_pattern = f"https://api.unpaywall.org/v2/{test_doi}?email=unpaywall@impactstory.org"
-        m_aioresp.get(
-            unpaywall_api_url_pattern,
-            payload={"doi_url": mock_nature_paper_url, "is_oa": True},
-            status=200,
+        unpaywall_api_url_pattern = _unpaywall_url(test_doi)
+        register_many(
+            m_aioresp,
+            [
+                (unpaywall_api_url_pattern, {"payload": {"doi_url": mock_nature_paper_url, "is_oa": True}, "status": 200}),
+                # 2. Mock Nature Paper Landing Page call
+                (mock_nature_paper_url, {"body": nature_page_html, "status": 200}),
+            ],
         )
 
-        # 2. Mock Nature Paper Landing Page call
-        m_aioresp.get(mock_nature_paper_url, body=nature_page_html, status=200)
-
         found_pdf_link = await fetcher.scrape_pdf_link(test_doi)
 
         assert found_pdf_link == expected_pdf_url
 
         # Verify calls
-        m_aioresp.assert_any_call(unpaywall_api_url_pattern, method="GET", timeout=aiohttp.ClientTimeout(total=10))
-        m_aioresp.assert_any_call(mock_nature_paper_url, method="GET", headers=ANY, timeout=aiohttp.ClientTimeout(total=20))
-
-    await fetcher.close()
+        m_aioresp.assert_any_call(unpaywall_api_url_pattern, method="GET", timeout=_TIMEOUT_10)
+        m_aioresp.assert_any_call(mock_nature_paper_url, method="GET", headers=ANY, timeout=_TIMEOUT_20)
 
 
 @pytest.mark.asyncio
+@pytest.mark.xdist_group(name="scrape_pdf_link")
 async def test_scrape_pdf_link_unpaywall_404(fetcher_setup):
     """Test scrape_pdf_link when Unpaywall API returns a 404 error."""
     fetcher, m_proxy_manager = fetcher_setup
@@ -625,7 +672,7 @@ async def test_scrape_pdf_link_unpaywall_404(fetcher_setup):
 
     with aioresponses() as m_aioresp:
         # Mock Unpaywall API call to return 404
-        unpaywall_api_url_pattern = f"https://api.unpaywall.org/v2/{test_doi}?email=unpaywall@impactstory.org"
+        unpaywall_api_url_pattern = _unpaywall_url(test_doi)
         m_aioresp.get(unpaywall_api_url_pattern, status=404)
 
         found_pdf_link = await fetcher.scrape_pdf_link(test_doi)
@@ -633,13 +680,12 @@ async def test_scrape_pdf_link_unpaywall_404(fetcher_setup):
         assert found_pdf_link is None, "Should return None if Unpaywall call fails with 404"
 
         # Verify Unpaywall call was made
-        m_aioresp.assert_called_once_with(unpaywall_api_url_pattern, method="GET", timeout=aiohttp.ClientTimeout(total=10))
+        m_aioresp.assert_called_once_with(unpaywall_api_url_pattern, method="GET", timeout=_TIMEOUT_10)
         # No other calls should be made to paper landing pages
 
-    await fetcher.close()
-
 
 @pytest.mark.asyncio
+@pytest.mark.xdist_group(name="scrape_pdf_link")
 async def test_scrape_pdf_link_unpaywall_no_doi_url(fetcher_setup):
     """Test scrape_pdf_link when Unpaywall returns 200 but no doi_url."""
     fetcher, m_proxy_manager = fetcher_setup
@@ -648,7 +694,7 @@ async def test_scrape_pdf_link_unpaywall_no_doi_url(fetcher_setup):
 
     with aioresponses() as m_aioresp:
         # Mock Unpaywall API call to return 200 but no 'doi_url'
-        unpaywall_api_url_pattern = f"https://api.unpaywall.org/v2/{test_doi}?email=unpaywall@impactstory.org"
+        unpaywall_api_url_pattern = _unpaywall_url(test_doi)
         m_aioresp.get(
             unpaywall_api_url_pattern,
             payload={"title": "A Paper Without A DOI URL", "is_oa": False},  # No doi_url
@@ -660,165 +706,270 @@ async def test_scrape_pdf_link_unpaywall_no_doi_url(fetcher_setup):
         assert found_pdf_link is None, "Should return None if Unpaywall response lacks doi_url"
 
         # Verify Unpaywall call was made
-        m_aioresp.assert_called_once_with(unpaywall_api_url_pattern, method="GET", timeout=aiohttp.ClientTimeout(total=10))
+        m_aioresp.assert_called_once_with(unpaywall_api_url_pattern, method="GET", timeout=_TIMEOUT_10)
         # No other calls should be made to paper landing pages as paper_url would be None
 
-    await fetcher.close()
+
+@pytest.fixture(scope="module")
+def cited_title_mocks():
+    """The fetch_page AsyncMock and stub parser used by parser_stub, built once for the module and reset per test."""
+    return SimpleNamespace(fetch_page=AsyncMock(), parser=SimpleNamespace(extract_title=MagicMock()))
+
+
+@pytest.fixture
+def parser_stub(fetcher_setup, cited_title_mocks, monkeypatch):
+    """
+    The shared fetcher with fetch_page replaced by an AsyncMock and its parser by a stub exposing only
+    an extract_title MagicMock (both returning None until a test sets them); restored after each test.
+    """
+    fetcher, _ = fetcher_setup
+    for mock in (cited_title_mocks.fetch_page, cited_title_mocks.parser.extract_title):
+        mock.reset_mock(return_value=True, side_effect=True)
+        mock.return_value = None
+    monkeypatch.setattr(fetcher, "fetch_page", cited_title_mocks.fetch_page)
+    monkeypatch.setattr(fetcher, "parser", cited_title_mocks.parser)
+    return fetcher
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_success(fetcher_setup):
+async def test_extract_cited_title_success(parser_stub):
     """Test extract_cited_title successfully extracts a title."""
-    fetcher, m_proxy_manager = fetcher_setup
+    fetcher = parser_stub
 
     test_cited_by_url = "http://example.com/cited_by_page"
     expected_title = "This is the Expected Cited Title"
     dummy_html_content = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
 
-    # Mock fetcher.fetch_page
-    # We use patch.object to mock the method on the specific instance
-    with patch.object(fetcher, "fetch_page", new_callable=AsyncMock) as mock_fetch_page:
-        mock_fetch_page.return_value = dummy_html_content
-
-        # Mock fetcher.parser.extract_title
-        # fetcher.parser is an instance of Parser, so we mock its method
-        with patch.object(fetcher.parser, "extract_title", MagicMock(return_value=expected_title)) as mock_extract_title:
-            title = await fetcher.extract_cited_title(test_cited_by_url)
-
-            assert title == expected_title
-            mock_fetch_page.assert_called_once_with(test_cited_by_url)
-            # extract_title is called with a parsel.SelectorList object
-            mock_extract_title.assert_called_once()
-            # We can be more specific about the argument if needed, e.g. by checking its type or content
-            # For now, just checking it was called is a good start.
-            # Example of more specific check (would require importing SelectorList):
-            # from parsel import SelectorList
-            # assert isinstance(mock_extract_title.call_args[0][0], SelectorList)
+    fetcher.fetch_page.return_value = dummy_html_content
+    fetcher.parser.extract_title.return_value = expected_title
 
-    await fetcher.close()
+    title = await fetcher.extract_cited_title(test_cited_by_url)
+
+    assert title == expected_title
+    fetcher.fetch_page.assert_called_once_with(test_cited_by_url)
+    # extract_title is called with the first result heading as a single parsel Selector, not a SelectorList
+    fetcher.parser.extract_title.assert_called_once()
+    (heading,), _ = fetcher.parser.extract_title.call_args
+    assert isinstance(heading, Selector)
+    assert heading.css("a::text").get() == "Mock Title"
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_no_url(fetcher_setup):
+async def test_extract_cited_title_no_url(parser_stub):
     """Test extract_cited_title returns None if no URL is provided."""
-    fetcher, _ = fetcher_setup  # m_proxy_manager not needed
+    fetcher = parser_stub
 
-    # Patch methods that should not be called
-    with (
-        patch.object(fetcher, "fetch_page", new_callable=AsyncMock) as mock_fetch_page,
-        patch.object(fetcher.parser, "extract_title", new_callable=MagicMock) as mock_extract_title,
-    ):
-        title_none = await fetcher.extract_cited_title(None)
-        assert title_none is None, "Should return None for None URL"
+    title_none = await fetcher.extract_cited_title(None)
+    assert title_none is None, "Should return None for None URL"
 
-        title_empty = await fetcher.extract_cited_title("")
-        assert title_empty is None, "Should return None for empty string URL"
+    title_empty = await fetcher.extract_cited_title("")
+    assert title_empty is None, "Should return None for empty string URL"
 
-        mock_fetch_page.assert_not_called()
-        mock_extract_title.assert_not_called()
-
-    await fetcher.close()
+    fetcher.fetch_page.assert_not_called()
+    fetcher.parser.extract_title.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_fetch_page_returns_none(fetcher_setup):
+async def test_extract_cited_title_fetch_page_returns_none(parser_stub):
     """Test extract_cited_title when fetch_page returns None."""
-    fetcher, _ = fetcher_setup
+    fetcher = parser_stub
     test_cited_by_url = "http://example.com/cited_by_page_fails_fetch"
 
-    with (
-        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value=None) as mock_fetch_page,
-        patch.object(fetcher.parser, "extract_title", new_callable=MagicMock) as mock_extract_title,
-    ):
-        title = await fetcher.extract_cited_title(test_cited_by_url)
-
-        assert title == "Unknown Title"
-        mock_fetch_page.assert_called_once_with(test_cited_by_url)
-        mock_extract_title.assert_not_called()
+    title = await fetcher.extract_cited_title(test_cited_by_url)
 
-    await fetcher.close()
+    assert title is UNKNOWN_TITLE
+    fetcher.parser.extract_title.assert_not_called()
+    # A failed fetch isn't cached, so a repeat visit tries the page again
+    assert await fetcher.extract_cited_title(test_cited_by_url) is UNKNOWN_TITLE
+    assert fetcher.fetch_page.call_args_list == [call(test_cited_by_url), call(test_cited_by_url)]
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_selector_no_match(fetcher_setup):
+async def test_extract_cited_title_selector_no_match(parser_stub):
     """Test extract_cited_title when CSS selector finds no matching element."""
-    fetcher, _ = fetcher_setup
+    fetcher = parser_stub
     test_cited_by_url = "http://example.com/cited_by_page_no_selector_match"
 
     # HTML content that does NOT contain 'div.gs_ri h3.gs_rt'
-    html_without_selector = (
+    fetcher.fetch_page.return_value = (
         "<html><body><p>This page has no title in the expected format.</p><div>Some other content</div></body></html>"
     )
 
-    with (
-        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value=html_without_selector) as mock_fetch_page,
-        patch.object(fetcher.parser, "extract_title", new_callable=MagicMock) as mock_extract_title,
-    ):
-        title = await fetcher.extract_cited_title(test_cited_by_url)
-
-        assert title == "Unknown Title"
-        mock_fetch_page.assert_called_once_with(test_cited_by_url)
-        # extract_title should not be called if the selector doesn't find anything
-        # because `first_result` in `extract_cited_title` would be empty/None.
-        mock_extract_title.assert_not_called()
+    title = await fetcher.extract_cited_title(test_cited_by_url)
 
-    await fetcher.close()
+    assert title is UNKNOWN_TITLE
+    fetcher.fetch_page.assert_called_once_with(test_cited_by_url)
+    # extract_title should not be called if the selector doesn't find anything
+    # because `first_result` in `extract_cited_title` would be empty/None.
+    fetcher.parser.extract_title.assert_not_called()
+    # The page was fetched, so its lack of a heading is cached
+    assert fetcher._cited_title_cache[test_cited_by_url] is UNKNOWN_TITLE
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_parser_raises_exception(fetcher_setup):
+async def test_extract_cited_title_parser_raises_exception(parser_stub):
     """Test extract_cited_title when parser.extract_title raises an exception."""
-    fetcher, _ = fetcher_setup
+    fetcher = parser_stub
     test_cited_by_url = "http://example.com/cited_by_page_parser_exception"
     # HTML that *would* match the selector
-    dummy_html_content = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
+    fetcher.fetch_page.return_value = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
+    fetcher.parser.extract_title.side_effect = ParsingException("Mock parsing failed")
 
-    with (
-        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value=dummy_html_content) as mock_fetch_page,
-        patch.object(fetcher.parser, "extract_title", side_effect=ParsingException("Mock parsing failed")) as mock_extract_title,
-    ):
-        title = await fetcher.extract_cited_title(test_cited_by_url)
+    title = await fetcher.extract_cited_title(test_cited_by_url)
 
-        assert title == "Unknown Title"
-        mock_fetch_page.assert_called_once_with(test_cited_by_url)
-        mock_extract_title.assert_called_once()  # It should be called
-
-    await fetcher.close()
+    assert title is UNKNOWN_TITLE
+    fetcher.fetch_page.assert_called_once_with(test_cited_by_url)
+    fetcher.parser.extract_title.assert_called_once()  # It should be called
+    assert test_cited_by_url not in fetcher._cited_title_cache  # Nor is a failed parse
 
 
 @pytest.mark.asyncio
-async def test_extract_cited_title_parser_returns_none(fetcher_setup):
+async def test_extract_cited_title_parser_returns_none(parser_stub):
     """Test extract_cited_title when parser.extract_title returns None."""
-    fetcher, _ = fetcher_setup
+    fetcher = parser_stub
     test_cited_by_url = "http://example.com/cited_by_page_parser_none"
-    dummy_html_content = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
+    fetcher.fetch_page.return_value = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
+
+    title = await fetcher.extract_cited_title(test_cited_by_url)
+
+    # Whatever extract_title returns for the first heading, None included, is returned (and cached) as-is
+    assert title is None
+    fetcher.fetch_page.assert_called_once_with(test_cited_by_url)
+    fetcher.parser.extract_title.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_extract_cited_title_memoized(parser_stub):
+    """Test extract_cited_title fetches and parses a cited-by URL only once across repeated calls."""
+    fetcher = parser_stub
+    test_cited_by_url = "http://example.com/cited_by_page_repeated"
+    fetcher.fetch_page.return_value = "<html><body><div class='gs_ri'><h3 class='gs_rt'><a>Mock Title</a></h3></div></body></html>"
+    fetcher.parser.extract_title.return_value = "Shared Cited Title"
+
+    first = await fetcher.extract_cited_title(test_cited_by_url)
+    second = await fetcher.extract_cited_title(test_cited_by_url)
+
+    assert first == second == "Shared Cited Title"
+    assert fetcher.fetch_page.call_count == 1
+    fetcher.parser.extract_title.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_extract_cited_title_uses_first_result(fetcher_setup, monkeypatch):
+    """Test extract_cited_title returns only the first result's title when the page lists several."""
+    fetcher, _ = fetcher_setup
+    html = (
+        "<html><body>"
+        "<div class='gs_ri'><h3 class='gs_rt'><a>First Cited Paper</a></h3></div>"
+        "<div class='gs_ri'><h3 class='gs_rt'><a>Second Cited Paper</a></h3></div>"
+        "</body></html>"
+    )
+    monkeypatch.setattr(fetcher, "fetch_page", AsyncMock(return_value=html))
+
+    title = await fetcher.extract_cited_title("http://example.com/cited_by_page_many_results")
+
+    assert title == "First Cited Paper"
+
+
+@pytest.mark.asyncio
+async def test_fetch_cited_by_page_diamond_citations(fetcher_setup, monkeypatch):
+    """Test that a paper cited from two depth-1 pages has its cited-by page fetched only once."""
+    fetcher, m_proxy_manager = fetcher_setup
+    shared_url = "http://example.com/cited_by_shared"
+    # Each page's "HTML" is its URL; the stub parser maps it to the results listed on that page
+    results_by_page = {
+        "http://example.com/cited_by_a": [{"title": "Paper A1", "cited_by_url": shared_url}],
+        "http://example.com/cited_by_b": [{"title": "Paper B1", "cited_by_url": shared_url}],
+        shared_url: [],
+    }
+    monkeypatch.setattr(fetcher, "fetch_page", AsyncMock(side_effect=lambda url: url))
+    monkeypatch.setattr(fetcher, "extract_cited_title", AsyncMock(return_value="Shared Paper"))
+    monkeypatch.setattr(fetcher, "parser", SimpleNamespace(parse_results=MagicMock(side_effect=results_by_page.get)))
+    graph_builder = MagicMock()
+
+    tasks = []
+    for page_url in ("http://example.com/cited_by_a", "http://example.com/cited_by_b"):
+        tasks.extend(await fetcher.fetch_cited_by_page(page_url, m_proxy_manager, 1, 2, graph_builder))
+    await asyncio.gather(*tasks)
+
+    fetched_urls = [call.args[0] for call in fetcher.fetch_page.call_args_list]
+    assert fetched_urls.count(shared_url) == 1
+    assert graph_builder.add_citation.call_count == 2  # Both citing edges are still recorded
+
+
+
+@pytest.mark.asyncio
+async def test_fetch_cited_by_page_retries_after_failed_fetch(fetcher_setup, monkeypatch):
+    """Test that a cited-by page whose fetch failed isn't marked as crawled, so a later visit fetches it again."""
+    fetcher, m_proxy_manager = fetcher_setup
+    url = "http://example.com/cited_by_flaky"
+    monkeypatch.setattr(fetcher, "fetch_page", AsyncMock(side_effect=[None, url]))
+    monkeypatch.setattr(fetcher, "parser", SimpleNamespace(parse_results=MagicMock(return_value=[])))
+
+    assert await fetcher.fetch_cited_by_page(url, m_proxy_manager, 1, 1, MagicMock()) == []
+    assert url not in fetcher._fetched_cited_by_urls
+    await fetcher.fetch_cited_by_page(url, m_proxy_manager, 1, 1, MagicMock())
+
+    assert fetcher.fetch_page.await_count == 2
+    assert url in fetcher._fetched_cited_by_urls
+
+
+@pytest.mark.asyncio
+async def test_scrape_resets_citation_caches(fetcher_setup, monkeypatch):
+    """Test that each scrape starts with empty cited-title and crawled-page caches."""
+    fetcher, _ = fetcher_setup
+    monkeypatch.setattr(fetcher_module, "QueryBuilder", lambda: _StubQueryBuilder("http://scholar.google.com/mock_empty"))
+    fetcher._cited_title_cache["http://example.com/stale"] = "Stale Title"
+    fetcher._fetched_cited_by_urls.add("http://example.com/stale")
 
     with (
-        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value=dummy_html_content) as mock_fetch_page,
-        patch.object(fetcher.parser, "extract_title", return_value=None) as mock_extract_title,
+        patch.object(fetcher.parser, "parse_results", return_value=[]),  # An empty page ends the scrape
+        patch.object(fetcher.parser, "parse_raw_items", return_value=[]),
+        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value="<html></html>"),
     ):
-        title = await fetcher.extract_cited_title(test_cited_by_url)
-
-        # The current implementation of extract_cited_title returns "Unknown Title" if parser.extract_title returns None
-        # because the check is `if first_result: return self.parser.extract_title(first_result)`
-        # If extract_title returns None, the `if first_result` (which would be the result of extract_title)
-        # would be false, and it would fall through to `return "Unknown Title"`.
-        # Let's verify this behavior.
-        # Actually, the code is:
-        # if first_result: # first_result is the SelectorList
-        #    return self.parser.extract_title(first_result) # This return happens if extract_title returns a truthy value
-        # If extract_title returns None (falsy), the `if first_result:` block's return isn't hit,
-        # and it falls through to the `except` or the final `return "Unknown Title"`.
-        # So, if parser.extract_title returns None, the method should return "Unknown Title".
-        assert title is None
-        mock_fetch_page.assert_called_once_with(test_cited_by_url)
-        mock_extract_title.assert_called_once()
+        results = await fetcher.scrape(
+            query="empty",
+            authors=None,
+            publication=None,
+            year_low=None,
+            year_high=None,
+            num_results=1,
+            pdf_dir="pdfs",
+            max_depth=1,
+            graph_builder=_StubGraphBuilder(),
+            data_handler=_StubDataHandler(),
+        )
 
-    await fetcher.close()
+    assert results == []
+    assert fetcher._cited_title_cache == {}
+    assert fetcher._fetched_cited_by_urls == set()
+
+
+# Parser output served to the scrape integration test: five results, the first four with a direct PDF link.
+# DOIs are None so scrape_pdf_link is never needed. Rows are read-only; the test copies them before use.
+_DUMMY_PDF_URLS = tuple(f"https://example.com/dummy_pdf_{i}.pdf" for i in range(1, 5))
+_DUMMY_PARSED_RESULTS = tuple(
+    MappingProxyType({
+        "title": f"Test Title {i + 1}",
+        "article_url": f"http://example.com/article_url_{i + 1}",
+        "authors_list": [f"Author A{i + 1}", f"Author B{i + 1}"],
+        "doi": None,
+        "pdf_url": _DUMMY_PDF_URLS[i] if i < len(_DUMMY_PDF_URLS) else None,
+        "cited_by_url": f"http://example.com/cited_by_{i + 1}",
+        "citations": i * 10,
+        "publication_info": MappingProxyType({"publication": f"Journal {i + 1}", "year": 2020 + i}),
+        "snippet": f"Snippet for result {i + 1}. Some text here.",
+    })
+    for i in range(5)
+)
+# scrape only zips the raw items with the parsed results, so placeholders suffice
+_DUMMY_RAW_ITEMS = tuple(object() for _ in _DUMMY_PARSED_RESULTS)
 
 
 @pytest.mark.asyncio
-async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_search_page_html):
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_search_page_html, monkeypatch):
     """
     Integration test for Fetcher.scrape focusing on processing direct PDF links
     from a local HTML file.
@@ -826,29 +977,19 @@ async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_sea
     fetcher, _ = fetcher_setup
     mock_search_url = "http://scholar.google.com/mock_search_direct_pdf"
 
-    # 1. Mock QueryBuilder instance and its constructor
-    mock_qb_instance = MagicMock(spec=QueryBuilder)
-    mock_qb_instance.build_url.return_value = mock_search_url
-    # This mock_qb_constructor will be used to replace the QueryBuilder class in fetcher.py
-    mock_qb_constructor = MagicMock(return_value=mock_qb_instance)
+    # 1. Stub QueryBuilder, replacing the class used by fetcher.py
+    stub_qb = _StubQueryBuilder(mock_search_url)
+    monkeypatch.setattr(fetcher_module, "QueryBuilder", lambda: stub_qb)
 
-    # 2. Mock DataHandler
-    mock_dh = MagicMock(spec=DataHandler)
-    mock_dh.result_exists = AsyncMock(return_value=False)
-    mock_dh.add_result = AsyncMock(return_value=1)  # Simulate returning a db_id
-    mock_dh.add_citation_link = AsyncMock()
-    mock_dh.get_all_results_with_title_like = AsyncMock(return_value=[])  # For check_if_previously_processed
+    # 2. Stub DataHandler
+    stub_dh = _StubDataHandler()
 
-    # 3. Mock GraphBuilder
-    mock_gb = MagicMock(spec=GraphBuilder)
-    mock_gb.add_node = MagicMock()
-    mock_gb.add_citation = MagicMock()
+    # 3. Stub GraphBuilder
+    stub_gb = _StubGraphBuilder()
 
     # 4. Patch Fetcher's internal methods and QueryBuilder class used by Fetcher
-    async def mock_fetch_page_side_effect(url, *args, **kwargs):
-        if url == mock_search_url:
-            return scholar_search_page_html
-        return None
+    # Pages fetch_page can serve, by URL; anything else (e.g. cited-by pages) comes back as None
+    html_by_url = {mock_search_url: scholar_search_page_html}
 
     # Define arguments for scrape to use them in assertions later
     current_query = "test integration direct pdfs"
@@ -856,41 +997,18 @@ async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_sea
     current_publication = None
     current_year_low = None
     current_year_high = None  # This is None, and will be asserted as such for year_high param
-    current_num_results = 5  # HTML has 5 main entries
-
-    expected_pdf_downloads_for_dummy_results = [
-        "https://example.com/dummy_pdf_1.pdf",
-        "https://example.com/dummy_pdf_2.pdf",
-        "https://example.com/dummy_pdf_3.pdf",
-        "https://example.com/dummy_pdf_4.pdf",
-    ]  # Expect 4 downloads
-
-    # Create dummy data for parser mocks to ensure the scrape loop runs
-    dummy_parsed_results = []
-    for i in range(current_num_results):  # Use current_num_results for consistency
-        item_pdf_url = expected_pdf_downloads_for_dummy_results[i] if i < len(expected_pdf_downloads_for_dummy_results) else None
-        dummy_parsed_results.append({
-            "title": f"Test Title {i + 1}",
-            "article_url": f"http://example.com/article_url_{i + 1}",
-            "authors_list": [f"Author A{i + 1}", f"Author B{i + 1}"],
-            "doi": None,  # Keep DOI None as scrape_pdf_link is mocked to return None
-            "pdf_url": item_pdf_url,  # Populate with expected PDF URLs
-            "cited_by_url": f"http://example.com/cited_by_{i + 1}",
-            "citations": i * 10,
-            "year": 2020 + i,
-            "publication_info": f"Journal {i + 1}, {2020 + i}",
-            "snippet": f"Snippet for result {i + 1}. Some text here.",
-        })
-
-    dummy_raw_items = [MagicMock() for _ in range(current_num_results)]
+    current_num_results = len(_DUMMY_PARSED_RESULTS)  # 5 results, as on the sample HTML page
+
+    expected_pdf_downloads_for_dummy_results = _DUMMY_PDF_URLS  # Expect 4 downloads
+
+    # Fresh copies of the frozen rows: scrape writes pdf_path into each result it processes
+    dummy_parsed_results = [dict(row) for row in _DUMMY_PARSED_RESULTS[:current_num_results]]
+    dummy_raw_items = _DUMMY_RAW_ITEMS[:current_num_results]
 
     with (
-        patch("google_scholar_scraper.fetcher.QueryBuilder", mock_qb_constructor) as patched_qb_class,
         patch.object(fetcher.parser, "parse_results", return_value=dummy_parsed_results) as patched_parse_results,
         patch.object(fetcher.parser, "parse_raw_items", return_value=dummy_raw_items) as patched_parse_raw_items,
-        patch.object(
-            fetcher, "fetch_page", new_callable=AsyncMock, side_effect=mock_fetch_page_side_effect
-        ) as patched_fetch_page,
+        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, side_effect=html_by_url.get) as patched_fetch_page,
         patch.object(fetcher, "scrape_pdf_link", new_callable=AsyncMock, return_value=None) as patched_scrape_pdf_link,
         patch.object(fetcher, "download_pdf", new_callable=AsyncMock, return_value=True) as patched_download_pdf,
         patch.object(fetcher, "fetch_cited_by_page", new_callable=AsyncMock, return_value=[]) as patched_fetch_cited_by,
@@ -903,38 +1021,25 @@ async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_sea
             year_high=current_year_high,
             num_results=current_num_results,
             pdf_dir="dummy_pdf_dir_integration",
-            data_handler=mock_dh,
-            graph_builder=mock_gb,
+            data_handler=stub_dh,
+            graph_builder=stub_gb,
             max_depth=0,
+            download_pdfs=True,
         )
 
         # Assertions
-        patched_qb_class.assert_called_once()  # Verify QueryBuilder() was instantiated
-        # The mock's "Actual" call was: call('test integration direct pdfs', 0, None, None, None, None, ...)
-        # This means the effective parameters for build_url were:
-        # query='test integration direct pdfs', start_index=0, authors=None,
-        # publication=None, year_low=None, year_high=None (from 6th positional arg being None)
-        # Based on the "Actual" call from the mock error log:
-        # call('test integration direct pdfs', 0, None, None, None, None, None, None, None, None, None)
-        # This asserts the first 6 positional arguments received by the mock.
-        mock_qb_instance.build_url.assert_called_once_with(
-            current_query,  # 1. query
-            0,  # 2. start_index (effective value)
-            current_authors,  # 3. authors (effective value, None)
-            current_publication,  # 4. publication (effective value, None)
-            current_year_low,  # 5. year_low (effective value, None)
-            current_year_high,  # 6. year_high (effective value, None)
-            None,  # 7. sort_by_date (matching mock's string for default False)
-            None,  # 8. include_patents (matching mock's string for default True)
-            None,  # 9. include_citations (matching mock's string for default True)
-            None,  # 10. language (default None)
-            None,  # 11. scholar_articles_id (default None)
+        # The first build_url call covers query, start_index=0, authors, publication, year_low, year_high,
+        # followed by phrase, exclude, title, author and source (all None here).
+        assert stub_qb.calls[0] == (
+            (current_query, 0, current_authors, current_publication, current_year_low, current_year_high, None, None, None, None, None),
+            {},
         )
         patched_fetch_page.assert_any_call(mock_search_url)
 
         # Parser extracts 5 main results from the sample HTML
-        assert mock_dh.result_exists.call_count == 1  # Expect 1 if item loop runs once
-        assert mock_dh.add_result.call_count == 5  # Expect 5 calls as 5 results are parsed
+        assert stub_dh.result_exists_calls == 1  # Expect 1 if item loop runs once
+        assert len(stub_dh.inserted_batches) == 1  # The page's results are stored in one batch
+        assert len(stub_dh.inserted_batches[0]) == 5  # All 5 parsed results are in it
 
         # Check calls to scrape_pdf_link (should NOT be called as DOI is None in dummy_parsed_results)
         # The dummy_parsed_results explicitly sets "doi": None for all items.
@@ -951,9 +1056,8 @@ async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_sea
         assert len(actual_download_calls) == expected_number_of_downloads
 
         # Verify that the URLs passed to download_pdf match those in expected_pdf_downloads_for_dummy_results
-        # (up to the number of actual calls, in case fewer were called than expected by the list length)
-        for i in range(len(actual_download_calls)):
-            assert actual_download_calls[i] == expected_pdf_downloads_for_dummy_results[i]
+        # (as a set: downloads run concurrently, so their order isn't guaranteed)
+        assert set(actual_download_calls) == set(expected_pdf_downloads_for_dummy_results)
 
         # Check fetch_cited_by_page:
         # It should NOT be called because max_depth is 0 in this test.
@@ -961,61 +1065,173 @@ async def test_fetcher_scrape_integration_direct_pdfs(fetcher_setup, scholar_sea
         assert patched_fetch_cited_by.call_count == 0
 
         # Check graph_builder calls:
-        # Fetcher.scrape calls add_citation for each result. It does not directly call add_node.
-        assert mock_gb.add_node.call_count == 0
-        assert mock_gb.add_citation.call_count == 5  # Called for each of the 5 results
+        # Fetcher.scrape calls add_citation for each result. It does not directly call add_node (the stub has none).
+        assert len(stub_gb.citations) == 5  # Called for each of the 5 results
+
+
 
+@pytest.mark.asyncio
+async def test_scrape_skips_citations_of_already_stored_results(fetcher_setup, monkeypatch):
+    """Test that scrape only follows the citations of results the DataHandler newly inserted."""
+    fetcher, _ = fetcher_setup
+    mock_search_url = "http://scholar.google.com/mock_search_stored"
+    monkeypatch.setattr(fetcher_module, "QueryBuilder", lambda: _StubQueryBuilder(mock_search_url))
+    parsed_results = [dict(row) for row in _DUMMY_PARSED_RESULTS[:2]]
+    stub_dh = _StubDataHandler(stored_urls={parsed_results[0]["article_url"]})
+    stub_gb = _StubGraphBuilder()
+
+    with (
+        patch.object(fetcher.parser, "parse_results", return_value=parsed_results),
+        patch.object(fetcher.parser, "parse_raw_items", return_value=_DUMMY_RAW_ITEMS[:2]),
+        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value="<html></html>"),
+        patch.object(fetcher, "extract_cited_title", new_callable=AsyncMock, return_value="Citing Paper") as patched_cited_title,
+        patch.object(fetcher, "fetch_cited_by_page", new_callable=AsyncMock, return_value=[]) as patched_fetch_cited_by,
+    ):
+        results = await fetcher.scrape(
+            query="stored",
+            authors=None,
+            publication=None,
+            year_low=None,
+            year_high=None,
+            num_results=2,
+            pdf_dir="pdfs",
+            max_depth=1,
+            graph_builder=stub_gb,
+            data_handler=stub_dh,
+        )
+
+    assert results == parsed_results  # Stored results are still returned
+    patched_cited_title.assert_awaited_once_with(parsed_results[1]["cited_by_url"])
+    assert [args[0] for args, _ in stub_gb.citations] == [parsed_results[1]["title"]]
+    assert patched_fetch_cited_by.await_count == 1
+    assert patched_fetch_cited_by.await_args.args[0] == parsed_results[1]["cited_by_url"]
+
+
+@pytest.mark.asyncio
+async def test_download_result_pdf_concurrency_bounded(fetcher_setup, monkeypatch):
+    """Test that PDFs for a page's results download concurrently but never beyond the semaphore's bound."""
+    fetcher, _ = fetcher_setup
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def slow_download(url, filename):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    monkeypatch.setattr(fetcher, "download_pdf", slow_download)
+    results = [{"title": f"Paper {i}", "publication_info": {"year": 2020}, "pdf_url": f"https://example.com/{i}.pdf"} for i in range(5)]
+    semaphore = asyncio.Semaphore(2)
+
+    await asyncio.gather(*(fetcher._download_result_pdf(result, "pdfs", semaphore) for result in results))
+
+    assert peak_in_flight == 2
+    for i, result in enumerate(results):
+        assert result["pdf_path"].startswith(os.path.join("pdfs", f"Paper {i}_2020_"))
+        assert result["pdf_path"].endswith("_direct.pdf")
+
+
+@pytest.mark.asyncio
+async def test_download_result_pdf_same_title_gets_distinct_files(fetcher_setup, monkeypatch):
+    """Test that two results with the same title, downloading concurrently, are written to different files."""
+    fetcher, _ = fetcher_setup
+    filenames = []
+
+    async def record_download(url, filename):
+        filenames.append(filename)
+        return True
+
+    monkeypatch.setattr(fetcher, "download_pdf", record_download)
+    results = [
+        {
+            "title": "Same: Title",
+            "publication_info": {"year": 2020},
+            "article_url": f"https://example.com/{i}",
+            "pdf_url": f"https://example.com/{i}.pdf",
+        }
+        for i in range(2)
+    ]
+
+    await asyncio.gather(*(fetcher._download_result_pdf(result, "pdfs", asyncio.Semaphore(2)) for result in results))
+
+    assert len(set(filenames)) == 2
+    assert {result["pdf_path"] for result in results} == set(filenames)
+    assert all(filename.startswith(os.path.join("pdfs", "Same Title_2020_")) for filename in filenames)
+
+
+
+@pytest.mark.asyncio
+async def test_scrape_downloads_pdf_for_untitled_result(fetcher_setup, monkeypatch):
+    """Test that scrape with download_pdfs=True still downloads and stores a result the parser found no title for."""
+    fetcher, _ = fetcher_setup
+    mock_search_url = "http://scholar.google.com/mock_search_untitled"
+    monkeypatch.setattr(fetcher_module, "QueryBuilder", lambda: _StubQueryBuilder(mock_search_url))
+    stub_dh = _StubDataHandler()
+    untitled_result = {"title": None, "publication_info": {}, "pdf_url": "https://example.com/untitled.pdf", "doi": None}
+
+    with (
+        patch.object(fetcher.parser, "parse_results", return_value=[untitled_result]),
+        patch.object(fetcher.parser, "parse_raw_items", return_value=[object()]),
+        patch.object(fetcher, "fetch_page", new_callable=AsyncMock, return_value="<html></html>"),
+        patch.object(fetcher, "download_pdf", new_callable=AsyncMock, return_value=True) as patched_download_pdf,
+    ):
+        results = await fetcher.scrape(
+            query="untitled",
+            authors=None,
+            publication=None,
+            year_low=None,
+            year_high=None,
+            num_results=1,
+            pdf_dir="pdfs",
+            max_depth=0,
+            graph_builder=_StubGraphBuilder(),
+            data_handler=stub_dh,
+            download_pdfs=True,
+        )
+
+    patched_download_pdf.assert_awaited_once()
+    assert results == [untitled_result]
+    assert untitled_result["pdf_path"].startswith(os.path.join("pdfs", "untitled_unknown_"))
+    assert stub_dh.inserted_batches == [[untitled_result]]
+
+
+@pytest.fixture
+async def direct_fetcher(direct_proxy_manager):
+    """A Fetcher using the session's direct-connection ProxyManager, closed at teardown."""
+    fetcher = Fetcher(proxy_manager=direct_proxy_manager, min_delay=0, max_delay=0)
+    await fetcher._create_client()  # Ensure client session is ready
+    yield fetcher
     await fetcher.close()
 
 
 @pytest.mark.asyncio
-async def test_fetcher_uses_direct_connection_when_forced(tmp_path):
+async def test_fetcher_uses_direct_connection_when_forced(direct_fetcher):
     """
     Test that Fetcher makes a direct connection (no proxy kwarg to aiohttp)
     when ProxyManager has force_direct_connection=True.
     """
-    blacklist_file_name = None
-    fetcher = None
-    try:
-        # 1. Setup ProxyManager to force direct connection
-        # A temporary blacklist file is used to avoid interference from a real one.
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".json") as tmp_file:
-            tmp_file.write("{}")  # Write empty JSON to make it valid
-            blacklist_file_name = tmp_file.name
-
-        proxy_manager_forcing_direct = RealProxyManager(
-            force_direct_connection=True, debug_mode=False, blacklist_file=blacklist_file_name
-        )
-
-        # 2. Setup Fetcher with this ProxyManager
-        fetcher = Fetcher(proxy_manager=proxy_manager_forcing_direct, min_delay=0, max_delay=0)
-        await fetcher._create_client()  # Ensure client session is ready
+    fetcher = direct_fetcher
 
-        test_url = "http://example.com/direct_connection_test"
-        expected_html_content = "<html>Direct Call Successful</html>"
+    test_url = "http://example.com/direct_connection_test"
+    expected_html_content = "<html>Direct Call Successful</html>"
 
-        # 3. Patch aiohttp.ClientSession.get on the fetcher's client instance
-        mock_response_ctx_manager = AsyncMock()
-        mock_response_obj = AsyncMock(spec=aiohttp.ClientResponse)
-        mock_response_obj.text = AsyncMock(return_value=expected_html_content)
-        mock_response_obj.raise_for_status = MagicMock()
+    # Patch aiohttp.ClientSession.get on the fetcher's client instance
+    mock_response_ctx_manager = AsyncMock()
+    mock_response_obj = AsyncMock(spec=aiohttp.ClientResponse)
+    mock_response_obj.text = AsyncMock(return_value=expected_html_content)
+    mock_response_obj.raise_for_status = MagicMock()
 
-        mock_response_ctx_manager.__aenter__.return_value = mock_response_obj
+    mock_response_ctx_manager.__aenter__.return_value = mock_response_obj
 
-        with patch.object(fetcher.client, "get", return_value=mock_response_ctx_manager) as mock_session_get:
-            # 4. Action: Call fetch_page
-            html_content = await fetcher.fetch_page(test_url)
-
-            # 5. Assertions
-            assert html_content == expected_html_content
+    with patch.object(fetcher.client, "get", return_value=mock_response_ctx_manager) as mock_session_get:
+        html_content = await fetcher.fetch_page(test_url)
 
-            mock_session_get.assert_called_once_with(test_url, headers=ANY, timeout=ANY)
+        assert html_content == expected_html_content
 
-            called_kwargs = mock_session_get.call_args.kwargs
-            assert "proxy" not in called_kwargs, "Proxy argument should not be present for direct connection."
+        mock_session_get.assert_called_once_with(test_url, headers=ANY, timeout=ANY)
 
-    finally:
-        if fetcher:
-            await fetcher.close()  # Ensure client session is closed
-        if blacklist_file_name and os.path.exists(blacklist_file_name):
-            os.unlink(blacklist_file_name)  # Clean up temp blacklist file
+        called_kwargs = mock_session_get.call_args.kwargs
+        assert "proxy" not in called_kwargs, "Proxy argument should not be present for direct connection."
@@ -1,255 +1,215 @@
 import argparse
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import sqlite3
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, create_autospec, patch
 
 import pytest
 
+import google_scholar_scraper.main as main_module
+
+from google_scholar_scraper.data_handler import DataHandler
+from google_scholar_scraper.fetcher import Fetcher
+from google_scholar_scraper.graph_builder import GraphBuilder
+
 # To avoid naming conflict if main.py is also imported directly for other reasons
 from google_scholar_scraper.main import main as async_main_entry
-from google_scholar_scraper.proxy_manager import NoProxiesAvailable
-
-
-@pytest.mark.asyncio
-async def test_main_basic_query_csv_output():
-    """Test the main function with a basic query and CSV output."""
-    # 1. Simulate command line arguments
-    test_argv = [
-        "main.py",
-        "test query",
-        "--num_results",
-        "7",
-        "--output",
-        "test_output.csv",
-        "--pdf_dir",
-        "test_pdfs",
-        "--graph_file",
-        "test_graph.graphml",
-        "--log_level",
-        "ERROR",  # Use a non-default to check arg passing
-    ]
-
-    # 2. Mock argparse
-    # Create a mock Namespace object that parse_args would return
-    mock_args = argparse.Namespace(
-        query="test query",
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=7,
-        output="test_output.csv",
-        json=False,
-        pdf_dir="test_pdfs",
-        max_depth=3,  # Default
-        graph_file="test_graph.graphml",
-        log_level="ERROR",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,  # This is different from --authors
-        source=None,
-        min_citations=None,
-        author_profile=None,
-        recursive=False,
-        graph_layout="spring",  # Default
-        centrality_filter=None,  # Default
+from google_scholar_scraper.proxy_manager import NoProxiesAvailable, ProxyManager
+
+# What main's ArgumentParser returns when no options are given; tests override only what they exercise
+_BASE_ARGS = dict(
+    query=None,
+    authors=None,
+    publication=None,
+    year_low=None,
+    year_high=None,
+    num_results=10,
+    output="results.csv",
+    json=False,
+    pdf_dir="pdfs",
+    max_depth=3,
+    graph_file="citation_graph.graphml",
+    log_level="DEBUG",
+    download_pdfs=False,
+    num_pages=None,
+    phrase=None,
+    exclude=None,
+    title=None,
+    author=None,  # This is different from --authors
+    source=None,
+    min_citations=None,
+    author_profile=None,
+    recursive=False,
+    graph_layout="spring",
+    centrality_filter=None,
+)
+
+
+# Dummy scrape output; main only reads these, so they are built once and shared by every test
+_DUMMY_RESULTS = [{"title": "Result 1"}]
+_AUTHOR_PUBS = [{"title": "Pub1", "link": "link_to_pub1"}, {"title": "Pub2", "link": "link_to_pub2"}]
+_DUMMY_AUTHOR_DATA = {"name": "Test Author", "publications": _AUTHOR_PUBS}
+# One list of details per publication, returned in order by scrape_publication_details
+_PUB_DETAILS = [[{"detail_title": "Detail Pub1"}], [{"detail_title": "Detail Pub2"}]]
+
+
+def make_args(**overrides):
+    """An argparse.Namespace of main's defaults with the given fields overridden."""
+    return argparse.Namespace(**{**_BASE_ARGS, **overrides})
+
+
+def _expected_scrape_call(args, graph_builder, data_handler):
+    """The call main should make to Fetcher.scrape for a search query parsed into args."""
+    return call(
+        args.query,
+        args.authors,
+        args.publication,
+        args.year_low,
+        args.year_high,
+        args.num_results,
+        args.pdf_dir,
+        args.max_depth,
+        graph_builder,
+        data_handler,
+        phrase=args.phrase,
+        exclude=args.exclude,
+        title=args.title,
+        author=args.author,
+        source=args.source,
+        download_pdfs=args.download_pdfs,
     )
 
-    # 3. Patch all major components and functions used by main
+
+@pytest.fixture(scope="module")
+def event_loop(event_loop_policy):
+    """
+    One loop for the whole module instead of conftest's per-test loop (uvloop when installed).
+    These tests only await pre-resolved mocks, so none of them leaves pending work on it for the next.
+    """
+    loop = event_loop_policy.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def _resolved(value=None):
+    """
+    An already-completed future holding value, for a MagicMock to return where main awaits a call.
+    Awaiting it yields value straight away, skipping the coroutine AsyncMock builds on every call.
+    """
+    future = asyncio.get_event_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+@pytest.fixture
+def main_mocks(monkeypatch, event_loop):
+    """
+    Replaces main's collaborators with MagicMocks via monkeypatch and returns them as a namespace.
+    Each class mock returns an autospec'd instance, so main touching a method the real class lacks fails the test.
+    The instances' awaited methods return resolved futures (None) by default; tests override the ones they exercise.
+    """
+    mocks = SimpleNamespace(
+        proxy=MagicMock(return_value=create_autospec(ProxyManager, instance=True)),
+        fetcher=MagicMock(return_value=create_autospec(Fetcher, instance=True)),
+        data=MagicMock(return_value=create_autospec(DataHandler, instance=True)),
+        graph=MagicMock(return_value=create_autospec(GraphBuilder, instance=True)),
+        makedirs=MagicMock(),
+        logging_config=MagicMock(),
+    )
+    monkeypatch.setattr(main_module, "ProxyManager", mocks.proxy)
+    monkeypatch.setattr(main_module, "Fetcher", mocks.fetcher)
+    monkeypatch.setattr(main_module, "DataHandler", mocks.data)
+    monkeypatch.setattr(main_module, "GraphBuilder", mocks.graph)
+    monkeypatch.setattr(main_module.os, "makedirs", mocks.makedirs)
+    monkeypatch.setattr(main_module.logging, "basicConfig", mocks.logging_config)
+
+    mocks.proxy.return_value.get_working_proxies = MagicMock(return_value=_resolved())
+    for name in ("scrape", "fetch_author_profile", "scrape_publication_details", "close"):
+        setattr(mocks.fetcher.return_value, name, MagicMock(return_value=_resolved()))
+    for name in ("connect", "close", "create_table", "get_all_results"):
+        setattr(mocks.data.return_value, name, MagicMock(return_value=_resolved()))
+    # Instance attributes set in GraphBuilder.__init__ are invisible to autospec
+    mocks.graph.return_value.graph = SimpleNamespace(number_of_nodes=lambda: 1, number_of_edges=lambda: 0)  # Only printed
+    mocks.graph.return_value.output_folder = "graph_citations"
+    return mocks
+
+
+def _assert_main_setup(main_mocks, args):
+    """Asserts main built each collaborator once, found working proxies and prepared logging and the PDF dir."""
+    proxy_manager = main_mocks.proxy.return_value
+    main_mocks.proxy.assert_called_once()
+    proxy_manager.get_working_proxies.assert_called_once()
+    main_mocks.fetcher.assert_called_once_with(proxy_manager=proxy_manager)
+    main_mocks.data.assert_called_once()
+    main_mocks.data.return_value.create_table.assert_called_once()
+    main_mocks.graph.assert_called_once()  # Instantiated even when only a profile is scraped
+    main_mocks.makedirs.assert_called_once_with(args.pdf_dir, exist_ok=True)
+    main_mocks.logging_config.assert_called_once()
+    assert main_mocks.logging_config.call_args.kwargs["level"] == args.log_level
+
+
+@pytest.mark.parametrize(
+    "output_args, saved_with, not_saved_with",
+    [
+        pytest.param(
+            dict(output="test_output.csv", pdf_dir="test_pdfs", graph_file="test_graph.graphml", log_level="ERROR"),
+            "save_to_csv",
+            "save_to_json",
+            id="csv",
+        ),
+        pytest.param(
+            dict(
+                output="test_output.json",
+                json=True,
+                pdf_dir="test_pdfs_json",
+                graph_file="test_graph_json.graphml",
+                log_level="INFO",
+            ),
+            "save_to_json",
+            "save_to_csv",
+            id="json",
+        ),
+    ],
+)
+async def test_main_basic_query_output(main_mocks, output_args, saved_with, not_saved_with):
+    """Test the main function with a basic query, saving results as CSV or JSON."""
+    # 1. Simulate command line arguments; parse_args is mocked, so only the Namespace below matters
+    test_argv = ["main.py", "test query"]
+    mock_args = make_args(query="test query", num_results=7, **output_args)
+
+    # 2. Patch argument parsing; main's collaborators are patched by main_mocks
     with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser.parse_args", return_value=mock_args) as mock_parse_args,
-        patch("google_scholar_scraper.main.ProxyManager") as MockProxyManager,
-        patch("google_scholar_scraper.main.Fetcher") as MockFetcher,
-        patch("google_scholar_scraper.main.DataHandler") as MockDataHandler,
-        patch("google_scholar_scraper.main.GraphBuilder") as MockGraphBuilder,
-        patch("google_scholar_scraper.main.os.makedirs") as mock_os_makedirs,
-        patch("google_scholar_scraper.main.logging.basicConfig") as mock_logging_config,
+        patch.object(sys, "argv", test_argv),
+        patch.object(argparse.ArgumentParser, "parse_args", return_value=mock_args) as mock_parse_args,
     ):
         # Configure instances returned by constructors
-        mock_proxy_manager_instance = MockProxyManager.return_value
-        mock_proxy_manager_instance.get_working_proxies = AsyncMock()  # Succeeds by default
-        mock_proxy_manager_instance.log_proxy_performance = MagicMock()
-
-        mock_fetcher_instance = MockFetcher.return_value
-        mock_fetcher_instance.scrape = AsyncMock(return_value=[{"title": "Result 1"}])  # Dummy results
-        mock_fetcher_instance.close = AsyncMock()
-
-        mock_data_handler_instance = MockDataHandler.return_value
-        mock_data_handler_instance.create_table = AsyncMock()
-        mock_data_handler_instance.save_to_csv = MagicMock()
-        mock_data_handler_instance.save_to_json = MagicMock()  # For completeness
-
-        mock_graph_builder_instance = MockGraphBuilder.return_value
-        mock_graph_builder_instance.graph = MagicMock()  # Mock the graph attribute
-        mock_graph_builder_instance.graph.number_of_nodes.return_value = 1
-        mock_graph_builder_instance.graph.number_of_edges.return_value = 0
-        mock_graph_builder_instance.save_graph = MagicMock()
-        mock_graph_builder_instance.generate_default_visualizations = MagicMock()
-
-        # 4. Run the main function
-        await async_main_entry()
-
-        # 5. Assertions
-        mock_parse_args.assert_called_once()
-
-        MockProxyManager.assert_called_once()
-        mock_proxy_manager_instance.get_working_proxies.assert_called_once()
-
-        MockFetcher.assert_called_once_with(proxy_manager=mock_proxy_manager_instance)
-
-        MockDataHandler.assert_called_once()
-        mock_data_handler_instance.create_table.assert_called_once()
-
-        MockGraphBuilder.assert_called_once()
-
-        mock_os_makedirs.assert_called_once_with(mock_args.pdf_dir, exist_ok=True)
-        mock_logging_config.assert_called_once()
-        # Check if log level was set (more complex, check call_args of basicConfig)
-        assert mock_logging_config.call_args.kwargs["level"] == "ERROR"
-
-        mock_fetcher_instance.scrape.assert_called_once_with(
-            mock_args.query,
-            mock_args.authors,
-            mock_args.publication,
-            mock_args.year_low,
-            mock_args.year_high,
-            mock_args.num_results,
-            mock_args.pdf_dir,
-            mock_args.max_depth,
-            mock_graph_builder_instance,
-            mock_data_handler_instance,
-            phrase=mock_args.phrase,
-            exclude=mock_args.exclude,
-            title=mock_args.title,
-            author=mock_args.author,
-            source=mock_args.source,
-        )
-
-        mock_data_handler_instance.save_to_csv.assert_called_once_with(
-            mock_fetcher_instance.scrape.return_value,  # results
-            mock_args.output,
-        )
-        mock_data_handler_instance.save_to_json.assert_not_called()
-
-        mock_graph_builder_instance.save_graph.assert_called_once_with(mock_args.graph_file)
-        mock_graph_builder_instance.generate_default_visualizations.assert_called_once_with(
-            base_filename=mock_args.graph_file.replace(".graphml", "")
-        )
-
-        mock_fetcher_instance.close.assert_called_once()
-        mock_proxy_manager_instance.log_proxy_performance.assert_called_once()
+        mock_proxy_manager_instance = main_mocks.proxy.return_value
 
+        mock_fetcher_instance = main_mocks.fetcher.return_value
+        mock_fetcher_instance.scrape = MagicMock(return_value=_resolved(_DUMMY_RESULTS))
 
-@pytest.mark.asyncio
-async def test_main_basic_query_json_output():
-    """Test the main function with a basic query and JSON output."""
-    test_argv = [
-        "main.py",
-        "json query",
-        "--num_results",
-        "3",
-        "--output",
-        "test_output.json",
-        "--json",  # Specify JSON output
-        "--pdf_dir",
-        "test_pdfs_json",
-        "--graph_file",
-        "test_graph_json.graphml",
-        "--log_level",
-        "INFO",
-    ]
-
-    mock_args = argparse.Namespace(
-        query="json query",
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=3,
-        output="test_output.json",
-        json=True,  # JSON flag is true
-        pdf_dir="test_pdfs_json",
-        max_depth=3,
-        graph_file="test_graph_json.graphml",
-        log_level="INFO",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,
-        source=None,
-        min_citations=None,
-        author_profile=None,
-        recursive=False,
-        graph_layout="spring",
-        centrality_filter=None,
-    )
+        mock_data_handler_instance = main_mocks.data.return_value
 
-    with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser.parse_args", return_value=mock_args) as mock_parse_args,
-        patch("google_scholar_scraper.main.ProxyManager") as MockProxyManager,
-        patch("google_scholar_scraper.main.Fetcher") as MockFetcher,
-        patch("google_scholar_scraper.main.DataHandler") as MockDataHandler,
-        patch("google_scholar_scraper.main.GraphBuilder") as MockGraphBuilder,
-        patch("google_scholar_scraper.main.os.makedirs") as mock_os_makedirs,
-        patch("google_scholar_scraper.main.logging.basicConfig") as mock_logging_config,
-    ):
-        mock_proxy_manager_instance = MockProxyManager.return_value
-        mock_proxy_manager_instance.get_working_proxies = AsyncMock()
-        mock_proxy_manager_instance.log_proxy_performance = MagicMock()
-
-        mock_fetcher_instance = MockFetcher.return_value
-        mock_fetcher_instance.scrape = AsyncMock(return_value=[{"title": "JSON Result"}])
-        mock_fetcher_instance.close = AsyncMock()
-
-        mock_data_handler_instance = MockDataHandler.return_value
-        mock_data_handler_instance.create_table = AsyncMock()
-        mock_data_handler_instance.save_to_csv = MagicMock()
-        mock_data_handler_instance.save_to_json = MagicMock()
-
-        mock_graph_builder_instance = MockGraphBuilder.return_value
-        mock_graph_builder_instance.graph = MagicMock()
-        mock_graph_builder_instance.graph.number_of_nodes.return_value = 1
-        mock_graph_builder_instance.graph.number_of_edges.return_value = 0
-        mock_graph_builder_instance.save_graph = MagicMock()
-        mock_graph_builder_instance.generate_default_visualizations = MagicMock()
+        mock_graph_builder_instance = main_mocks.graph.return_value
 
+        # 3. Run the main function
         await async_main_entry()
 
+        # 4. Assertions
         mock_parse_args.assert_called_once()
-        MockProxyManager.assert_called_once()
-        mock_proxy_manager_instance.get_working_proxies.assert_called_once()
-        MockFetcher.assert_called_once_with(proxy_manager=mock_proxy_manager_instance)
-        MockDataHandler.assert_called_once()
-        mock_data_handler_instance.create_table.assert_called_once()
-        MockGraphBuilder.assert_called_once()
-        mock_os_makedirs.assert_called_once_with(mock_args.pdf_dir, exist_ok=True)
-        assert mock_logging_config.call_args.kwargs["level"] == "INFO"
-
-        mock_fetcher_instance.scrape.assert_called_once_with(
-            mock_args.query,
-            mock_args.authors,
-            mock_args.publication,
-            mock_args.year_low,
-            mock_args.year_high,
-            mock_args.num_results,
-            mock_args.pdf_dir,
-            mock_args.max_depth,
-            mock_graph_builder_instance,
-            mock_data_handler_instance,
-            phrase=mock_args.phrase,
-            exclude=mock_args.exclude,
-            title=mock_args.title,
-            author=mock_args.author,
-            source=mock_args.source,
-        )
 
-        # Assert JSON save was called and CSV was not
-        mock_data_handler_instance.save_to_json.assert_called_once_with(
-            mock_fetcher_instance.scrape.return_value,  # results
-            mock_args.output,
-        )
-        mock_data_handler_instance.save_to_csv.assert_not_called()
+        _assert_main_setup(main_mocks, mock_args)
+
+        assert mock_fetcher_instance.scrape.call_args_list == [
+            _expected_scrape_call(mock_args, mock_graph_builder_instance, mock_data_handler_instance)
+        ]
+
+        # Results are saved in the requested format only
+        save_method = getattr(mock_data_handler_instance, saved_with)
+        save_method.assert_called_once_with(_DUMMY_RESULTS, mock_args.output)
+        assert save_method.call_args.args[0] is _DUMMY_RESULTS  # Unfiltered without --min_citations
+        getattr(mock_data_handler_instance, not_saved_with).assert_not_called()
 
         mock_graph_builder_instance.save_graph.assert_called_once_with(mock_args.graph_file)
         mock_graph_builder_instance.generate_default_visualizations.assert_called_once_with(
@@ -260,101 +220,63 @@ async def test_main_basic_query_json_output():
         mock_proxy_manager_instance.log_proxy_performance.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_main_author_profile_scraping_json_output():
-    """Test main function for author profile scraping with JSON output."""
-    test_argv = [
-        "main.py",
-        "--author_profile",
-        "test_author_id",
-        "--output",
-        "author_output.json",
-        "--json",
-        "--pdf_dir",
-        "author_pdfs",  # Still need pdf_dir for os.makedirs
-        "--log_level",
-        "DEBUG",
-    ]
-
-    mock_args = argparse.Namespace(
-        query=None,  # No query when author_profile is set
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=10,  # Default, not used for author profile directly
+@pytest.mark.parametrize("recursive", [pytest.param(False, id="profile_only"), pytest.param(True, id="recursive")])
+async def test_main_author_profile_scraping_json_output(main_mocks, monkeypatch, recursive):
+    """Test main function for author profile scraping with JSON output, with and without --recursive."""
+    test_argv = ["main.py", "--author_profile", "test_author_id"]  # parse_args is mocked
+    mock_args = make_args(
+        author_profile="test_author_id",  # No query when author_profile is set
+        recursive=recursive,
         output="author_output.json",
         json=True,
-        pdf_dir="author_pdfs",
-        max_depth=3,  # Default, not used for non-recursive author profile
-        graph_file="citation_graph.graphml",  # Default, not used here
-        log_level="DEBUG",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,
-        source=None,
-        min_citations=None,
-        author_profile="test_author_id",
-        recursive=False,  # Not recursive for this test
-        graph_layout="spring",  # Default, not used here
-        centrality_filter=None,  # Default, not used here
+        pdf_dir="author_pdfs",  # Still need pdf_dir for os.makedirs
     )
 
-    dummy_author_data = {"name": "Test Author", "publications": [{"title": "Pub1"}]}
+    # Polite delays are recorded instead of slept; a plain coroutine function skips mock call bookkeeping
+    sleep_delays = []
+
+    async def fake_sleep(delay, *args, **kwargs):
+        sleep_delays.append(delay)
+
+    monkeypatch.setattr(main_module.asyncio, "sleep", fake_sleep)
 
     with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser.parse_args", return_value=mock_args) as mock_parse_args,
-        patch("google_scholar_scraper.main.ProxyManager") as MockProxyManager,
-        patch("google_scholar_scraper.main.Fetcher") as MockFetcher,
-        patch("google_scholar_scraper.main.DataHandler") as MockDataHandler,
-        patch("google_scholar_scraper.main.GraphBuilder") as MockGraphBuilder,
-        patch("google_scholar_scraper.main.os.makedirs") as mock_os_makedirs,
-        patch("google_scholar_scraper.main.logging.basicConfig") as mock_logging_config,
-        patch("google_scholar_scraper.main.pd.DataFrame") as MockDataFrame,
-    ):  # For CSV path if json=False
-        mock_proxy_manager_instance = MockProxyManager.return_value
-        mock_proxy_manager_instance.get_working_proxies = AsyncMock()
-        mock_proxy_manager_instance.log_proxy_performance = MagicMock()
-
-        mock_fetcher_instance = MockFetcher.return_value
-        mock_fetcher_instance.fetch_author_profile = AsyncMock(return_value=dummy_author_data)
-        mock_fetcher_instance.scrape_publication_details = AsyncMock()  # Should not be called
-        mock_fetcher_instance.scrape = AsyncMock()  # Should not be called
-        mock_fetcher_instance.close = AsyncMock()
-
-        mock_data_handler_instance = MockDataHandler.return_value
-        mock_data_handler_instance.create_table = AsyncMock()
-        mock_data_handler_instance.save_to_json = MagicMock()
-        mock_data_handler_instance.save_to_csv = MagicMock()  # For pd.DataFrame().to_csv
+        patch.object(sys, "argv", test_argv),
+        patch.object(argparse.ArgumentParser, "parse_args", return_value=mock_args) as mock_parse_args,
+        patch.object(main_module, "tqdm", side_effect=lambda x, **kwargs: x),  # Pass iterables through
+    ):
+        mock_proxy_manager_instance = main_mocks.proxy.return_value
+
+        mock_fetcher_instance = main_mocks.fetcher.return_value
+        mock_fetcher_instance.fetch_author_profile = MagicMock(return_value=_resolved(_DUMMY_AUTHOR_DATA))
+        mock_fetcher_instance.scrape_publication_details = MagicMock(side_effect=[_resolved(d) for d in _PUB_DETAILS])
+
+        mock_data_handler_instance = main_mocks.data.return_value
 
         # GraphBuilder is instantiated but not used for graph saving/viz in this path
-        mock_graph_builder_instance = MockGraphBuilder.return_value
-        mock_graph_builder_instance.save_graph = MagicMock()
-        mock_graph_builder_instance.generate_default_visualizations = MagicMock()
+        mock_graph_builder_instance = main_mocks.graph.return_value
 
         await async_main_entry()
 
         mock_parse_args.assert_called_once()
-        MockProxyManager.assert_called_once()
-        mock_proxy_manager_instance.get_working_proxies.assert_called_once()
-        MockFetcher.assert_called_once_with(proxy_manager=mock_proxy_manager_instance)
-        MockDataHandler.assert_called_once()
-        mock_data_handler_instance.create_table.assert_called_once()
-        MockGraphBuilder.assert_called_once()  # Instantiated
-        mock_os_makedirs.assert_called_once_with(mock_args.pdf_dir, exist_ok=True)
-        assert mock_logging_config.call_args.kwargs["level"] == "DEBUG"
+        _assert_main_setup(main_mocks, mock_args)
 
         mock_fetcher_instance.fetch_author_profile.assert_called_once_with(mock_args.author_profile)
         mock_fetcher_instance.scrape.assert_not_called()
-        mock_fetcher_instance.scrape_publication_details.assert_not_called()
 
-        mock_data_handler_instance.save_to_json.assert_called_once_with(dummy_author_data, mock_args.output)
+        # The profile is always saved; --recursive adds one details lookup per publication and a second file
+        expected_detail_calls = [call(pub["link"]) for pub in _AUTHOR_PUBS] if recursive else []
+        expected_json_calls = [call(_DUMMY_AUTHOR_DATA, mock_args.output)]
+        if recursive:
+            expected_json_calls.append(call(_PUB_DETAILS[0] + _PUB_DETAILS[1], "recursive_" + mock_args.output))
+        assert mock_fetcher_instance.scrape_publication_details.call_args_list == expected_detail_calls
+        assert mock_data_handler_instance.save_to_json.call_args_list == expected_json_calls
+        assert len(sleep_delays) == len(expected_detail_calls)  # Polite delay called per pub
+        assert all(1 <= delay <= 2 for delay in sleep_delays)
+
         mock_data_handler_instance.save_to_csv.assert_not_called()
-        MockDataFrame.assert_not_called()  # Should not be called if json=True
 
-        # Graph operations should not be called for non-recursive author profile
+        # Graph operations are not part of author profile scraping
         mock_graph_builder_instance.save_graph.assert_not_called()
         mock_graph_builder_instance.generate_default_visualizations.assert_not_called()
 
@@ -362,169 +284,43 @@ async def test_main_author_profile_scraping_json_output():
         mock_proxy_manager_instance.log_proxy_performance.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_main_author_profile_recursive_scraping_json_output():
-    """Test main function for recursive author profile scraping with JSON output."""
-    test_argv = [
-        "main.py",
-        "--author_profile",
-        "recursive_author_id",
-        "--recursive",  # Recursive flag
-        "--output",
-        "recursive_author_output.json",
-        "--json",
-        "--pdf_dir",
-        "recursive_pdfs",
-        "--log_level",
-        "INFO",
-    ]
-
-    mock_args = argparse.Namespace(
-        query=None,
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=10,
-        output="recursive_author_output.json",
-        json=True,
-        pdf_dir="recursive_pdfs",
-        max_depth=3,
-        graph_file="citation_graph.graphml",
-        log_level="INFO",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,
-        source=None,
-        min_citations=None,
-        author_profile="recursive_author_id",
-        recursive=True,  # Recursive is true
-        graph_layout="spring",
-        centrality_filter=None,
+def _invalid_args(**invalid):
+    """
+    Valid validation-test arguments with the given fields overridden.
+    The base has a query, so no case trips the query/--author_profile check before the validation under test.
+    """
+    return make_args(
+        **{
+            "query": "default_query_for_validation",
+            "output": "val_output.csv",
+            "pdf_dir": "val_pdfs",
+            "graph_file": "val_graph.graphml",
+            "log_level": "INFO",
+            **invalid,
+        }
     )
 
-    author_pubs = [{"title": "Pub1", "link": "link_to_pub1"}, {"title": "Pub2", "link": "link_to_pub2"}]
-    dummy_author_data = {"name": "Recursive Author", "publications": author_pubs}
-    dummy_pub1_details = [{"detail_title": "Detail Pub1"}]
-    dummy_pub2_details = [{"detail_title": "Detail Pub2"}]
-
-    # Configure side_effect for scrape_publication_details to return different details per call
-    # This matches the number of publications in author_pubs
-    scrape_details_side_effect = [dummy_pub1_details, dummy_pub2_details]
-
-    with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser.parse_args", return_value=mock_args) as mock_parse_args,
-        patch("google_scholar_scraper.main.ProxyManager") as MockProxyManager,
-        patch("google_scholar_scraper.main.Fetcher") as MockFetcher,
-        patch("google_scholar_scraper.main.DataHandler") as MockDataHandler,
-        patch("google_scholar_scraper.main.GraphBuilder") as MockGraphBuilder,
-        patch("google_scholar_scraper.main.os.makedirs") as mock_os_makedirs,
-        patch("google_scholar_scraper.main.logging.basicConfig") as mock_logging_config,
-        patch("google_scholar_scraper.main.pd.DataFrame") as MockDataFrame,
-        patch("google_scholar_scraper.main.asyncio.sleep", new_callable=AsyncMock) as mock_async_sleep,
-        patch("google_scholar_scraper.main.tqdm", side_effect=lambda x, **kwargs: x) as mock_tqdm,
-    ):  # Mock tqdm to pass through iterables
-        mock_proxy_manager_instance = MockProxyManager.return_value
-        mock_proxy_manager_instance.get_working_proxies = AsyncMock()
-        mock_proxy_manager_instance.log_proxy_performance = MagicMock()
-
-        mock_fetcher_instance = MockFetcher.return_value
-        mock_fetcher_instance.fetch_author_profile = AsyncMock(return_value=dummy_author_data)
-        mock_fetcher_instance.scrape_publication_details = AsyncMock(side_effect=scrape_details_side_effect)
-        mock_fetcher_instance.scrape = AsyncMock()  # Should not be called
-        mock_fetcher_instance.close = AsyncMock()
-
-        mock_data_handler_instance = MockDataHandler.return_value
-        mock_data_handler_instance.create_table = AsyncMock()
-        mock_data_handler_instance.save_to_json = MagicMock()
-
-        mock_graph_builder_instance = MockGraphBuilder.return_value  # Instantiated but not used
-
-        await async_main_entry()
-
-        mock_parse_args.assert_called_once()
-        mock_proxy_manager_instance.get_working_proxies.assert_called_once()
-        mock_fetcher_instance.fetch_author_profile.assert_called_once_with(mock_args.author_profile)
-
-        # Check calls to scrape_publication_details
-        assert mock_fetcher_instance.scrape_publication_details.call_count == len(author_pubs)
-        mock_fetcher_instance.scrape_publication_details.assert_any_call(author_pubs[0]["link"])
-        mock_fetcher_instance.scrape_publication_details.assert_any_call(author_pubs[1]["link"])
-
-        # Check calls to save_to_json (once for author, once for recursive results)
-        assert mock_data_handler_instance.save_to_json.call_count == 2
-        expected_recursive_results = dummy_pub1_details + dummy_pub2_details
-
-        # Check the first call (author profile)
-        mock_data_handler_instance.save_to_json.assert_any_call(dummy_author_data, mock_args.output)
-        # Check the second call (recursive results)
-        mock_data_handler_instance.save_to_json.assert_any_call(expected_recursive_results, "recursive_" + mock_args.output)
 
-        mock_fetcher_instance.scrape.assert_not_called()
-        mock_graph_builder_instance.save_graph.assert_not_called()  # Graph ops not for author profile
-        mock_graph_builder_instance.generate_default_visualizations.assert_not_called()
-
-        assert mock_async_sleep.call_count == len(author_pubs)  # Polite delay called per pub
-
-        mock_fetcher_instance.close.assert_called_once()
-        mock_proxy_manager_instance.log_proxy_performance.assert_called_once()
-
-
-# Test cases for input validation errors
+# Test cases for input validation errors, built once at import time
 validation_error_cases = [
-    # (dict_of_args_to_set_on_mock_args, expected_error_message_substring)
-    ({"query": None, "author_profile": None}, "Either a query or --author_profile must be provided"),
-    ({"num_results": 0}, "--num_results must be a positive integer"),
-    ({"num_results": -1}, "--num_results must be a positive integer"),
-    ({"max_depth": -1}, "--max_depth cannot be negative"),
-    ({"year_low": 900}, "--year_low must be a valid year"),
-    ({"year_low": 2200}, "--year_low must be a valid year"),
-    ({"year_high": 900}, "--year_high must be a valid year"),
-    ({"year_high": 2200}, "--year_high must be a valid year"),
-    ({"centrality_filter": -0.1}, "--centrality_filter must be a non-negative value"),
+    # (namespace_returned_by_parse_args, expected_error_message_substring)
+    (_invalid_args(query=None, author_profile=None), "Either a query or --author_profile must be provided"),
+    (_invalid_args(num_results=0), "--num_results (derived or direct) must be a positive integer"),
+    (_invalid_args(num_results=-1), "--num_results (derived or direct) must be a positive integer"),
+    (_invalid_args(max_depth=-1), "--max_depth cannot be negative"),
+    (_invalid_args(year_low=900), "--year_low must be a valid year"),
+    (_invalid_args(year_low=2200), "--year_low must be a valid year"),
+    (_invalid_args(year_high=900), "--year_high must be a valid year"),
+    (_invalid_args(year_high=2200), "--year_high must be a valid year"),
+    (_invalid_args(centrality_filter=-0.1), "--centrality_filter must be a non-negative value"),
 ]
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("args_to_set, expected_error_substring", validation_error_cases)
-async def test_main_input_validation_errors(args_to_set, expected_error_substring):
+@pytest.mark.parametrize("mock_args, expected_error_substring", validation_error_cases)
+async def test_main_input_validation_errors(main_mocks, mock_args, expected_error_substring):
     """Test input validation errors in the main function."""
     test_argv = ["main.py", "some_default_query"]  # Basic argv, parse_args is mocked
 
-    # Base mock_args, will be updated by args_to_set
-    # Ensure one of query or author_profile is initially valid to avoid premature error
-    # before the specific validation under test.
-    base_mock_args = argparse.Namespace(
-        query="default_query_for_validation",
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=10,
-        output="val_output.csv",
-        json=False,
-        pdf_dir="val_pdfs",
-        max_depth=3,
-        graph_file="val_graph.graphml",
-        log_level="INFO",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,
-        source=None,
-        min_citations=None,
-        author_profile=None,
-        recursive=False,
-        graph_layout="spring",
-        centrality_filter=None,
-    )
-
-    # Update mock_args with the specific invalid values for this test case
-    for key, value in args_to_set.items():
-        setattr(base_mock_args, key, value)
-
     # Mock the ArgumentParser instance itself to control its 'error' method
     mock_parser_instance = MagicMock(spec=argparse.ArgumentParser)
     # When parser.error is called, it should raise SystemExit. We'll check its call.
@@ -533,20 +329,14 @@ async def test_main_input_validation_errors(args_to_set, expected_error_substrin
     mock_parser_instance.error = MagicMock(side_effect=SystemExit(2))
 
     # Patch sys.argv, and ArgumentParser to return our mock_parser_instance,
-    # and parse_args on that instance to return our specifically crafted base_mock_args.
+    # and parse_args on that instance to return this case's prebuilt mock_args.
     # Other components are patched to avoid side effects, though they might not be reached.
     with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser", return_value=mock_parser_instance) as MockArgumentParserClass,
-        patch("google_scholar_scraper.main.ProxyManager"),
-        patch("google_scholar_scraper.main.Fetcher"),
-        patch("google_scholar_scraper.main.DataHandler"),
-        patch("google_scholar_scraper.main.GraphBuilder"),
-        patch("google_scholar_scraper.main.os.makedirs"),
-        patch("google_scholar_scraper.main.logging.basicConfig"),
+        patch.object(sys, "argv", test_argv),
+        patch.object(argparse, "ArgumentParser", return_value=mock_parser_instance) as MockArgumentParserClass,
     ):
         # Configure the mock_parser_instance's parse_args method
-        mock_parser_instance.parse_args.return_value = base_mock_args
+        mock_parser_instance.parse_args.return_value = mock_args
 
         with pytest.raises(SystemExit) as e:
             await async_main_entry()
@@ -562,62 +352,33 @@ async def test_main_input_validation_errors(args_to_set, expected_error_substrin
         MockArgumentParserClass.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_main_no_proxies_available():
+async def test_main_no_proxies_available(main_mocks):
     """Test main function when NoProxiesAvailable is raised."""
     test_argv = ["main.py", "query_when_no_proxies"]  # Basic valid args
-    mock_args = argparse.Namespace(
+    mock_args = make_args(
         query="query_when_no_proxies",
-        authors=None,
-        publication=None,
-        year_low=None,
-        year_high=None,
-        num_results=10,
         output="no_proxy_out.csv",
-        json=False,
         pdf_dir="no_proxy_pdfs",
-        max_depth=3,
         graph_file="no_proxy_graph.graphml",
         log_level="INFO",
-        phrase=None,
-        exclude=None,
-        title=None,
-        author=None,
-        source=None,
-        min_citations=None,
-        author_profile=None,
-        recursive=False,
-        graph_layout="spring",
-        centrality_filter=None,
     )
 
     with (
-        patch("sys.argv", test_argv),
-        patch("argparse.ArgumentParser.parse_args", return_value=mock_args),
-        patch("google_scholar_scraper.main.ProxyManager") as MockProxyManager,
-        patch("google_scholar_scraper.main.Fetcher") as MockFetcher,
-        patch("google_scholar_scraper.main.DataHandler") as MockDataHandler,
-        patch("google_scholar_scraper.main.GraphBuilder") as MockGraphBuilder,
-        patch("google_scholar_scraper.main.os.makedirs"),
-        patch("google_scholar_scraper.main.logging.basicConfig"),
-        patch("google_scholar_scraper.main.logging.error") as mock_logging_error,
+        patch.object(sys, "argv", test_argv),
+        patch.object(argparse.ArgumentParser, "parse_args", return_value=mock_args),
+        patch.object(main_module.logging, "error") as mock_logging_error,
     ):  # Patch logging.error
-        mock_proxy_manager_instance = MockProxyManager.return_value
+        mock_proxy_manager_instance = main_mocks.proxy.return_value
         # Configure get_working_proxies to raise NoProxiesAvailable
         mock_proxy_manager_instance.get_working_proxies = AsyncMock(side_effect=NoProxiesAvailable("Test no proxies"))
-        mock_proxy_manager_instance.log_proxy_performance = MagicMock()
 
-        mock_fetcher_instance = MockFetcher.return_value
-        mock_fetcher_instance.scrape = AsyncMock()  # Should not be called if proxies fail
-        mock_fetcher_instance.fetch_author_profile = AsyncMock()  # Should not be called
-        mock_fetcher_instance.close = AsyncMock()
+        mock_fetcher_instance = main_mocks.fetcher.return_value
 
-        mock_data_handler_instance = MockDataHandler.return_value
-        mock_data_handler_instance.create_table = AsyncMock()  # Called before proxy check
+        mock_data_handler_instance = main_mocks.data.return_value
 
         await async_main_entry()
 
-        MockProxyManager.assert_called_once()
+        main_mocks.proxy.assert_called_once()
         mock_proxy_manager_instance.get_working_proxies.assert_called_once()
 
         # Assert logging.error was called due to NoProxiesAvailable
@@ -630,7 +391,27 @@ async def test_main_no_proxies_available():
 
         # Assert that cleanup in finally block still happens
         mock_fetcher_instance.close.assert_called_once()
+        mock_data_handler_instance.close.assert_called_once()
         mock_proxy_manager_instance.log_proxy_performance.assert_called_once()
 
         # DataHandler.create_table is called before proxy check, so it should be called
         mock_data_handler_instance.create_table.assert_called_once()
+
+
+async def test_main_closes_database_when_create_table_fails(main_mocks):
+    """Test that a database error while preparing the table is reported and the connection still closed."""
+    mock_args = make_args(query="query_with_broken_db", log_level="INFO")
+    main_mocks.data.return_value.create_table = AsyncMock(side_effect=sqlite3.OperationalError("disk I/O error"))
+
+    with (
+        patch.object(sys, "argv", ["main.py", "query_with_broken_db"]),
+        patch.object(argparse.ArgumentParser, "parse_args", return_value=mock_args),
+        patch.object(main_module.logging, "critical") as mock_logging_critical,
+    ):
+        await async_main_entry()
+
+    mock_logging_critical.assert_called_once()
+    main_mocks.proxy.return_value.get_working_proxies.assert_not_called()
+    main_mocks.fetcher.return_value.scrape.assert_not_called()
+    main_mocks.data.return_value.close.assert_called_once()
+    main_mocks.fetcher.return_value.close.assert_called_once()
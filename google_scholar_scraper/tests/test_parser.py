@@ -2,301 +2,101 @@
 Tests for the Parser module.
 """
 
+import functools
+import logging
 import unittest
+from pathlib import Path
+from typing import Optional
+
+from parsel import Selector, SelectorList
 
 from google_scholar_scraper.parser import Parser
 
 
+# Resolved once at import, independent of the directory pytest is run from
+_DATA_DIR = Path(__file__).resolve().parent / "data"
+_FIXTURE_DIR = _DATA_DIR / "fixtures"
+_SAMPLE_HTML_PATH = _DATA_DIR / "algorithmic trading strategies cryptocurrency - Google Scholar.html"
+
+
+@functools.lru_cache(maxsize=None)
+def _fixture(name: str) -> str:
+    """Returns the small hand-written HTML snippet tests/data/fixtures/<name>.html, read once per process."""
+    return (_FIXTURE_DIR / f"{name}.html").read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_sample_html() -> Optional[str]:
+    """Reads the real Google Scholar results page once per process, or returns None if it is missing."""
+    try:
+        return _SAMPLE_HTML_PATH.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None  # Tests needing the real page skip themselves
+
+
 class TestParser(unittest.TestCase):
     """Test cases for Parser class"""
 
-    def setUp(self):
-        """Set up test environment"""
-        self.parser = Parser()
-        # Configure logger for parser instance to see debug messages
-        import logging
-        # Ensure the specific logger used by the Parser class is set to INFO or DEBUG
-        # Assuming the Parser class uses logging.getLogger(__name__) where __name__ is 'google_scholar_scraper.parser'
-        # or if it's just self.logger = logging.getLogger('some_name')
-        # For simplicity, let's try to get the root logger or a specific one if known.
-        # If parser.py uses logging.getLogger(__name__), its name will be based on its module path.
-        # Let's assume it's 'google_scholar_scraper.google_scholar_scraper.parser' or similar.
-        # A more direct way is to access self.parser.logger if it's public.
-        # For now, let's try setting the level on the logger instance directly if accessible,
-        # or configure a handler for the root logger for tests.
-
-        # Simplest approach: if self.parser.logger is accessible and standard
-        if hasattr(self.parser, "logger"):
-            self.parser.logger.setLevel(logging.INFO)
-            # Add a handler if it doesn't have one that outputs to console for tests
-            if not any(isinstance(h, logging.StreamHandler) for h in self.parser.logger.handlers):
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(logging.INFO)
-                formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-                console_handler.setFormatter(formatter)
-                self.parser.logger.addHandler(console_handler)
-                self.parser.logger.propagate = False  # Prevent duplicate messages if root logger also has a handler
+    @classmethod
+    def setUpClass(cls):
+        """Set up the immutable sample HTML once for the whole class"""
+        cls.parser = Parser()
 
-        # Load the real HTML sample file
-        real_html_file_path = (
-            "google_scholar_scraper/tests/data/algorithmic trading strategies cryptocurrency - Google Scholar.html"
-        )
-        # This assumes the test is run from the root of the google_scholar_research_tool project,
-        # or that the path is relative to where pytest is invoked.
-        # For robustness if running tests from `google_scholar_scraper` dir:
-        import os
-
-        # Correct path assuming tests are run from `google_scholar_scraper` directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Should be google_scholar_research_tool
-        # Path relative to the workspace root
-        actual_path = os.path.join(
-            os.path.dirname(__file__), "data", "algorithmic trading strategies cryptocurrency - Google Scholar.html"
-        )
-
-        try:
-            with open(actual_path, "r", encoding="utf-8") as f:
-                self.real_search_html_content = f.read()
-        except FileNotFoundError:
-            # Fallback for cases where the path might be interpreted differently
-            # This might happen if tests are run from a different CWD.
-            # A more robust solution would use fixtures or a known base path.
-            try:
-                alt_path = os.path.join(
-                    os.getcwd(), "tests", "data", "algorithmic trading strategies cryptocurrency - Google Scholar.html"
-                )
-                if os.path.exists(alt_path):
-                    with open(alt_path, "r", encoding="utf-8") as f:
-                        self.real_search_html_content = f.read()
-                else:  # Try one level up if in google_scholar_scraper/tests
-                    alt_path_2 = os.path.join(
-                        os.path.dirname(os.getcwd()),
-                        "tests",
-                        "data",
-                        "algorithmic trading strategies cryptocurrency - Google Scholar.html",
-                    )
-                    if os.path.exists(alt_path_2):
-                        with open(alt_path_2, "r", encoding="utf-8") as f:
-                            self.real_search_html_content = f.read()
-                    else:
-                        self.real_search_html_content = (
-                            "<html><body><p>Real HTML file not found for tests.</p></body></html>"  # Placeholder
-                        )
-                        print(
-                            f"Warning: Real HTML sample file not found at expected paths: {actual_path}, {alt_path}, {alt_path_2}"
-                        )
-
-            except FileNotFoundError:
-                self.real_search_html_content = (
-                    "<html><body><p>Real HTML file not found for tests.</p></body></html>"  # Placeholder
-                )
-                print("Warning: Real HTML sample file not found at expected paths after trying alternatives.")
+        cls.real_search_html_content = _load_sample_html()
 
         # Sample HTML snippets for testing
-        self.sample_item_html = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper">Test Paper Title</a></h3>
-            <div class="gs_a">A Author, B Author - Journal of Testing, 2023</div>
-            <div class="gs_rs">This is a test snippet of the paper abstract...</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=123456789">Cited by 42</a>
-                <a href="/scholar?related=123456789">Related articles</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_no_snippet = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper_no_snippet">No Snippet Paper</a></h3>
-            <div class="gs_a">C Author - Journal of No Snippets, 2024</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=98765">Cited by 10</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_no_related_url = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper_no_related">No Related URL Paper</a></h3>
-            <div class="gs_a">D Author - Journal of No Related, 2024</div>
-            <div class="gs_rs">Snippet for no related.</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=112233">Cited by 5</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_no_article_url = """
-        <div class="gs_ri">
-            <h3 class="gs_rt">Title Not A Link Paper</h3>
-            <div class="gs_a">E Author - Journal of No Links, 2024</div>
-            <div class="gs_rs">Snippet for no article link.</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=445566">Cited by 2</a>
-                <a href="/scholar?related=445566">Related articles</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_with_doi = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper_with_doi">Paper With DOI</a></h3>
-            <div class="gs_a">F Author - Journal of DOIs, 2023</div>
-            <div class="gs_rs">This paper proudly presents a DOI.</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=778899">Cited by 100</a>
-            </div>
-            <div class="gs_or_ggsm">
-                <a href="https://doi.org/10.1234/example.doi">Full Text at doi.org</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_no_doi = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper_no_doi">Paper Without DOI</a></h3>
-            <div class="gs_a">G Author - Journal of No DOIs, 2023</div>
-            <div class="gs_rs">This paper does not have a DOI link.</div>
-            <div class="gs_fl">
-                <a href="/scholar?cites=101010">Cited by 20</a>
-            </div>
-        </div>
-        """
-        self.sample_item_html_no_title = """
-        <div class="gs_ri">
-            <!-- No h3.gs_rt here -->
-            <div class="gs_a">H Author - Journal of No Titles, 2023</div>
-        </div>
-        """
-        self.sample_item_html_special_chars_title = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/special">Title with &lt;Special&gt; &amp; "Chars"</a></h3>
-            <div class="gs_a">I Author - Journal of Special Chars, 2023</div>
-        </div>
-        """
-        self.sample_item_html_title_not_linked = """
-        <div class="gs_ri">
-            <h3 class="gs_rt">Unlinked Title with Text</h3>
-            <div class="gs_a">J Author - Journal of Unlinked Titles, 2023</div>
-        </div>
-        """
-        self.sample_item_html_single_author = """
-        <div class="gs_ri">
-            <div class="gs_a">K. SingleAuthor - Lone Journal, 2023</div>
-        </div>
-        """
-        self.sample_item_html_authors_et_al = """
-        <div class="gs_ri">
-            <div class="gs_a">L. Author, M. Author... - Many Hands Journal, 2023</div>
-        </div>
-        """
-        self.sample_item_html_authors_ellipsis_char = """
-        <div class="gs_ri">
-            <div class="gs_a">N. Author, O. Author, ΓÇª - Another Journal, 2023</div>
-        </div>
-        """
-        self.sample_item_html_no_authors_tag = """
-        <div class="gs_ri">
-            <!-- No gs_a div -->
-        </div>
-        """
-        self.sample_item_html_empty_authors_tag = """
-        <div class="gs_ri">
-            <div class="gs_a"></div>
-        </div>
-        """
-        self.sample_item_html_authors_no_pub_info = """
-        <div class="gs_ri">
-            <div class="gs_a">P. Author, Q. Author</div>
-        </div>
-        """
-        self.sample_item_html_pub_info_no_year = """
-        <div class="gs_ri">
-            <div class="gs_a">R. Author - Journal of Timelessness</div>
-        </div>
-        """
-        self.sample_item_html_pub_info_no_journal = """
-        <div class="gs_ri">
-            <div class="gs_a">S. Author - 2023</div>
-        </div>
-        """
-        self.sample_item_html_pub_info_year_only_no_comma = """
-        <div class="gs_ri">
-            <div class="gs_a">T. Author - 2022</div>
-        </div>
-        """
-        self.sample_item_html_pub_info_year_not_last = """
-        <div class="gs_ri">
-            <div class="gs_a">U. Author - Journal of Volumes, 2021, Vol. 42</div>
-        </div>
-        """
-        self.sample_item_html_pub_info_just_text_no_year = """
-        <div class="gs_ri">
-            <div class="gs_a">V. Author - International Conference on Proceedings</div>
-        </div>
-        """
-        self.sample_item_html_no_cited_by_link = """
-        <div class="gs_ri">
-            <h3 class="gs_rt"><a href="https://example.com/paper_no_cited_by">Paper With No Cited By Link</a></h3>
-            <div class="gs_a">W. Author - Journal of Uncited Works, 2023</div>
-            <div class="gs_rs">This paper has no citation link.</div>
-            <div class="gs_fl">
-                <!-- No cited by link here -->
-                <a href="/scholar?related=nocites123">Related articles</a>
-            </div>
-        </div>
-        """
-        self.sample_partial_data_html = """
+        cls.sample_item_html = _fixture("item")
+        cls.sample_item_html_no_snippet = _fixture("item_no_snippet")
+        cls.sample_item_html_no_related_url = _fixture("item_no_related_url")
+        cls.sample_item_html_no_article_url = _fixture("item_no_article_url")
+        cls.sample_item_html_with_doi = _fixture("item_with_doi")
+        cls.sample_item_html_no_doi = _fixture("item_no_doi")
+        cls.sample_item_html_no_title = _fixture("item_no_title")
+        cls.sample_item_html_special_chars_title = _fixture("item_special_chars_title")
+        cls.sample_item_html_title_not_linked = _fixture("item_title_not_linked")
+        cls.sample_item_html_single_author = _fixture("item_single_author")
+        cls.sample_item_html_authors_et_al = _fixture("item_authors_et_al")
+        cls.sample_item_html_authors_ellipsis_char = _fixture("item_authors_ellipsis_char")
+        cls.sample_item_html_no_authors_tag = _fixture("item_no_authors_tag")
+        cls.sample_item_html_empty_authors_tag = _fixture("item_empty_authors_tag")
+        cls.sample_item_html_authors_no_pub_info = _fixture("item_authors_no_pub_info")
+        cls.sample_item_html_pub_info_no_year = _fixture("item_pub_info_no_year")
+        cls.sample_item_html_pub_info_no_journal = _fixture("item_pub_info_no_journal")
+        cls.sample_item_html_pub_info_year_only_no_comma = _fixture("item_pub_info_year_only_no_comma")
+        cls.sample_item_html_pub_info_year_not_last = _fixture("item_pub_info_year_not_last")
+        cls.sample_item_html_pub_info_just_text_no_year = _fixture("item_pub_info_just_text_no_year")
+        cls.sample_item_html_no_cited_by_link = _fixture("item_no_cited_by_link")
+
+        # Parse every item snippet once up front; the extract_* methods only read from a Selector
+        cls.sel_sample_item = Selector(text=cls.sample_item_html)
+        cls.sel_no_snippet = Selector(text=cls.sample_item_html_no_snippet)
+        cls.sel_no_related_url = Selector(text=cls.sample_item_html_no_related_url)
+        cls.sel_no_article_url = Selector(text=cls.sample_item_html_no_article_url)
+        cls.sel_with_doi = Selector(text=cls.sample_item_html_with_doi)
+        cls.sel_no_doi = Selector(text=cls.sample_item_html_no_doi)
+        cls.sel_no_title = Selector(text=cls.sample_item_html_no_title)
+        cls.sel_special_chars_title = Selector(text=cls.sample_item_html_special_chars_title)
+        cls.sel_title_not_linked = Selector(text=cls.sample_item_html_title_not_linked)
+        cls.sel_single_author = Selector(text=cls.sample_item_html_single_author)
+        cls.sel_authors_et_al = Selector(text=cls.sample_item_html_authors_et_al)
+        cls.sel_authors_ellipsis_char = Selector(text=cls.sample_item_html_authors_ellipsis_char)
+        cls.sel_no_authors_tag = Selector(text=cls.sample_item_html_no_authors_tag)
+        cls.sel_empty_authors_tag = Selector(text=cls.sample_item_html_empty_authors_tag)
+        cls.sel_authors_no_pub_info = Selector(text=cls.sample_item_html_authors_no_pub_info)
+        cls.sel_pub_info_no_year = Selector(text=cls.sample_item_html_pub_info_no_year)
+        cls.sel_pub_info_no_journal = Selector(text=cls.sample_item_html_pub_info_no_journal)
+        cls.sel_pub_info_year_only_no_comma = Selector(text=cls.sample_item_html_pub_info_year_only_no_comma)
+        cls.sel_pub_info_year_not_last = Selector(text=cls.sample_item_html_pub_info_year_not_last)
+        cls.sel_pub_info_just_text_no_year = Selector(text=cls.sample_item_html_pub_info_just_text_no_year)
+        cls.sel_no_cited_by_link = Selector(text=cls.sample_item_html_no_cited_by_link)
+
+        cls.sample_partial_data_html = _fixture("partial_data")
+        cls.sample_next_page_aria_html = _fixture("next_page_aria")
+
+        cls.sample_results_html = f"""
         <div id="gs_res_ccl_mid">
-            <div class="gs_ri"> <!-- Item 1: Complete -->
-                <h3 class="gs_rt"><a href="https://example.com/paper1">Complete Paper</a></h3>
-                <div class="gs_a">X. Author, Y. Author - Full Journal, 2023</div>
-                <div class="gs_rs">Full snippet here.</div>
-                <div class="gs_fl">
-                    <a href="/scholar?cites=1">Cited by 10</a>
-                    <a href="/scholar?related=1">Related articles</a>
-                </div>
-            </div>
-            <div class="gs_ri"> <!-- Item 2: Missing authors -->
-                <h3 class="gs_rt"><a href="https://example.com/paper2">Paper Missing Authors</a></h3>
-                <!-- No gs_a div -->
-                <div class="gs_rs">Snippet for paper missing authors.</div>
-                <div class="gs_fl">
-                    <a href="/scholar?cites=2">Cited by 5</a>
-                </div>
-            </div>
-            <div class="gs_ri"> <!-- Item 3: Missing publication_info (year/journal) -->
-                <h3 class="gs_rt"><a href="https://example.com/paper3">Paper Missing PubInfo</a></h3>
-                <div class="gs_a">Z. Author</div> <!-- Only author, no journal/year part -->
-                <div class="gs_rs">Snippet for paper missing pub info.</div>
-            </div>
-            <div class="gs_ri"> <!-- Item 4: Missing snippet -->
-                <h3 class="gs_rt"><a href="https://example.com/paper4">Paper Missing Snippet</a></h3>
-                <div class="gs_a">W. Author - Journal of No Snippets, 2020</div>
-                <!-- No gs_rs div -->
-                <div class="gs_fl">
-                    <a href="/scholar?cites=3">Cited by 0</a>
-                </div>
-            </div>
-            <div class="gs_ri"> <!-- Item 5: Missing cited_by -->
-                <h3 class="gs_rt"><a href="https://example.com/paper5">Paper Missing CitedBy</a></h3>
-                <div class="gs_a">V. Author - Journal of No Cites, 2019</div>
-                <div class="gs_rs">Snippet for paper missing cited by.</div>
-                <div class="gs_fl">
-                    <!-- No cited by link -->
-                    <a href="/scholar?related=5">Related articles</a>
-                </div>
-            </div>
-        </div>
-        """
-        self.sample_next_page_aria_html = """
-        <div id="gs_res_ccl_mid">
-            <div class="gs_ri">Some item</div>
-        </div>
-        <div id="gs_n"> <!-- Different structure for next page link -->
-            <a href="/scholar?start=20&q=aria" aria-label="Next"><span>Next</span></a>
-        </div>
-        """
-        # self.sample_malformed_plus_valid_html was defined but not used. Removed.
-
-        self.sample_results_html = f"""
-        <div id="gs_res_ccl_mid">
-            {self.sample_item_html}
-            {self.sample_item_html.replace("Test Paper Title", "Another Paper Title")}
+            {cls.sample_item_html}
+            {cls.sample_item_html.replace("Test Paper Title", "Another Paper Title")}
         </div>
         <div class="gs_n">
             <center>
@@ -308,10 +108,31 @@ class TestParser(unittest.TestCase):
             </center>
         </div>
         """
+        # Parsed once for the tests that only read the result dicts
+        cls.sample_results = cls.parser.parse_results(cls.sample_results_html, include_raw_item=False)
+
+    def setUp(self):
+        """Set up per-test logging for the shared parser"""
+        # Show the parser's INFO messages on the console while a test runs
+        if hasattr(self.parser, "logger"):
+            # Undo the changes below after each test so later tests see the module logger untouched
+            logger = self.parser.logger
+            self.addCleanup(setattr, logger, "propagate", logger.propagate)
+            self.addCleanup(setattr, logger, "handlers", list(logger.handlers))
+            self.addCleanup(logger.setLevel, logger.level)
+            self.parser.logger.setLevel(logging.INFO)
+            # Add a handler if it doesn't have one that outputs to console for tests
+            if not any(isinstance(h, logging.StreamHandler) for h in self.parser.logger.handlers):
+                console_handler = logging.StreamHandler()
+                console_handler.setLevel(logging.INFO)
+                formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+                console_handler.setFormatter(formatter)
+                self.parser.logger.addHandler(console_handler)
+                self.parser.logger.propagate = False  # Prevent duplicate messages if root logger also has a handler
 
     def test_parse_results_with_items(self):
         """Test parse_results method with HTML containing search results"""
-        results = self.parser.parse_results(self.sample_results_html, include_raw_item=False)
+        results = self.sample_results
 
         # Verify results structure
         self.assertEqual(len(results), 2)
@@ -331,6 +152,7 @@ class TestParser(unittest.TestCase):
         # This test might need to be re-evaluated based on desired behavior of include_raw_item.
         # For now, checking that results are dictionaries.
         self.assertIsInstance(results[0], dict)
+        self.assertEqual(results, self.sample_results)
         # If raw item is truly needed, the test or parser.py needs further adjustment.
         # Assuming the primary goal is that parse_results returns usable dictionaries.
 
@@ -396,8 +218,6 @@ class TestParser(unittest.TestCase):
 
     def test_parse_raw_items(self):
         """Test parse_raw_items method for correct item container identification"""
-        from parsel import Selector, SelectorList
-
         raw_items = self.parser.parse_raw_items(self.sample_results_html)
         self.assertIsInstance(raw_items, SelectorList)
         self.assertEqual(len(raw_items), 2)
@@ -408,27 +228,25 @@ class TestParser(unittest.TestCase):
 
     def test_extract_title(self):
         """Test extract_title method with various cases"""
-        from parsel import Selector
-
         # Case 1: Valid title with link
-        selector_valid = Selector(text=self.sample_item_html)
+        selector_valid = self.sel_sample_item
         title_valid = self.parser.extract_title(selector_valid)
         self.assertEqual(title_valid, "Test Paper Title")
 
         # Case 2: Missing title tag
-        selector_no_title_tag = Selector(text=self.sample_item_html_no_title)
+        selector_no_title_tag = self.sel_no_title
         title_no_tag = self.parser.extract_title(selector_no_title_tag)
         self.assertIsNone(title_no_tag)
 
         # Case 3: Title with special characters (HTML entities should be handled by parsel)
         # The parser extracts text, so HTML entities like < become <.
         # If the title itself contains literal <, >, &, ", ' these should be preserved as text.
-        selector_special_chars = Selector(text=self.sample_item_html_special_chars_title)
+        selector_special_chars = self.sel_special_chars_title
         title_special_chars = self.parser.extract_title(selector_special_chars)
         self.assertEqual(title_special_chars, 'Title with <Special> & "Chars"')
 
         # Case 4: Title tag present but no link, only text
-        selector_unlinked_title = Selector(text=self.sample_item_html_title_not_linked)
+        selector_unlinked_title = self.sel_title_not_linked
         title_unlinked = self.parser.extract_title(selector_unlinked_title)
         self.assertEqual(title_unlinked, "Unlinked Title with Text")
 
@@ -446,40 +264,38 @@ class TestParser(unittest.TestCase):
 
     def test_extract_authors(self):
         """Test extract_authors method with various cases"""
-        from parsel import Selector
-
         # Case 1: Multiple authors (standard case)
-        selector_multiple = Selector(text=self.sample_item_html)
+        selector_multiple = self.sel_sample_item
         authors_multiple = self.parser.extract_authors(selector_multiple)
         self.assertListEqual(authors_multiple, ["A Author", "B Author"])
 
         # Case 2: Single author
-        selector_single = Selector(text=self.sample_item_html_single_author)
+        selector_single = self.sel_single_author
         authors_single = self.parser.extract_authors(selector_single)
         self.assertListEqual(authors_single, ["K. SingleAuthor"])
 
         # Case 3: Authors with "..." (et al.)
-        selector_et_al = Selector(text=self.sample_item_html_authors_et_al)
+        selector_et_al = self.sel_authors_et_al
         authors_et_al = self.parser.extract_authors(selector_et_al)
         self.assertListEqual(authors_et_al, ["L. Author", "M. Author", "et al."])
 
         # Case 4: Authors with "ΓÇª" (ellipsis character for et al.)
-        selector_ellipsis_char = Selector(text=self.sample_item_html_authors_ellipsis_char)
+        selector_ellipsis_char = self.sel_authors_ellipsis_char
         authors_ellipsis_char = self.parser.extract_authors(selector_ellipsis_char)
         self.assertListEqual(authors_ellipsis_char, ["N. Author", "O. Author", "et al."])
 
         # Case 5: No authors tag
-        selector_no_tag = Selector(text=self.sample_item_html_no_authors_tag)
+        selector_no_tag = self.sel_no_authors_tag
         authors_no_tag = self.parser.extract_authors(selector_no_tag)
         self.assertListEqual(authors_no_tag, [])
 
         # Case 6: Empty authors tag
-        selector_empty_tag = Selector(text=self.sample_item_html_empty_authors_tag)
+        selector_empty_tag = self.sel_empty_authors_tag
         authors_empty_tag = self.parser.extract_authors(selector_empty_tag)
         self.assertListEqual(authors_empty_tag, [])
 
         # Case 7: Authors string without publication info part
-        selector_authors_only = Selector(text=self.sample_item_html_authors_no_pub_info)
+        selector_authors_only = self.sel_authors_no_pub_info
         authors_only = self.parser.extract_authors(selector_authors_only)
         self.assertListEqual(authors_only, ["P. Author", "Q. Author"])
 
@@ -493,121 +309,103 @@ class TestParser(unittest.TestCase):
 
     def test_extract_publication_info(self):
         """Test extract_publication_info method with various cases"""
-        from parsel import Selector
-
         # Case 1: Standard case (Journal, Year)
-        selector_standard = Selector(text=self.sample_item_html)
+        selector_standard = self.sel_sample_item
         pub_info_standard = self.parser.extract_publication_info(selector_standard)
         self.assertEqual(pub_info_standard.get("publication"), "Journal of Testing")
         self.assertEqual(pub_info_standard.get("year"), 2023)
 
         # Case 2: No year
-        selector_no_year = Selector(text=self.sample_item_html_pub_info_no_year)
+        selector_no_year = self.sel_pub_info_no_year
         pub_info_no_year = self.parser.extract_publication_info(selector_no_year)
         self.assertEqual(pub_info_no_year.get("publication"), "Journal of Timelessness")
         self.assertIsNone(pub_info_no_year.get("year"))
 
         # Case 3: No journal (only year after hyphen) - current parser extracts year and empty pub name
-        selector_no_journal = Selector(text=self.sample_item_html_pub_info_no_journal)
+        selector_no_journal = self.sel_pub_info_no_journal
         pub_info_no_journal = self.parser.extract_publication_info(selector_no_journal)
         self.assertEqual(pub_info_no_journal.get("publication"), "")  # Corrected based on parser logic
         self.assertEqual(pub_info_no_journal.get("year"), 2023)
 
         # Case 4: Year only, no comma before it (e.g., "Author - 2022")
-        selector_year_only_no_comma = Selector(text=self.sample_item_html_pub_info_year_only_no_comma)
+        selector_year_only_no_comma = self.sel_pub_info_year_only_no_comma
         pub_info_year_only_no_comma = self.parser.extract_publication_info(selector_year_only_no_comma)
         self.assertEqual(pub_info_year_only_no_comma.get("publication"), "")  # Corrected based on parser logic
         self.assertEqual(pub_info_year_only_no_comma.get("year"), 2022)
 
         # Case 5: Year not the last part (e.g., "Journal, 2021, Vol. 42")
         # Parser should extract "Journal of Volumes" and 2021
-        selector_year_not_last = Selector(text=self.sample_item_html_pub_info_year_not_last)
+        selector_year_not_last = self.sel_pub_info_year_not_last
         pub_info_year_not_last = self.parser.extract_publication_info(selector_year_not_last)
         self.assertEqual(pub_info_year_not_last.get("publication"), "Journal of Volumes")
         self.assertEqual(pub_info_year_not_last.get("year"), 2021)
 
         # Case 6: No gs_a tag
-        selector_no_gs_a = Selector(text=self.sample_item_html_no_authors_tag)
+        selector_no_gs_a = self.sel_no_authors_tag
         pub_info_no_gs_a = self.parser.extract_publication_info(selector_no_gs_a)
         self.assertEqual(pub_info_no_gs_a, {})
 
         # Case 7: Empty gs_a tag
-        selector_empty_gs_a = Selector(text=self.sample_item_html_empty_authors_tag)
+        selector_empty_gs_a = self.sel_empty_authors_tag
         pub_info_empty_gs_a = self.parser.extract_publication_info(selector_empty_gs_a)
         self.assertEqual(pub_info_empty_gs_a, {})
 
         # Case 8: gs_a tag with authors but no " - " separator (authors only)
-        selector_authors_only = Selector(text=self.sample_item_html_authors_no_pub_info)
+        selector_authors_only = self.sel_authors_no_pub_info
         pub_info_authors_only = self.parser.extract_publication_info(selector_authors_only)
         self.assertEqual(pub_info_authors_only, {})  # Expect empty as no " - "
 
         # Case 9: gs_a tag with text but no discernible year
-        selector_text_no_year = Selector(text=self.sample_item_html_pub_info_just_text_no_year)
+        selector_text_no_year = self.sel_pub_info_just_text_no_year
         pub_info_text_no_year = self.parser.extract_publication_info(selector_text_no_year)
         self.assertEqual(pub_info_text_no_year.get("publication"), "International Conference on Proceedings")
         self.assertIsNone(pub_info_text_no_year.get("year"))
 
     def test_extract_snippet_valid(self):
         """Test extract_snippet method with a valid item"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html)
+        selector = self.sel_sample_item
         snippet = self.parser.extract_snippet(selector)
         self.assertEqual(snippet, "This is a test snippet of the paper abstract...")
 
     def test_extract_snippet_missing(self):
         """Test extract_snippet method when snippet is missing"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html_no_snippet)
+        selector = self.sel_no_snippet
         snippet = self.parser.extract_snippet(selector)
         self.assertIsNone(snippet)
 
     def test_extract_related_articles_url_valid(self):
         """Test extract_related_articles_url method with a valid item"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html)
+        selector = self.sel_sample_item
         related_url = self.parser.extract_related_articles_url(selector)
         self.assertEqual(related_url, "https://scholar.google.com/scholar?related=123456789")
 
     def test_extract_related_articles_url_missing(self):
         """Test extract_related_articles_url method when the URL is missing"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html_no_related_url)
+        selector = self.sel_no_related_url
         related_url = self.parser.extract_related_articles_url(selector)
         self.assertIsNone(related_url)
 
     def test_extract_article_url_valid(self):
         """Test extract_article_url method with a valid item"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html)
+        selector = self.sel_sample_item
         article_url = self.parser.extract_article_url(selector)
         self.assertEqual(article_url, "https://example.com/paper")
 
     def test_extract_article_url_missing(self):
         """Test extract_article_url method when the URL is missing (title not a link)"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html_no_article_url)
+        selector = self.sel_no_article_url
         article_url = self.parser.extract_article_url(selector)
         self.assertIsNone(article_url)
 
     def test_extract_doi_present(self):
         """Test extract_doi method when a DOI is present"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html_with_doi)
+        selector = self.sel_with_doi
         doi = self.parser.extract_doi(selector)
         self.assertEqual(doi, "10.1234/example.doi")
 
     def test_extract_doi_absent(self):
         """Test extract_doi method when a DOI is absent"""
-        from parsel import Selector
-
-        selector = Selector(text=self.sample_item_html_no_doi)
+        selector = self.sel_no_doi
         doi = self.parser.extract_doi(selector)
         self.assertIsNone(doi)
 
@@ -621,24 +419,20 @@ class TestParser(unittest.TestCase):
             </div>
         </div>
         """
-        from parsel import Selector
-
         selector = Selector(text=html_with_other_links)
         doi = self.parser.extract_doi(selector)
         self.assertIsNone(doi)
 
     def test_extract_cited_by(self):
         """Test extract_cited_by method with various cases"""
-        from parsel import Selector
-
         # Case 1: Valid cited_by information
-        selector_valid = Selector(text=self.sample_item_html)
+        selector_valid = self.sel_sample_item
         cited_by_valid = self.parser.extract_cited_by(selector_valid)
         self.assertEqual(cited_by_valid.get("count"), 42)
         self.assertEqual(cited_by_valid.get("url"), "https://scholar.google.com/scholar?cites=123456789")
 
         # Case 2: Missing cited_by link
-        selector_missing = Selector(text=self.sample_item_html_no_cited_by_link)
+        selector_missing = self.sel_no_cited_by_link
         cited_by_missing = self.parser.extract_cited_by(selector_missing)
         self.assertEqual(cited_by_missing.get("count"), 0)
         self.assertIsNone(cited_by_missing.get("url"))
@@ -761,9 +555,8 @@ class TestParser(unittest.TestCase):
 
     def test_parse_results_with_real_sample_html(self):
         """Test parse_results with a real HTML sample file."""
-        if "Real HTML file not found" in self.real_search_html_content:
-            self.skipTest("Real HTML sample file not found, skipping this test.")
-            return
+        if self.real_search_html_content is None:
+            self.skipTest(f"Real HTML sample file not found at {_SAMPLE_HTML_PATH}")
 
         results = self.parser.parse_results(self.real_search_html_content)
 
@@ -5,14 +5,18 @@ Tests for the utility functions.
 import unittest
 from unittest.mock import MagicMock, patch
 
+from parsel import Selector
+
 # Try to import utilities, but mock them if not available yet
 try:
-    from google_scholar_scraper.utils import detect_captcha, get_random_delay, get_random_user_agent
+    from google_scholar_scraper.utils import compile_css, detect_captcha, first_match, get_random_delay, get_random_user_agent
 except ImportError:
     # For testing purposes, we'll create mocks if the modules don't exist yet
     get_random_delay = MagicMock(return_value=2.5)
     get_random_user_agent = MagicMock(return_value="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
     detect_captcha = MagicMock(return_value=False)
+    compile_css = MagicMock()
+    first_match = MagicMock(return_value=None)
 
 
 class TestUtils(unittest.TestCase):
@@ -121,6 +125,17 @@ class TestUtils(unittest.TestCase):
         self.assertFalse(detect_captcha(""))
         self.assertFalse(detect_captcha(None))
 
+    def test_compile_css_and_first_match(self):
+        """Test a compiled CSS query yields the same first match as parsel's .css().get()"""
+        # Skip if using mock version
+        if isinstance(compile_css, MagicMock):
+            self.skipTest("utils module not available")
+
+        node = Selector(text="<div><a href='/one'>One</a><a href='/two'>Two</a></div>").root
+        self.assertEqual(first_match(compile_css("a::text"), node), "One")
+        self.assertEqual(first_match(compile_css("a::attr(href)"), node), "/one")
+        self.assertIsNone(first_match(compile_css("span::text"), node))
+
 
 if __name__ == "__main__":
     unittest.main()